@@ -72,11 +72,13 @@ from .functions import last_game
 from .functions import next_game
 from .functions import find_team
 from .functions import find_venue
+from .functions import find_person
 from .functions import schedule
 from .functions import scores
 from .functions import games_today
 from .functions import free_agents
 from .functions import player_bio
+from .functions import people as lookup_people
 from .functions import player_stats
 from .functions import player_game_logs
 from .functions import player_date_range
@@ -138,6 +140,17 @@ update_bbref_batting_war = update_bbref_hitting_war
 
 from .async_mlb import fetch
 from .async_mlb import fetch_text
+from .async_mlb import client
+from .async_mlb import cache
+from .async_mlb.singleflight import inflight
+from .async_mlb import retry
+from .async_mlb.retry import FetchError
+from .async_mlb import ratelimit
+from .async_mlb import jsondecode
+from .async_mlb import replay
+from .async_mlb import timing
+from .async_mlb import metrics
+from . import aio
 
 from .paths import *
 
@@ -0,0 +1,96 @@
+"""Native asyncio API
+
+Awaitable counterparts of the main entry points. They run on the caller's
+event loop (no `nest_asyncio`, no nested `run_until_complete`) and share the
+pooled connections, cache, scheduler and rate limiter with the sync API,
+which is a thin wrapper around these same coroutines.
+
+```
+>>> import asyncio
+>>> from mlb import aio
+>>> async def main():
+...     team, sched = await asyncio.gather(aio.Team(145), aio.schedule(mlbam=145))
+...     await aio.close()
+...     return team, sched
+>>> team, sched = asyncio.run(main())
+```
+"""
+import datetime as dt
+from typing import Union, Optional
+
+import pandas as pd
+
+from . import functions as funcs
+from . import appfuncs
+from . import mlb_dataclasses as dclass
+from . import classes
+from .game import Game as _Game, _feed_request
+from .utils import default_season
+from .async_mlb import client
+from .async_mlb import timing
+from .async_mlb.fetch import fetch
+
+__all__ = [
+    'Person',
+    'Team',
+    'Franchise',
+    'Game',
+    'schedule',
+    'player_stats',
+    'people',
+    'fetch',
+    'fetch_home_page_content',
+    'fetch_team_page_content',
+    'close',
+]
+
+
+async def Person(mlbam:int,**kwargs) -> classes.Person:
+    """Awaitable version of `mlb.Person`"""
+    data = await funcs._player_data_async(mlbam)
+    return classes.Person(mlbam,_data=data,**kwargs)
+
+async def Team(mlbam:int,season:Optional[int]=None,**kwargs) -> classes.Team:
+    """Awaitable version of `mlb.Team`"""
+    if season is None:
+        season = default_season()
+    data = await funcs._team_data_async(int(mlbam),int(season))
+    return classes.Team(mlbam,season,_data=data,**kwargs)
+
+async def Franchise(mlbam:int) -> classes.Franchise:
+    """Awaitable version of `mlb.Franchise`"""
+    data = await funcs._franchise_data_async(int(mlbam))
+    return classes.Franchise(mlbam,_data=data)
+
+async def Game(game_pk,timecode=None,tz='et') -> _Game:
+    """Awaitable version of `mlb.Game`"""
+    with timing.call('Game'):
+        game_url, params = _feed_request(game_pk,timecode)
+        resp = await client.request(game_url,params=params)
+        return _Game(game_pk,timecode,tz,_data=resp.json())
+
+async def schedule(mlbam=None,season=None,date=None,startDate=None,endDate=None,gameType=None,opponentId=None,**kwargs) -> Union[pd.DataFrame,str]:
+    """Awaitable version of `mlb.schedule`"""
+    if kwargs.get('url_only'):
+        return funcs.schedule(mlbam,season,date,startDate,endDate,gameType,opponentId,**kwargs)
+    return await funcs._schedule_async(mlbam,season,date,startDate,endDate,gameType,opponentId,**kwargs)
+
+async def player_stats(mlbam,**kwargs) -> dclass.StatTypeCollection:
+    """Awaitable version of `mlb.player_stats`"""
+    return await funcs._player_stats_async(mlbam,**kwargs)
+
+async def people(mlbams,hydrate=None,as_dataframe=False,**kwargs) -> Union[list,pd.DataFrame]:
+    """Awaitable version of `mlb.lookup_people`"""
+    return await funcs._people_async(mlbams,hydrate,as_dataframe,**kwargs)
+
+async def fetch_home_page_content(**kwargs):
+    """Awaitable version of `appfuncs.fetch_home_page_content`"""
+    return await appfuncs._home_page_content_async(**kwargs)
+
+async def fetch_team_page_content(team_id:int,date:Union[str,Union[dt.datetime,dt.date]]=None,**kwargs):
+    """Awaitable version of `appfuncs.fetch_team_page_content`"""
+    return await appfuncs._team_page_content_async(team_id,date,**kwargs)
+
+async def close():
+    """Release the pooled connections held for the running event loop"""
+    await client.close_client_session()
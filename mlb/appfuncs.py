@@ -1,24 +1,27 @@
 import datetime as dt
 from typing import Union, Optional, TypeAlias, TypeVar
 
-import nest_asyncio
 import pandas as pd
 
 from . import constants as c
 from . import parsing
 from . import mlb_dataclasses as dclass
-from .async_mlb import fetch
+from .async_mlb.fetch import fetch as _fetch_async
+from .async_mlb.runner import run_sync
+from .async_mlb import timing
 from .utils import default_season
 
 from . import helpers
 
 from .functions import schedule, season_standings, league_stats
 
-nest_asyncio.apply()
-
 # DateOrStr = Union[str,Union[dt.datetime,dt.date]]
 
 def fetch_home_page_content(**kwargs):
+    return run_sync(_home_page_content_async(**kwargs))
+
+@timing.timed('home_page_content')
+async def _home_page_content_async(**kwargs):
     date = dt.date.today()
     date = date.strftime(r'%Y-%m-%d')
     hydrations = "linescore,person,decisions,lineups(person),probablePitcher"
@@ -29,7 +32,7 @@ def fetch_home_page_content(**kwargs):
     
     urls = [scores_url,standings_url,stats_url]
     
-    fetched_responses = fetch(urls)
+    fetched_responses = (await _fetch_async(urls)).raise_for_failures()
     for resp in fetched_responses:
         if '/schedule' in resp.url:
             scores = pd.DataFrame(data=parsing._parse_schedule_data(resp.json))
@@ -44,6 +47,10 @@ def fetch_home_page_content(**kwargs):
     return (scores, standings, stats)
 
 def fetch_team_page_content(team_id:int,date:Union[str,Union[dt.datetime,dt.date]]=None,**kwargs):
+    return run_sync(_team_page_content_async(team_id,date,**kwargs))
+
+@timing.timed('team_page_content')
+async def _team_page_content_async(team_id:int,date:Union[str,Union[dt.datetime,dt.date]]=None,**kwargs):
     base = "https://statsapi.mlb.com/api/v1"
     
     if date is None:
@@ -81,7 +88,7 @@ def fetch_team_page_content(team_id:int,date:Union[str,Union[dt.datetime,dt.date
         base + f"/transactions?teamId={team_id}&startDate={date_obj-dt.timedelta(days=30)}&endDate={date_obj}",
     ]
             
-    fetched_responses = fetch(urls)
+    fetched_responses = (await _fetch_async(urls)).raise_for_failures()
     
     hitting_dfs, pitching_dfs, fielding_dfs = [], [], []
     hitting_adv_dfs, pitching_adv_dfs = [], []
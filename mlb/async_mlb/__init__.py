@@ -1,6 +1,7 @@
 from .fetch import runit as fetch
 from .fetch_text import runit as fetch_text
-from .fetch import _determine_loop
+from .runner import _determine_loop
+from .runner import run_sync
 from .yby_records import runit as get_updated_records
 from .coaches import runit as fetch_coaching_roster
 from .standings import runit as fetch_standings
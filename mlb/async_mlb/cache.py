@@ -0,0 +1,372 @@
+import os
+import re
+import json
+import time
+import asyncio
+import sqlite3
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import datetime as dt
+from typing import Optional, Union
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+from ..paths import RESPONSE_CACHE_DB
+
+FOREVER = None      # never expires
+NO_STORE = 0        # never cached
+REVALIDATE = -1     # stored with its validators, but stale at once
+
+_YEAR = re.compile(r'(?<!\d)(18[7-9]\d|19\d\d|20\d\d)(?!\d)')
+_FINAL_GAME = re.compile(rb'"abstractGameState"\s*:\s*"Final"')
+
+_SEASON_PARAMS = ('season','seasons','startDate','endDate','date')
+# endpoints whose path ends with a season (e.g. '/draft/1998'); other
+# numeric path segments are ids ('/venues/2001')
+_SEASON_PATHS = re.compile(r'/(?:draft|draft/prospects|seasons)/(18[7-9]\d|19\d\d|20\d\d)(?=/|$)')
+# current data that changes slowly: revalidated instead of refetched
+_REVALIDATED = (r'/people(?:/|\?|$)',r'/roster',r'/transactions')
+
+
+def _expires(ttl:Optional[float],now:float) -> Optional[float]:
+    if ttl is FOREVER:
+        return None
+    return now + max(ttl,0)
+
+
+def cache_key(url:str,params:Optional[dict]=None) -> str:
+    """Canonical form of a request URL (query parameters sorted)"""
+    parsed = urlparse(url)
+    query = parse_qsl(parsed.query,keep_blank_values=True)
+    if params:
+        query += [(k,str(v)) for k,v in params.items() if v is not None]
+    query.sort()
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}?{urlencode(query)}"
+
+
+class CachePolicy:
+    """Decides how long (seconds) a response stays fresh
+
+    Rules are checked in order:
+
+    1. explicit `rules` -- (regex, ttl) pairs matched against the URL
+    2. live game feeds -- forever once the game is final or when a
+       `timecode` snapshot was requested, otherwise `live_ttl` (seconds)
+    3. season-scoped requests -- forever when every season referenced in the
+       query (or in the path of a season endpoint like '/draft/1998') is in
+       the past
+    4. `revalidated` patterns (people, rosters, transactions) -- `REVALIDATE`
+    5. other current-season requests -- `current_ttl` (minutes)
+    6. everything else -- `default_ttl`
+
+    A ttl of `FOREVER` (None) never expires; `NO_STORE` (0) is not cached.
+    `REVALIDATE` (-1) stores a response that has an ETag or Last-Modified
+    header but treats it as stale right away, so every later request is a
+    conditional one and a '304 Not Modified' reuses the stored body. That is
+    also the default for requests that aren't season-scoped (undated
+    schedules, scraped pages), so nothing that may change is served without
+    asking the server first unless opted in with `add_rule()` or a
+    `default_ttl`.
+    """
+    def __init__(self,live_ttl:float=10,current_ttl:float=300,default_ttl:float=REVALIDATE,rules:Optional[list]=None,revalidated:tuple=_REVALIDATED):
+        self.live_ttl = live_ttl
+        self.current_ttl = current_ttl
+        self.default_ttl = default_ttl
+        self.rules = [(re.compile(pattern),ttl) for pattern, ttl in (rules or [])]
+        self.revalidated = [re.compile(pattern) for pattern in revalidated]
+
+    def add_rule(self,pattern:str,ttl:Optional[float]):
+        """Give URLs matching `pattern` a fixed ttl (checked before the defaults)"""
+        self.rules.append((re.compile(pattern),ttl))
+
+    def _seasons(self,url:str) -> list:
+        parsed = urlparse(url)
+        years = []
+        for key, value in parse_qsl(parsed.query):
+            if key in _SEASON_PARAMS:
+                years += [int(y) for y in _YEAR.findall(value)]
+        years += [int(y) for y in _SEASON_PATHS.findall(parsed.path)]
+        return years
+
+    def may_store(self,url:str) -> bool:
+        """Whether a response for `url` can be cached at all (if not, the
+        cache isn't even looked up)"""
+        # a live feed is stored once its game is final
+        return '/feed/live' in url or self.ttl(url) != NO_STORE
+
+    def ttl(self,url:str,body:bytes=b'') -> Optional[float]:
+        for pattern, ttl in self.rules:
+            if pattern.search(url):
+                return ttl
+
+        if '/feed/live' in url:
+            if 'timecode=' in url or _FINAL_GAME.search(body):
+                return FOREVER
+            return self.live_ttl
+
+        seasons = self._seasons(url)
+        if len(seasons) != 0 and max(seasons) < dt.date.today().year:
+            return FOREVER
+        if any(pattern.search(url) for pattern in self.revalidated):
+            return REVALIDATE
+        if len(seasons) != 0:
+            return self.current_ttl
+
+        return self.default_ttl
+
+
+class CachedResponse:
+    """A response body as stored in the cache"""
+    __slots__ = ('url','headers','content','stored','expires')
+    def __init__(self,url:str,headers:dict,content:bytes,stored:float,expires:Optional[float]):
+        self.url = url
+        self.headers = headers
+        self.content = content
+        self.stored = stored
+        self.expires = expires
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires is None or self.expires > time.time()
+
+    def validators(self) -> dict:
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if 'etag' in self.headers:
+            headers['If-None-Match'] = self.headers['etag']
+        if 'last-modified' in self.headers:
+            headers['If-Modified-Since'] = self.headers['last-modified']
+        return headers
+
+
+class ResponseCache:
+    """Persistent (SQLite) HTTP response cache
+
+    Parameters:
+    -----------
+    path : str
+        location of the SQLite file
+
+    max_bytes : int, default 256 MB
+        once the stored bodies exceed this size, the least recently used
+        entries are evicted
+
+    policy : CachePolicy, optional
+        ttl rules for each endpoint
+
+    The SQLite work runs on one worker thread; the `*_async` methods hand it
+    over there so it never blocks the event loop.
+    """
+    _KEPT_HEADERS = ('content-type','etag','last-modified')
+
+    def __init__(self,path:str=RESPONSE_CACHE_DB,max_bytes:int=256*1024*1024,policy:Optional[CachePolicy]=None,enabled:bool=True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.policy = policy or CachePolicy()
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn = None
+        self._size = None
+        self._executor = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.revalidations = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size of the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'revalidations': self.revalidations,
+            'bytes': self._size or 0,
+            'max_bytes': self.max_bytes,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.',exist_ok=True)
+            conn = sqlite3.connect(self.path,check_same_thread=False,isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                headers TEXT,
+                content BLOB,
+                size INTEGER,
+                stored REAL,
+                expires REAL,
+                accessed REAL)''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed)')
+            self._size = conn.execute('SELECT COALESCE(SUM(size),0) FROM responses').fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    async def _run(self,fn,*args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1,thread_name_prefix='mlb-cache')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor,functools.partial(fn,*args))
+
+    async def get_async(self,key:str,stale:bool=False) -> Optional[CachedResponse]:
+        """`get()` without blocking the event loop"""
+        if not self.enabled or not self.policy.may_store(key):
+            return None
+        return await self._run(self.get,key,stale)
+
+    async def set_async(self,key:str,url:str,content:bytes,headers:dict) -> Optional[CachedResponse]:
+        """`set()` without blocking the event loop"""
+        if not self.enabled or self.policy.ttl(key,content) == NO_STORE:
+            return None
+        return await self._run(self.set,key,url,content,headers)
+
+    async def revalidated_async(self,key:str,entry:CachedResponse,not_modified:bool) -> Optional[CachedResponse]:
+        """`revalidated()` without blocking the event loop"""
+        return await self._run(self.revalidated,key,entry,not_modified)
+
+    def lookup(self,key:str) -> Optional[CachedResponse]:
+        """Get the stored entry for `key` whether or not it is still fresh"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute('SELECT url, headers, content, stored, expires FROM responses WHERE key=?',(key,)).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(row[0],json.loads(row[1]),row[2],row[3],row[4])
+
+    def get(self,key:str,stale:bool=False) -> Optional[CachedResponse]:
+        """Get a fresh entry for `key` (counts towards hits/misses)
+
+        With `stale=True`, an expired entry that carries an ETag or
+        Last-Modified validator is returned as well so the caller can
+        revalidate it; the outcome is then recorded with `revalidated()`.
+        """
+        if not self.enabled or not self.policy.may_store(key):
+            return None
+        entry = self.lookup(key)
+        if entry is not None and entry.fresh:
+            self.hits += 1
+            self.touch(key)
+            return entry
+        if entry is not None and stale and entry.validators():
+            return entry
+        self.misses += 1
+        return None
+
+    def revalidated(self,key:str,entry:CachedResponse,not_modified:bool) -> Optional[CachedResponse]:
+        """Record the result of a conditional request for a stale entry
+
+        A '304 Not Modified' counts as a hit and gives the stored body a new
+        ttl; anything else counts as a miss.
+        """
+        if not not_modified:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.revalidations += 1
+        ttl = self.policy.ttl(key,entry.content)
+        self.touch(key,ttl)
+        entry.expires = _expires(ttl,time.time())
+        return entry
+
+    def touch(self,key:str,ttl:Union[float,None,bool]=False):
+        """Mark an entry as recently used (and optionally give it a new ttl)"""
+        with self._lock:
+            conn = self._connect()
+            now = time.time()
+            if ttl is False:
+                conn.execute('UPDATE responses SET accessed=? WHERE key=?',(now,key))
+            else:
+                conn.execute('UPDATE responses SET accessed=?, expires=? WHERE key=?',(now,_expires(ttl,now),key))
+
+    def set(self,key:str,url:str,content:bytes,headers:dict) -> Optional[CachedResponse]:
+        """Store a response body according to the cache policy
+
+        A `REVALIDATE` response is only kept if it has a validator (ETag or
+        Last-Modified) to revalidate it with.
+        """
+        if not self.enabled:
+            return None
+        ttl = self.policy.ttl(key,content)
+        if ttl == NO_STORE:
+            return None
+        kept = {k.lower():v for k,v in headers.items() if k.lower() in self._KEPT_HEADERS}
+        if ttl == REVALIDATE and 'etag' not in kept and 'last-modified' not in kept:
+            return None
+        now = time.time()
+        expires = _expires(ttl,now)
+        with self._lock:
+            conn = self._connect()
+            old = conn.execute('SELECT size FROM responses WHERE key=?',(key,)).fetchone()
+            conn.execute('INSERT OR REPLACE INTO responses VALUES (?,?,?,?,?,?,?,?)',
+                         (key,url,json.dumps(kept),content,len(content),now,expires,now))
+            self._size += len(content) - (old[0] if old else 0)
+            self.stores += 1
+            if self._size > self.max_bytes:
+                self._evict(conn)
+        return CachedResponse(url,kept,content,now,expires)
+
+    def _evict(self,conn:sqlite3.Connection):
+        # drop least recently used entries until the cache is back under 90%
+        target = self.max_bytes * 0.9
+        rows = conn.execute('SELECT key, size FROM responses ORDER BY accessed ASC').fetchall()
+        evict = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            evict.append((key,))
+            self._size -= size
+        conn.executemany('DELETE FROM responses WHERE key=?',evict)
+        self.evictions += len(evict)
+
+    def clear(self):
+        """Delete every cached response"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM responses')
+            self._size = 0
+
+
+response_cache = ResponseCache()
+
+def configure(enabled:bool=None,path:str=None,max_bytes:int=None,policy:CachePolicy=None):
+    """Configure the package-wide response cache
+
+    Parameters:
+    -----------
+    enabled : bool, default True
+        set to False to always go to the network
+
+    path : str
+        location of the SQLite file (default: ~/.cache/simplestats-mlb/responses.db,
+        or the 'MLB_CACHE_DIR' environment variable)
+
+    max_bytes : int, default 256 MB
+        size bound for stored response bodies
+
+    policy : CachePolicy
+        ttl rules for each endpoint (see `CachePolicy`)
+
+    """
+    if enabled is not None:
+        response_cache.enabled = enabled
+    if max_bytes is not None:
+        response_cache.max_bytes = int(max_bytes)
+    if policy is not None:
+        response_cache.policy = policy
+    if path is not None and path != response_cache.path:
+        with response_cache._lock:
+            if response_cache._conn is not None:
+                response_cache._conn.close()
+            response_cache._conn = None
+            response_cache._size = None
+            response_cache.path = path
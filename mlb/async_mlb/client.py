@@ -0,0 +1,366 @@
+import time
+import atexit
+import asyncio
+import threading
+import weakref
+from typing import AsyncIterator
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from . import jsondecode
+from . import timing
+from . import metrics
+from . import encoding
+from .cache import cache_key, response_cache
+from .singleflight import inflight
+from .retry import RETRY_STATUSES, FetchError, retry_policy
+from .ratelimit import rate_limiter
+from .runner import run_sync
+from .replay import transport
+from .scheduler import endpoint_key
+
+# Process-wide connection pool settings. 'pool_size' caps the total number of
+# open connections, 'per_host' caps the connections to any single host and
+# 'keepalive' is how long (seconds) an idle connection is kept for reuse
+_config = {
+    'pool_size': 100,
+    'per_host': 20,
+    'keepalive': 30,
+}
+
+_lock = threading.Lock()
+_async_sessions = weakref.WeakKeyDictionary()
+
+
+def configure(pool_size:int=None,per_host:int=None,keepalive:int=None):
+    """Configure the shared HTTP client used by every fetch in the package
+
+    Existing sessions are closed so the new limits take effect on the next
+    request.
+
+    Parameters:
+    -----------
+    pool_size : int, default 100
+        maximum number of open connections
+
+    per_host : int, default 20
+        maximum number of open connections to a single host
+
+    keepalive : int, default 30
+        seconds an idle connection is kept open for reuse
+
+    """
+    with _lock:
+        if pool_size is not None:
+            _config['pool_size'] = int(pool_size)
+        if per_host is not None:
+            _config['per_host'] = int(per_host)
+        if keepalive is not None:
+            _config['keepalive'] = int(keepalive)
+    close()
+
+def settings() -> dict:
+    """Get a copy of the current client settings"""
+    return dict(_config)
+
+async def get_client_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session for the running event loop
+
+    aiohttp sessions are bound to the loop they were created in, so one pooled
+    session is kept per loop and reused for every request made from it. Sync
+    callers all share the session of the background loop (see `runner`).
+    """
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=_config['pool_size'],
+            limit_per_host=_config['per_host'],
+            keepalive_timeout=_config['keepalive'])
+        # bodies are decompressed by `_read_body` so the wire size is known
+        session = aiohttp.ClientSession(connector=connector,auto_decompress=False)
+        _async_sessions[loop] = session
+    return session
+
+async def close_client_session():
+    """Close the pooled aiohttp session of the running event loop
+
+    Call this before the loop is shut down (e.g. at the end of the coroutine
+    passed to `asyncio.run`) when the loop is not reused.
+    """
+    session = _async_sessions.pop(asyncio.get_running_loop(),None)
+    if session is not None and not session.closed:
+        await session.close()
+
+# read size for response bodies
+CHUNK_SIZE = 64 * 1024
+
+async def _read_body(resp:aiohttp.ClientResponse,session:aiohttp.ClientSession) -> tuple[bytes,int]:
+    """Read (and decompress) a response body; returns (content, wire bytes)"""
+    decoder = None
+    if not getattr(session,'auto_decompress',True):
+        decoder = encoding.decoder(resp.headers.get('Content-Encoding'))
+    wire = 0
+    chunks = []
+    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+        wire += len(chunk)
+        chunks.append(chunk if decoder is None else decoder.feed(chunk))
+    if decoder is not None:
+        chunks.append(decoder.flush())
+    return b''.join(chunks), wire
+
+def _decoded_headers(headers) -> dict:
+    # the stored body is always decoded, so its encoding/length no longer apply
+    return {k:v for k, v in headers.items() if k.lower() not in ('content-encoding','content-length')}
+
+class Response:
+    """Fully-read response returned by the async fetch path
+
+    Unlike aiohttp's response object, the body has already been read so it can
+    be shared, cached and parsed after the connection is released. The decoded
+    JSON is kept after the first `json()` call. Callers coalesced onto one
+    request (see `singleflight`) each get their own `copy()`, so a parser
+    that modifies its payload in place can't change another caller's.
+    """
+    __slots__ = ('url','status','headers','content','from_cache','_json')
+    def __init__(self,url:str,status:int,headers:dict,content:bytes,from_cache:bool=False):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = content
+        self.from_cache = from_cache
+        self._json = None
+
+    def json(self):
+        if self._json is None:
+            with timing.phase('decode'):
+                self._json = jsondecode.loads(self.content)
+        return self._json
+
+    def text(self,encoding:str='utf-8') -> str:
+        return self.content.decode(encoding,errors='replace')
+
+    def copy(self) -> 'Response':
+        """The same response (sharing its body) with its own decoded JSON"""
+        return Response(self.url,self.status,self.headers,self.content,self.from_cache)
+
+class SyncResponse(requests.Response):
+    """`requests.Response` whose `json()` goes through the pluggable decoder"""
+    def json(self,**kwargs):
+        if kwargs:
+            return super().json(**kwargs)
+        with timing.phase('decode'):
+            return jsondecode.loads(self.content)
+
+def _from_cache(entry) -> Response:
+    return Response(entry.url,200,dict(entry.headers),entry.content,from_cache=True)
+
+def _as_requests_response(response:Response) -> requests.Response:
+    resp = SyncResponse()
+    resp.status_code = response.status
+    resp.url = response.url
+    resp.headers = CaseInsensitiveDict(response.headers)
+    resp._content = response.content
+    resp.encoding = 'utf-8'
+    return resp
+
+def _conditional_headers(entry,kwargs:dict) -> dict:
+    headers = dict(kwargs.pop('headers',None) or {})
+    if entry is not None:
+        for k, v in entry.validators().items():
+            headers.setdefault(k,v)
+    return headers
+
+def _encode_params(params):
+    if isinstance(params,dict):
+        # encode params the way requests does: None values are dropped and
+        # anything that isn't a str/int/float (aiohttp rejects it) is str()'d
+        params = {k:(v if type(v) in (str,int,float) else str(v)) for k,v in params.items() if v is not None}
+    return params
+
+async def request(url:str,params=None,session:aiohttp.ClientSession=None,**kwargs) -> Response:
+    """Asynchronous GET request through the shared session and response cache
+
+    Compressed responses are requested ('Accept-Encoding') and decoded while
+    reading; `metrics` records wire and decoded bytes per endpoint. Stale
+    cache entries are revalidated with 'If-None-Match' /
+    'If-Modified-Since'; a '304 Not Modified' reuses the stored body.
+    Concurrent requests for the same URL share one network call. Timeouts,
+    connection errors and 429/5xx responses are retried according to
+    `retry.retry_policy`; a `FetchError` is raised once the retries run out.
+    Every attempt is paced by `ratelimit.rate_limiter`.
+    """
+    params = _encode_params(params)
+    key = cache_key(url,params)
+    entry = await response_cache.get_async(key,stale=True)
+    if entry is not None and entry.fresh:
+        return _from_cache(entry)
+
+    response = await inflight.do(key,lambda: _request(key,entry,url,params,session,kwargs))
+    return response.copy()
+
+async def _request(key:str,entry,url:str,params,session:aiohttp.ClientSession,kwargs:dict) -> Response:
+    replayed = transport.replayed(key)
+    if replayed is not None:
+        return Response(replayed.url,replayed.status,dict(replayed.headers),replayed.content)
+
+    target = transport.route(url)
+    if session is None:
+        session = await get_client_session()
+    headers = _conditional_headers(entry,kwargs)
+    headers.setdefault('Accept-Encoding',encoding.accept_encoding())
+    kwargs.setdefault('timeout',aiohttp.ClientTimeout(total=None,sock_connect=retry_policy.timeout,sock_read=retry_policy.timeout))
+    endpoint = endpoint_key(url)
+    retry_policy.budget.deposit()
+    attempt = 0
+    while True:
+        retry_after = None
+        with timing.phase('throttle'):
+            await rate_limiter.wait_async(target)
+        started = time.perf_counter()
+        try:
+            with timing.phase('network'):
+                async with session.get(target,params=params,headers=headers,**kwargs) as resp:
+                    content, wire = await _read_body(resp,session)
+                    response = Response(transport.restore(str(resp.url)),resp.status,_decoded_headers(resp.headers),content)
+            metrics.observe_request(endpoint,response.status,wire,len(content),time.perf_counter() - started)
+            if response.status not in RETRY_STATUSES:
+                break
+            error = FetchError(url,response.status,resp.reason or '')
+            retry_after = response.headers.get('Retry-After')
+        except (aiohttp.ClientError,asyncio.TimeoutError,encoding.DecodeError) as e:
+            metrics.observe_request(endpoint,'error',0,0,time.perf_counter() - started)
+            error = FetchError(url,reason=repr(e))
+            error.__cause__ = e
+        delay = retry_policy.delay(attempt,retry_after)
+        if delay is None:
+            raise error
+        await asyncio.sleep(delay)
+        attempt += 1
+
+    transport.record(key,response.url,response.status,response.headers,content)
+
+    if entry is not None:
+        if await response_cache.revalidated_async(key,entry,response.status == 304) is not None:
+            return _from_cache(entry)
+
+    if response.status == 200:
+        await response_cache.set_async(key,response.url,content,response.headers)
+    return response
+
+async def stream(url:str,params=None,session:aiohttp.ClientSession=None,chunk_size:int=CHUNK_SIZE,**kwargs) -> AsyncIterator[bytes]:
+    """Asynchronous GET request yielding the decoded body chunk by chunk
+
+    For responses too large to hold in memory at once (see `jsonstream`).
+    Requests are paced, retried and counted like `request()`, but a retry is
+    only possible before the first chunk has been yielded; a failure after
+    that raises `FetchError`. Streamed bodies bypass the response cache and
+    request coalescing, and are not saved when recording (a recorded
+    response is still replayed).
+    """
+    params = _encode_params(params)
+    replayed = transport.replayed(cache_key(url,params))
+    if replayed is not None:
+        for i in range(0,len(replayed.content),chunk_size):
+            yield replayed.content[i:i + chunk_size]
+        return
+
+    target = transport.route(url)
+    if session is None:
+        session = await get_client_session()
+    headers = dict(kwargs.pop('headers',None) or {})
+    headers.setdefault('Accept-Encoding',encoding.accept_encoding())
+    kwargs.setdefault('timeout',aiohttp.ClientTimeout(total=None,sock_connect=retry_policy.timeout,sock_read=retry_policy.timeout))
+    endpoint = endpoint_key(url)
+    retry_policy.budget.deposit()
+    attempt = 0
+    while True:
+        retry_after = None
+        with timing.phase('throttle'):
+            await rate_limiter.wait_async(target)
+        started = time.perf_counter()
+        wire = decoded = 0
+        yielded = False
+        try:
+            async with session.get(target,params=params,headers=headers,**kwargs) as resp:
+                if resp.status != 200:
+                    with timing.phase('network'):
+                        await resp.read()
+                    metrics.observe_request(endpoint,resp.status,0,0,time.perf_counter() - started)
+                    error = FetchError(url,resp.status,resp.reason or '')
+                    if resp.status not in RETRY_STATUSES:
+                        raise error
+                    retry_after = resp.headers.get('Retry-After')
+                else:
+                    decoder = None
+                    if not getattr(session,'auto_decompress',True):
+                        decoder = encoding.decoder(resp.headers.get('Content-Encoding'))
+                    while True:
+                        with timing.phase('network'):
+                            chunk = await resp.content.read(chunk_size)
+                            if chunk:
+                                wire += len(chunk)
+                                data = chunk if decoder is None else decoder.feed(chunk)
+                            else:
+                                data = b'' if decoder is None else decoder.flush()
+                        decoded += len(data)
+                        # compressed chunks can expand a lot; hand them out in
+                        # pieces of at most `chunk_size`
+                        for i in range(0,len(data),chunk_size):
+                            yielded = True
+                            yield data[i:i + chunk_size]
+                        if not chunk:
+                            break
+                    metrics.observe_request(endpoint,resp.status,wire,decoded,time.perf_counter() - started)
+                    return
+        except (aiohttp.ClientError,asyncio.TimeoutError,encoding.DecodeError) as e:
+            metrics.observe_request(endpoint,'error',wire,decoded,time.perf_counter() - started)
+            error = FetchError(url,reason=repr(e))
+            error.__cause__ = e
+            if yielded:
+                raise error
+        delay = retry_policy.delay(attempt,retry_after)
+        if delay is None:
+            raise error
+        await asyncio.sleep(delay)
+        attempt += 1
+
+def get(url:str,params=None,**kwargs) -> requests.Response:
+    """Synchronous GET request
+
+    Runs `request()` on the background event loop, so every thread shares the
+    same connection pool, cache, coalescing, retries and rate limiting.
+    """
+    return _as_requests_response(run_sync(request(url,params,**kwargs)))
+
+def _in_loop(loop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+def close():
+    """Close all pooled sessions and their connections"""
+    with _lock:
+        sessions = list(_async_sessions.items())
+        _async_sessions.clear()
+    for loop, session in sessions:
+        if session.closed:
+            continue
+        if loop.is_closed():
+            # its connections went away with the loop
+            session.detach()
+            continue
+        if loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(session.close(),loop)
+            if not _in_loop(loop):
+                try:
+                    future.result(5)
+                except Exception:
+                    pass
+        else:
+            loop.run_until_complete(session.close())
+
+atexit.register(close)
@@ -1,10 +1,11 @@
-import asyncio
-import aiohttp
 from urllib.parse import urlparse, parse_qs
 
 import pandas as pd
 
-from ..mlbdata import get_teams_df
+from ..mlbdata import get_teams_df, team_index
+from .client import Response, request
+from .scheduler import scheduler
+from .runner import run_sync
 
 TEAMS = get_teams_df().sort_values(by='season',ascending=False)
 
@@ -32,8 +33,8 @@ def roster_json_to_df(rosters_list:list[dict]):
     df = pd.DataFrame(data)
     return df
 
-async def parse_data(response:aiohttp.ClientResponse):
-    url_components = urlparse(str(response.url))
+async def parse_data(response:Response):
+    url_components = urlparse(response.url)
     path = url_components.path
     params = parse_qs(url_components.query)
     
@@ -43,29 +44,28 @@ async def parse_data(response:aiohttp.ClientResponse):
     mlbam = path[first_slash_idx+1:last_slash_idx]
     season = params['season'][0]
     
-    team_row = TEAMS[(TEAMS['mlbam']==int(mlbam)) & (TEAMS['season']==int(season))].iloc[0]
+    team_row = team_index()[int(mlbam),int(season)]
     
-    roster: dict = await response.json()
+    roster: dict = response.json()
     roster['season'] = int(season)
     roster['team_mlbam'] = roster.pop('teamId')
-    roster['team_name'] = team_row['name_full']
+    roster['team_name'] = team_row.name_full
     
     return roster
 
 async def fetch_coaches():
-    parsed_responses = []
-    async with aiohttp.ClientSession() as sesh:
-        tasks = []
-        for idx,row in TEAMS.iterrows():
-            mlbam, season = (row['mlbam'], row['season'])
-            url = f'https://statsapi.mlb.com/api/v1/teams/{mlbam}/coaches?season={season}'
-            tasks.append(sesh.get(url,ssl=False))
-        client_responses = await asyncio.gather(*tasks)
-        for response in client_responses:
-            parsed_responses.append(await parse_data(response))
-            
+    urls = []
+    for mlbam, season in zip(TEAMS['mlbam'],TEAMS['season']):
+        urls.append(f'https://statsapi.mlb.com/api/v1/teams/{mlbam}/coaches?season={season}')
+    
+    async def _get(url):
+        response = await request(url,ssl=False)
+        return await parse_data(response)
+    
+    parsed_responses = await scheduler.map(_get,urls)
+        
     return parsed_responses
 
 def runit():
-    retrieved = asyncio.run(fetch_coaches())
+    retrieved = run_sync(fetch_coaches())
     return retrieved
\ No newline at end of file
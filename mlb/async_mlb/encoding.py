@@ -0,0 +1,89 @@
+"""Content-Encoding negotiation and streaming decompression
+
+The client asks for compressed responses ('gzip', 'deflate', and 'br' when
+the `brotli` or `brotlicffi` package is installed) and decompresses the body
+chunk by chunk while reading it, so both the bytes on the wire and the
+decoded size are known for every response.
+"""
+import zlib
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+class DecodeError(Exception):
+    """A response body could not be decoded"""
+
+
+def supported() -> list:
+    """Encodings the client can decode, in order of preference"""
+    encodings = ['gzip','deflate']
+    if brotli is not None:
+        encodings.insert(0,'br')
+    return encodings
+
+def accept_encoding() -> str:
+    """Value for the 'Accept-Encoding' request header"""
+    return ', '.join(supported())
+
+
+class StreamDecoder:
+    """Incremental decoder for one response body"""
+    def __init__(self,encoding:str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._obj = brotli.Decompressor()
+            # brotli exposes process(); brotlicffi names it decompress()
+            self._feed = getattr(self._obj,'process',None) or self._obj.decompress
+        elif encoding == 'gzip':
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            self._feed = self._obj.decompress
+        else:
+            self._obj = zlib.decompressobj(zlib.MAX_WBITS)
+            self._feed = self._deflate
+            self._started = False
+
+    def _deflate(self,chunk:bytes) -> bytes:
+        # 'deflate' is supposed to be zlib-wrapped but some servers send raw
+        # deflate data; switch on the first chunk if the header is missing
+        if not self._started:
+            self._started = True
+            try:
+                return self._obj.decompress(chunk)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(chunk)
+
+    def feed(self,chunk:bytes) -> bytes:
+        try:
+            return self._feed(chunk)
+        except Exception as e:
+            raise DecodeError(f"invalid {self.encoding} data: {e}") from e
+
+    def flush(self) -> bytes:
+        if self.encoding == 'br':
+            return b''
+        try:
+            return self._obj.flush()
+        except Exception as e:
+            raise DecodeError(f"invalid {self.encoding} data: {e}") from e
+
+def decoder(content_encoding:Optional[str]) -> Optional[StreamDecoder]:
+    """Decoder for a 'Content-Encoding' header value (None when the body is
+    not encoded)"""
+    if not content_encoding:
+        return None
+    encoding = content_encoding.strip().lower()
+    if encoding in ('identity',''):
+        return None
+    if encoding == 'x-gzip':
+        encoding = 'gzip'
+    if encoding not in supported():
+        raise DecodeError(f"unsupported Content-Encoding: {content_encoding}")
+    return StreamDecoder(encoding)
@@ -1,16 +1,7 @@
-import asyncio
-import aiohttp
-import nest_asyncio
-nest_asyncio.apply()
-
-import time
-def _determine_loop():
-    try:
-        return asyncio.get_event_loop()
-    except:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        return asyncio.get_event_loop()
+from . import timing
+from .client import request
+from .scheduler import scheduler, BatchResult
+from .runner import run_sync
 
 class FetchedResponse:
     def __init__(self,_url,_headers,_json) -> None:
@@ -18,33 +9,27 @@ class FetchedResponse:
         self.headers: dict = _headers
         self.json: dict = _json
 
-async def fetch(urls:list):
-    retrieved_responses = []
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for url in urls:
-            tasks.append(session.get(url, ssl=True))
+async def _fetch_one(url:str) -> FetchedResponse:
+    response = await request(url, ssl=True)
+    
+    return FetchedResponse(response.url,response.headers,response.json())
 
-        responses = await asyncio.gather(*tasks)
-        
-        for response in responses:
-            resp_url = str(response.url)
-            resp_headers = dict(response.headers)
-            resp_json = await response.json()
-            
-            sync_resp = FetchedResponse(resp_url,resp_headers,resp_json)
-            
-            retrieved_responses.append(sync_resp)
-        
-        await session.close()
+@timing.timed('fetch')
+async def fetch(urls:list):
+    retrieved_responses = await scheduler.settle(_fetch_one,urls)
     
     return retrieved_responses
 
-def runit(urls:list,**kwargs) -> list[FetchedResponse]:
-    start = time.time()
-    loop = _determine_loop()
-    retrieved = loop.run_until_complete(fetch(urls))
+def runit(urls:list,**kwargs) -> BatchResult:
+    """Fetch `urls` concurrently
+
+    Returns a `BatchResult` (a list of `FetchedResponse` in the same order as
+    `urls`); requests that still failed after their retries are None and
+    listed in its `failed` attribute.
+    """
+    with timing.call('fetch') as t:
+        retrieved = run_sync(fetch(urls))
     if kwargs.get("log",kwargs.get("logtime")):
-        print(f"--- {time.time() - start } seconds ---")
+        timing.print_sink(t)
 
     return retrieved
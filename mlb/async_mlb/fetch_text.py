@@ -1,29 +1,19 @@
 import lxml
-import asyncio
-import aiohttp
 from bs4 import BeautifulSoup as bs
-import nest_asyncio
-nest_asyncio.apply()
 
 import time
 # import pandas as pd
 
-async def fetch(urls:list):
-    retrieved_responses = []
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for url in urls:
-            tasks.append(session.get(url, ssl=True))
+from .client import request
+from .scheduler import scheduler
+from .runner import run_sync
 
-        responses = await asyncio.gather(*tasks)
-        
-        for response in responses:
-            
-            resp = await response.text()
+async def _fetch_one(url:str) -> str:
+    response = await request(url, ssl=True)
+    return response.text()
 
-            retrieved_responses.append(resp)
-        
-        await session.close()
+async def fetch(urls:list):
+    retrieved_responses = await scheduler.map(_fetch_one,urls)
     
     return retrieved_responses
 
@@ -31,8 +21,7 @@ def runit(urls:list,_log=False):
     start = time.time()
     # retrieved = asyncio.run(fetch(urls))
 
-    loop = asyncio.get_event_loop()
-    retrieved = loop.run_until_complete(fetch(urls))
+    retrieved = run_sync(fetch(urls))
     
     if _log is True:
         print(f"--- {time.time() - start } seconds ---")
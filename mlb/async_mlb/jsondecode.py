@@ -0,0 +1,94 @@
+import gc
+import json
+import time
+from typing import Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# name -> function decoding a JSON document straight from the response bytes
+_backends = {'json': json.loads}
+if orjson is not None:
+    _backends['orjson'] = orjson.loads
+
+_backend = 'orjson' if orjson is not None else 'json'
+_loads = _backends[_backend]
+
+
+def loads(data: bytes):
+    """Decode a JSON response body with the active backend
+
+    orjson (used automatically when installed) parses the raw bytes directly;
+    the stdlib fallback accepts bytes as well but decodes them to a `str`
+    first.
+    """
+    return _loads(data)
+
+def backend() -> str:
+    """Name of the active JSON backend"""
+    return _backend
+
+def backends() -> list:
+    """Names of the available JSON backends"""
+    return list(_backends)
+
+def register_backend(name:str,fn:Callable):
+    """Make a decoder (any callable taking bytes) available as `name`"""
+    _backends[name] = fn
+
+def set_backend(name:str):
+    """Switch the decoder used for every API response
+
+    Parameters:
+    -----------
+    name : str
+        one of `backends()` ('json', and 'orjson' when installed)
+
+    """
+    global _backend, _loads
+    if name not in _backends:
+        raise ValueError(f"unknown JSON backend '{name}', expected one of {backends()}")
+    _backend = name
+    _loads = _backends[name]
+
+def benchmark(payload:Optional[bytes]=None,url:Optional[str]=None,number:int=10) -> dict:
+    """Compare the decode time of every available backend
+
+    Parameters:
+    -----------
+    payload : bytes, optional
+        JSON document to decode
+
+    url : str, optional
+        fetch the payload from this URL instead (default: a live game feed)
+
+    number : int, default 10
+        decodes per backend; the best run is reported
+
+    Returns a dict of backend name -> seconds per decode (plus 'bytes', the
+    payload size).
+    """
+    if payload is None:
+        from .client import get
+        if url is None:
+            url = 'https://statsapi.mlb.com/api/v1.1/game/661032/feed/live'
+        payload = get(url).content
+
+    results = {'bytes': len(payload)}
+    gc_enabled = gc.isenabled()
+    gc.disable()    # same as timeit: keep collections out of the measurement
+    try:
+        for name, fn in _backends.items():
+            fn(payload)
+            best = float('inf')
+            for _ in range(number):
+                start = time.perf_counter()
+                fn(payload)
+                best = min(best,time.perf_counter() - start)
+            results[name] = best
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return results
@@ -0,0 +1,141 @@
+"""Incremental decoding of the items of a JSON array
+
+Large responses (e.g. a hydrated season schedule) are mostly one big array
+under a top-level key. `ArrayItems` is fed the body chunk by chunk as it is
+read and returns each item of that array as soon as it is complete, so items
+can be processed and discarded one at a time instead of holding the whole
+body and its decoded dict tree in memory.
+
+```
+>>> items = ArrayItems('dates')
+>>> async for chunk in client.stream(url):
+...     for date in items.feed(chunk):
+...         ...
+```
+
+Items are decoded with the stdlib's C scanner (`json.JSONDecoder.raw_decode`),
+which can start at any offset of the buffer; an item cut off by the end of a
+chunk is decoded again once the next chunk is in. A number or literal is only
+taken once the character after it is in the buffer, since `1.` or `tru` at the
+end of a chunk may be the start of `1.5` or `true`. The other top-level values
+are decoded and dropped. `close()` raises if the body ended before the array
+did (a truncated response or a dropped connection).
+"""
+import re
+import json
+import codecs
+from json.decoder import scanstring
+
+_decoder = json.JSONDecoder()
+_WS = re.compile(r'[ \t\n\r]*')
+# what may follow a complete number or literal
+_DELIMITERS = frozenset(',]} \t\n\r')
+
+_START = 0
+_KEYS = 1
+_ITEMS = 2
+
+
+class ArrayItems:
+    """Incremental decoder for the items of `document[key]`
+
+    `done` is set once the array (or, if the key is missing, the document)
+    has ended.
+
+    Parameters:
+    -----------
+    key : str
+        top-level key of the array (e.g. 'dates')
+
+    """
+    __slots__ = ('key','done','_buf','_pos','_state','_utf8')
+    def __init__(self,key:str):
+        self.key = key
+        self.done = False
+        self._buf = ''
+        self._pos = 0
+        self._state = _START
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+
+    def feed(self,chunk:bytes) -> list:
+        """Read the next chunk of the document; returns the items it completed"""
+        if self.done:
+            return []
+        buf = self._buf[self._pos:] + self._utf8.decode(chunk)
+        n = len(buf)
+        skip = _WS.match
+        items = []
+        pos = 0
+        state = self._state
+        while True:
+            pos = skip(buf,pos).end()
+            if pos >= n:
+                break
+            c = buf[pos]
+            if state == _START:
+                if c != '{':
+                    raise ValueError(f"expected a JSON object, got {c!r} at the start of the document")
+                state = _KEYS
+                pos += 1
+            elif c == ',':
+                pos += 1
+            elif c in '}]':
+                self.done = True
+                break
+            elif state == _KEYS:
+                parsed = self._member(buf,pos)
+                if parsed is None:
+                    break
+                pos, state = parsed
+            else:
+                value = self._value(buf,pos)
+                if value is None:
+                    break
+                items.append(value[0])
+                pos = value[1]
+        self._state = state
+        self._buf = '' if self.done else buf
+        self._pos = pos
+        return items
+
+    def close(self):
+        """Signal the end of the document; raises ValueError if the array (or
+        the document) hasn't ended"""
+        if not self.done:
+            raise ValueError(f"the document ended before its {self.key!r} array did")
+
+    def _member(self,buf:str,pos:int):
+        # `"key": value` of the top-level object; None until it is complete
+        if buf[pos] != '"':
+            raise ValueError(f"expected an object key at {buf[pos:pos + 20]!r}")
+        try:
+            key, pos = scanstring(buf,pos + 1)
+        except ValueError:
+            return None
+        pos = _WS.match(buf,pos).end()
+        if pos >= len(buf):
+            return None
+        if buf[pos] != ':':
+            raise ValueError(f"expected ':' after the key {key!r}")
+        pos = _WS.match(buf,pos + 1).end()
+        if pos >= len(buf):
+            return None
+        if key == self.key and buf[pos] == '[':
+            return pos + 1, _ITEMS
+        value = self._value(buf,pos)
+        if value is None:
+            return None
+        return value[1], _KEYS
+
+    @staticmethod
+    def _value(buf:str,pos:int):
+        # (value, end) of the value at `pos`; None until it is complete
+        try:
+            value, end = _decoder.raw_decode(buf,pos)
+        except ValueError:
+            return None
+        if not isinstance(value,(dict,list,str)) and (end >= len(buf) or buf[end] not in _DELIMITERS):
+            # a number or literal is only complete once what follows it is in
+            # ('1.' may be the start of '1.5'; raw_decode stops at the '.')
+            return None
+        return value, end
@@ -0,0 +1,307 @@
+"""Metrics registry with a Prometheus text exporter
+
+The fetch path reports requests, response sizes and latency per endpoint,
+every public call reports its duration and per-phase time (see `timing`),
+and the cache, coalescing, retry and rate limiter counters are read when the
+metrics are rendered.
+
+```
+>>> from mlb.async_mlb import metrics
+>>> print(metrics.render())                 # Prometheus text format
+>>> server = metrics.serve(port=9464)       # GET /metrics on a background thread
+```
+"""
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, Optional
+
+from . import timing
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.005,0.01,0.025,0.05,0.1,0.25,0.5,1.0,2.5,5.0,10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\','\\\\').replace('\n','\\n').replace('"','\\"')
+
+def _format_labels(labels:dict) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+def _format_value(value:float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value,float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value,float) else str(value)
+
+
+class _Metric:
+    kind = 'untyped'
+    def __init__(self,name:str,help:str='',labels:Iterable[str]=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self,labels:dict) -> tuple:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[k]) for k in self.labels)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self) -> list:
+        """(suffix, labels, value) for every series"""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+    kind = 'counter'
+    def inc(self,amount:float=1,**labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key,0) + amount
+
+    def value(self,**labels) -> float:
+        return self._values.get(self._key(labels),0)
+
+    def samples(self) -> list:
+        with self._lock:
+            items = list(self._values.items())
+        return [('_total' if not self.name.endswith('_total') else '',dict(zip(self.labels,k)),v) for k, v in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+    kind = 'gauge'
+    def set(self,value:float,**labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> list:
+        with self._lock:
+            items = list(self._values.items())
+        return [('',dict(zip(self.labels,k)),v) for k, v in items]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    kind = 'histogram'
+    def __init__(self,name:str,help:str='',labels:Iterable[str]=(),buckets:Iterable[float]=DEFAULT_BUCKETS):
+        super().__init__(name,help,labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self,value:float,**labels):
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets,value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1),0.0,0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> list:
+        with self._lock:
+            items = [(k,(list(v[0]),v[1],v[2])) for k, v in self._values.items()]
+        out = []
+        for key, (counts, total, n) in items:
+            labels = dict(zip(self.labels,key))
+            running = 0
+            for bound, count in zip(self.buckets + (float('inf'),),counts):
+                running += count
+                out.append(('_bucket',{**labels,'le':_format_value(float(bound))},running))
+            out.append(('_sum',labels,total))
+            out.append(('_count',labels,n))
+        return out
+
+
+class Registry:
+    """Named metrics plus collectors that are read at render time
+
+    A collector is a callable returning `(name, kind, help, samples)` tuples,
+    where `samples` is a list of `(labels, value)`.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = []
+
+    def _get_or_create(self,cls,name:str,help:str,labels:Iterable[str],**kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name,help,labels,**kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self,name:str,help:str='',labels:Iterable[str]=()) -> Counter:
+        return self._get_or_create(Counter,name,help,labels)
+
+    def gauge(self,name:str,help:str='',labels:Iterable[str]=()) -> Gauge:
+        return self._get_or_create(Gauge,name,help,labels)
+
+    def histogram(self,name:str,help:str='',labels:Iterable[str]=(),buckets:Iterable[float]=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram,name,help,labels,buckets=buckets)
+
+    def add_collector(self,collector:Callable[[],list]):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def reset(self):
+        """Clear every metric's values (collectors are left alone)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for metric in metrics:
+            samples = metric.samples()
+            if not samples:
+                continue
+            base = metric.name[:-6] if metric.kind == 'counter' and metric.name.endswith('_total') else metric.name
+            lines.append(f"# HELP {base} {metric.help}")
+            lines.append(f"# TYPE {base} {metric.kind}")
+            for suffix, labels, value in samples:
+                name = metric.name if suffix == '' else base + suffix
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for collector in collectors:
+            for name, kind, help, samples in collector():
+                base = name[:-6] if kind == 'counter' and name.endswith('_total') else name
+                lines.append(f"# HELP {base} {help}")
+                lines.append(f"# TYPE {base} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+requests_total = registry.counter('mlb_requests_total','HTTP requests sent (every attempt)',('endpoint','status'))
+wire_bytes = registry.counter('mlb_wire_bytes_total','Response body bytes received on the wire (possibly compressed)',('endpoint',))
+response_bytes = registry.counter('mlb_response_bytes_total','Response body bytes after decompression',('endpoint',))
+request_seconds = registry.histogram('mlb_request_seconds','Time to send a request and read its response',('endpoint',))
+call_seconds = registry.histogram('mlb_call_seconds','Duration of public calls',('function',),
+                                  buckets=(0.01,0.05,0.1,0.25,0.5,1.0,2.5,5.0,10.0,30.0,60.0))
+phase_seconds = registry.counter('mlb_phase_seconds_total','Time spent per phase of public calls',('function','phase'))
+call_errors = registry.counter('mlb_call_errors_total','Public calls that raised',('function',))
+
+
+def observe_request(endpoint:str,status,wire:int,decoded:int,seconds:float):
+    """Record one HTTP attempt (`status` is the HTTP status or 'error')"""
+    requests_total.inc(endpoint=endpoint,status=status)
+    if wire or decoded:
+        wire_bytes.inc(wire,endpoint=endpoint)
+        response_bytes.inc(decoded,endpoint=endpoint)
+    request_seconds.observe(seconds,endpoint=endpoint)
+
+def transfer_stats() -> dict:
+    """Wire vs decoded bytes per endpoint
+
+    `ratio` is wire / decoded, i.e. the share of the payload that actually
+    went over the network.
+    """
+    out = {}
+    for _, labels, wire in wire_bytes.samples():
+        decoded = response_bytes.value(**labels)
+        out[labels['endpoint']] = {
+            'wire': wire,
+            'decoded': decoded,
+            'ratio': wire / decoded if decoded else 1.0,
+        }
+    return out
+
+def _observe_call(call:timing.CallTiming):
+    call_seconds.observe(call.total,function=call.name)
+    for phase, seconds in call.phases.items():
+        phase_seconds.inc(seconds,function=call.name,phase=phase)
+    if call.error is not None:
+        call_errors.inc(function=call.name)
+
+timing.add_sink(_observe_call)
+
+
+def _collect_components() -> list:
+    from .cache import response_cache
+    from .singleflight import inflight
+    from .retry import retry_policy
+    from .ratelimit import rate_limiter
+    from .scheduler import scheduler
+
+    cache = response_cache.stats()
+    coalescing = inflight.stats()
+    retries = retry_policy.stats()
+    limits = rate_limiter.stats()
+    lanes = scheduler.stats()
+    return [
+        ('mlb_cache_hits_total','counter','Response cache hits (including revalidated entries)',[({},cache['hits'])]),
+        ('mlb_cache_misses_total','counter','Response cache misses',[({},cache['misses'])]),
+        ('mlb_cache_hit_ratio','gauge','Share of cache lookups that were hits',[({},cache['hit_ratio'])]),
+        ('mlb_cache_revalidations_total','counter','Stale entries revalidated with a conditional request',[({},cache['revalidations'])]),
+        ('mlb_cache_evictions_total','counter','Entries evicted from the response cache',[({},cache['evictions'])]),
+        ('mlb_cache_bytes','gauge','Size of the response cache',[({},cache['bytes'])]),
+        ('mlb_coalesced_requests_total','counter','Requests served by an identical in-flight request',[({},coalescing['coalesced'])]),
+        ('mlb_in_flight_requests','gauge','Distinct requests currently in flight',[({},coalescing['in_flight'])]),
+        ('mlb_retries_total','counter','Requests retried',[({},retries['retries'])]),
+        ('mlb_retry_failures_total','counter','Requests given up after retrying',[({},retries['failures'])]),
+        ('mlb_ratelimit_acquired_total','counter','Rate limiter tokens acquired',[({},limits['acquired'])]),
+        ('mlb_ratelimit_wait_seconds_total','counter','Time spent waiting for the rate limiter',[({},limits['wait_time'])]),
+        ('mlb_scheduler_waiting','gauge','Scheduled requests waiting for a slot',[({'lane':k},v['waiting']) for k, v in lanes.items()]),
+        ('mlb_scheduler_running','gauge','Scheduled requests holding a slot',[({'lane':k},v['running']) for k, v in lanes.items()]),
+    ]
+
+registry.add_collector(_collect_components)
+
+
+def render() -> str:
+    """The package's metrics in the Prometheus text format"""
+    return registry.render()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves `registry.render()` on GET /metrics"""
+    registry: Registry = registry
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics','/'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type',CONTENT_TYPE)
+        self.send_header('Content-Length',str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self,*args):
+        pass
+
+def serve(port:int=9464,host:str='127.0.0.1',registry:Optional[Registry]=None) -> ThreadingHTTPServer:
+    """Serve the metrics over HTTP from a daemon thread
+
+    Call `shutdown()` on the returned server to stop it.
+    """
+    handler = MetricsHandler
+    if registry is not None:
+        handler = type('MetricsHandler',(MetricsHandler,),{'registry':registry})
+    httpd = ThreadingHTTPServer((host,port),handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever,name='mlb-metrics-server',daemon=True).start()
+    return httpd
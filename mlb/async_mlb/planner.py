@@ -0,0 +1,170 @@
+"""Stats query planner
+
+Several endpoints accept lists for the stat type and group, e.g.
+
+    /teams/145/stats?stats=season,seasonAdvanced&group=hitting,pitching
+    /teams/145/roster/40Man?hydrate=person(stats(type=[season],group=[hitting,pitching]))
+
+and return one `stats` item per type/group combination, each labelled with
+its `type.displayName` and `group.displayName`. A `QueryPlan` merges queries
+that only differ in their types/groups into one request, then splits each
+combined payload back into exactly what the individual queries would have
+returned, so callers (and their parsers) don't notice the merge.
+
+```
+>>> plan = QueryPlan([
+...     StatsQuery('/teams/145/stats',['season'],['hitting'],params={'season':2023}),
+...     StatsQuery('/teams/145/stats',['season'],['pitching'],params={'season':2023}),
+... ])
+>>> plan.urls
+['https://statsapi.mlb.com/api/v1/teams/145/stats?stats=season&group=hitting,pitching&season=2023']
+```
+"""
+from typing import Optional, Union
+
+from ..constants import BASE
+
+
+class StatsQuery:
+    """A request for stats of some types and groups
+
+    Parameters:
+    -----------
+    path : str
+        endpoint path below the API base (e.g. '/teams/145/stats')
+
+    types : list of str
+        stat types (e.g. 'season', 'seasonAdvanced')
+
+    groups : list of str
+        stat groups ('hitting', 'pitching', 'fielding')
+
+    params : dict, optional
+        other query parameters
+
+    hydrate : str, optional
+        when set, stats are requested through this hydration (e.g. 'person'
+        for roster entries) rather than as the endpoint's own 'stats'/'group'
+        parameters
+
+    args : dict, optional
+        other arguments of the hydrated `stats(...)` (e.g. sitCodes)
+
+    """
+    __slots__ = ('path','types','groups','params','hydrate','args')
+    def __init__(self,path:str,types:list,groups:list,params:Optional[dict]=None,hydrate:Optional[str]=None,args:Optional[dict]=None):
+        self.path = path
+        self.types = list(types)
+        self.groups = list(groups)
+        self.params = dict(params or {})
+        self.hydrate = hydrate
+        self.args = dict(args or {})
+
+    @property
+    def shape(self) -> tuple:
+        """Everything but the types/groups; queries of the same shape can be merged"""
+        return (self.path,tuple(self.params.items()),self.hydrate,tuple(self._args()))
+
+    @property
+    def url(self) -> str:
+        return self._url(self.types,self.groups)
+
+    def _url(self,types:list,groups:list) -> str:
+        params = "&".join(f"{k}={v}" for k, v in self.params.items())
+        if self.hydrate is None:
+            query = f"stats={','.join(types)}&group={','.join(groups)}"
+            if params:
+                query = f"{query}&{params}"
+        else:
+            args = [f"type=[{','.join(types)}]",f"group=[{','.join(groups)}]"] + self._args()
+            query = f"{params}&" if params else ""
+            query += f"hydrate={self.hydrate}(stats({','.join(args)}))"
+        return f"{BASE}{self.path}?{query}"
+
+    def _args(self) -> list:
+        return [f"{k}=[{','.join(map(str,v))}]" if isinstance(v,(list,tuple)) else f"{k}={v}" for k, v in self.args.items()]
+
+    def wants(self,stat_item:dict) -> bool:
+        st = stat_item.get('type',{}).get('displayName')
+        sg = stat_item.get('group',{}).get('displayName')
+        return st in self.types and sg in self.groups
+
+    def split(self,data:dict) -> dict:
+        """Reduce a merged payload to what this query alone returns
+
+        Builds new dicts; `data` may be shared with other callers and is left
+        untouched.
+        """
+        if self.hydrate is None:
+            if 'stats' not in data:
+                return data
+            return {**data,'stats':[s for s in data['stats'] if self.wants(s)]}
+
+        key = 'roster' if 'roster' in data else None
+        if key is None:
+            return data
+        entries = []
+        for entry in data[key]:
+            person = entry.get(self.hydrate)
+            if not isinstance(person,dict) or 'stats' not in person:
+                entries.append(entry)
+                continue
+            stats = [s for s in person['stats'] if self.wants(s)]
+            person = {k:v for k, v in person.items() if k != 'stats'}
+            if stats:
+                person['stats'] = stats
+            entries.append({**entry,self.hydrate:person})
+        return {**data,key:entries}
+
+    def __repr__(self) -> str:
+        return f"StatsQuery({self.url!r})"
+
+
+class QueryPlan:
+    """Minimum set of requests covering `items`
+
+    `items` may mix `StatsQuery` objects and plain URLs; URLs are requested
+    as they are. Merging keeps the first-seen order of types and groups.
+    """
+    def __init__(self,items:list):
+        self.items = list(items)
+        self.urls = []
+        self._slots = []
+
+        merged = {}
+        for item in self.items:
+            if isinstance(item,StatsQuery):
+                group = merged.setdefault(item.shape,{'query':item,'types':{},'groups':{}})
+                group['types'].update(dict.fromkeys(item.types))
+                group['groups'].update(dict.fromkeys(item.groups))
+
+        index = {}
+        for item in self.items:
+            if isinstance(item,StatsQuery):
+                group = merged[item.shape]
+                url = group['query']._url(list(group['types']),list(group['groups']))
+            else:
+                url = item
+            if url not in index:
+                index[url] = len(self.urls)
+                self.urls.append(url)
+            self._slots.append(index[url])
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def request_of(self,position:int) -> int:
+        """Index in `urls` of the request that serves item `position`"""
+        return self._slots[position]
+
+    def url_of(self,position:int) -> str:
+        """URL the item at `position` would have used on its own"""
+        item = self.items[position]
+        return item.url if isinstance(item,StatsQuery) else item
+
+    def payload(self,position:int,data:Union[dict,list]) -> Union[dict,list]:
+        """The part of the request's payload that belongs to item `position`"""
+        item = self.items[position]
+        if isinstance(item,StatsQuery) and isinstance(data,dict):
+            return item.split(data)
+        return data
@@ -1,9 +1,10 @@
 import asyncio
-import aiohttp
 # import pandas as pd
 # import time
 
 from ..constants import BASE
+from .client import request
+from .runner import run_sync
 # from ..constants import BAT_FIELDS
 # from ..constants import BAT_FIELDS_ADV
 # from ..constants import PITCH_FIELDS
@@ -25,7 +26,7 @@ def get_tasks(session,mlbam,season):
     }
     tasks = []
     for ep in endpoints.values():
-        tasks.append(session.get(BASE + ep.format(season=season), ssl=False))
+        tasks.append(request(BASE + ep.format(season=season), ssl=False, session=session))
     return tasks
 
 async def parse_data(response,idx,mlbam):
@@ -42,22 +43,20 @@ async def get_player_responses(mlbam,season):
     roster_hydrations = f"person(stats(type=[{statTypes}],group=[{statGroups}],season={season}))&season={season}"
     log_hydrations = "" # "team,decisions,gameInfo,venue,linescore,weather,series"
 
-    async with aiohttp.ClientSession() as session:
-        
-        endpoints = (
-            f"/players"
-        )
-        
-        tasks = []
-        for ep in endpoints:
-            tasks.append(session.get(BASE + ep, ssl=False))
-
-        responses = await asyncio.gather(*tasks)
-        
-        for idx, response in enumerate(responses):
-            resp = await response.json()
-            parsed = await parse_data(resp,idx,mlbam)
-            parsed_data.append(parsed)
+    endpoints = (
+        f"/players"
+    )
+    
+    tasks = []
+    for ep in endpoints:
+        tasks.append(request(BASE + ep, ssl=False))
+
+    responses = await asyncio.gather(*tasks)
+    
+    for idx, response in enumerate(responses):
+        resp = response.json()
+        parsed = await parse_data(resp,idx,mlbam)
+        parsed_data.append(parsed)
 
     parsed_data_dict = {
         "team_stats":parsed_data[0],
@@ -69,7 +68,7 @@ async def get_player_responses(mlbam,season):
 
 def runit(mlbam,season):
     # start = time.time()
-    retrieved = asyncio.run(get_player_responses(mlbam,season))
+    retrieved = run_sync(get_player_responses(mlbam,season))
     # print("--- {} seconds ---".format(time.time()-start))
     return retrieved
 
@@ -0,0 +1,182 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urlparse
+
+from ..paths import RATE_LIMIT_DB
+
+
+class RateLimiter:
+    """Token-bucket rate limiter keyed by host
+
+    Each host gets a bucket that refills at `rate` requests per second and
+    holds at most `burst` tokens. Acquiring a token never fails; it returns
+    how long the caller has to wait for its turn (tokens may go negative,
+    which queues later callers behind earlier ones).
+
+    With `shared=True` the buckets live in a SQLite file and are updated
+    inside an exclusive transaction, so every process using the same file
+    shares one budget per host. That transaction may wait for another
+    process's lock, so `wait_async()` runs it on a worker thread instead of
+    the event loop.
+
+    Parameters:
+    -----------
+    rate : float, default 20
+        requests per second per host (None disables rate limiting)
+
+    burst : int, default 20
+        number of requests that can go out back-to-back after an idle period
+
+    shared : bool, default False
+        coordinate with other processes through `path`
+
+    path : str
+        location of the SQLite file used when `shared=True`
+
+    host_rates : dict, optional
+        per-host overrides of `rate`, e.g. {'statsapi.mlb.com': 10}
+
+    """
+    def __init__(self,rate:Optional[float]=20,burst:int=20,shared:bool=False,path:str=RATE_LIMIT_DB,host_rates:Optional[dict]=None):
+        self.rate = rate
+        self.burst = burst
+        self.shared = shared
+        self.path = path
+        self.host_rates = dict(host_rates or {})
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._conn = None
+        self._executor = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.acquired = 0
+        self.waited = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.host_wait_time = {}
+
+    def stats(self) -> dict:
+        """Number of acquired tokens and time spent waiting for them"""
+        return {
+            'acquired': self.acquired,
+            'waited': self.waited,
+            'wait_time': self.wait_time,
+            'max_wait': self.max_wait,
+            'host_wait_time': dict(self.host_wait_time),
+        }
+
+    def _rate(self,host:str) -> Optional[float]:
+        return self.host_rates.get(host,self.rate)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.',exist_ok=True)
+            conn = sqlite3.connect(self.path,timeout=30,check_same_thread=False,isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS buckets (host TEXT PRIMARY KEY, tokens REAL, updated REAL)')
+            self._conn = conn
+        return self._conn
+
+    def _take(self,tokens:float,updated:float,rate:float,now:float):
+        tokens = min(float(self.burst),tokens + (now - updated) * rate) - 1
+        wait = -tokens / rate if tokens < 0 else 0.0
+        return tokens, wait
+
+    def reserve(self,host:str) -> float:
+        """Take a token for `host` and return the seconds to wait before using it"""
+        rate = self._rate(host)
+        if not rate:
+            return 0.0
+        now = time.time()
+        with self._lock:
+            if self.shared:
+                conn = self._connect()
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    row = conn.execute('SELECT tokens, updated FROM buckets WHERE host=?',(host,)).fetchone()
+                    tokens, updated = row if row else (float(self.burst),now)
+                    tokens, wait = self._take(tokens,updated,rate,now)
+                    conn.execute('INSERT OR REPLACE INTO buckets VALUES (?,?,?)',(host,tokens,now))
+                    conn.execute('COMMIT')
+                except BaseException:
+                    conn.execute('ROLLBACK')
+                    raise
+            else:
+                tokens, updated = self._buckets.get(host,(float(self.burst),now))
+                tokens, wait = self._take(tokens,updated,rate,now)
+                self._buckets[host] = (tokens,now)
+            self._record(host,wait)
+        return wait
+
+    def _record(self,host:str,wait:float):
+        self.acquired += 1
+        if wait > 0:
+            self.waited += 1
+            self.wait_time += wait
+            self.max_wait = max(self.max_wait,wait)
+            self.host_wait_time[host] = self.host_wait_time.get(host,0.0) + wait
+
+    def wait(self,url:str) -> float:
+        """Block until a request to `url`'s host may be sent"""
+        wait = self.reserve(urlparse(url).netloc)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def wait_async(self,url:str) -> float:
+        """Asynchronous version of `wait()`"""
+        host = urlparse(url).netloc
+        if self.shared and self._rate(host):
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1,thread_name_prefix='mlb-ratelimit')
+            wait = await asyncio.get_running_loop().run_in_executor(self._executor,self.reserve,host)
+        else:
+            wait = self.reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+rate_limiter = RateLimiter()
+
+def configure(rate:Optional[float]=False,burst:int=None,shared:bool=None,path:str=None,host_rates:Optional[dict]=None):
+    """Configure the package-wide rate limiter
+
+    Parameters:
+    -----------
+    rate : float, default 20
+        requests per second per host (pass None to disable rate limiting)
+
+    burst : int, default 20
+        number of back-to-back requests allowed after an idle period
+
+    shared : bool, default False
+        share the budget with other processes through a SQLite file
+
+    path : str
+        location of that file (default: 'ratelimit.db' in the cache directory)
+
+    host_rates : dict, optional
+        per-host rate overrides
+
+    """
+    with rate_limiter._lock:
+        if rate is not False:
+            rate_limiter.rate = rate
+        if burst is not None:
+            rate_limiter.burst = int(burst)
+        if shared is not None:
+            rate_limiter.shared = shared
+        if host_rates is not None:
+            rate_limiter.host_rates.update(host_rates)
+        if path is not None and path != rate_limiter.path:
+            if rate_limiter._conn is not None:
+                rate_limiter._conn.close()
+                rate_limiter._conn = None
+            rate_limiter.path = path
@@ -0,0 +1,292 @@
+"""Record/replay transport
+
+Responses can be recorded into a fixture archive and replayed later without
+touching the network, either in-process or through a local stand-in HTTP
+server that serves the archive (so the full HTTP stack is still exercised,
+e.g. for benchmarks).
+
+```
+>>> from mlb.async_mlb import replay
+>>> with replay.recording('fixtures/team_145'):
+...     mlb.Team(145)                           # hits the live API, saves every response
+>>> with replay.replaying('fixtures/team_145'):
+...     mlb.Team(145)                           # served from the archive
+>>> with replay.serve('fixtures/team_145'):
+...     mlb.Team(145)                           # served over HTTP by a local server
+```
+
+The stand-in server can also be run on its own:
+
+    python -m mlb.async_mlb.replay serve fixtures/team_145 --port 8080
+
+"""
+import os
+import json
+import hashlib
+import argparse
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse
+
+from .cache import cache_key, response_cache
+from .ratelimit import rate_limiter
+
+LIVE = 'live'
+RECORD = 'record'
+REPLAY = 'replay'
+
+_KEPT_HEADERS = ('content-type','etag','last-modified')
+
+
+class ArchiveEntry:
+    __slots__ = ('url','status','headers','content')
+    def __init__(self,url:str,status:int,headers:dict,content:bytes):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.content = content
+
+
+class Archive:
+    """Directory of recorded responses
+
+    `index.jsonl` holds one line per response (key, url, status, headers and
+    the body's file name); bodies are stored as-is under `bodies/`. Recording
+    the same key again replaces the earlier entry.
+    """
+    def __init__(self,path:str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index = None
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.path,'index.jsonl')
+
+    def _load(self) -> dict:
+        if self._index is None:
+            index = {}
+            if os.path.exists(self._index_path):
+                with open(self._index_path,'r',encoding='utf-8') as fh:
+                    for line in fh:
+                        if line.strip():
+                            row = json.loads(line)
+                            index[row['key']] = row
+            self._index = index
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __contains__(self,key:str) -> bool:
+        return key in self._load()
+
+    def keys(self) -> list:
+        return list(self._load())
+
+    def get(self,key:str) -> Optional[ArchiveEntry]:
+        row = self._load().get(key)
+        if row is None:
+            return None
+        with open(os.path.join(self.path,'bodies',row['body']),'rb') as fh:
+            content = fh.read()
+        return ArchiveEntry(row['url'],row['status'],row['headers'],content)
+
+    def put(self,key:str,url:str,status:int,headers:dict,content:bytes):
+        body = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        row = {
+            'key': key,
+            'url': url,
+            'status': status,
+            'headers': {k.lower():v for k,v in headers.items() if k.lower() in _KEPT_HEADERS},
+            'body': body,
+        }
+        with self._lock:
+            index = self._load()
+            os.makedirs(os.path.join(self.path,'bodies'),exist_ok=True)
+            with open(os.path.join(self.path,'bodies',body),'wb') as fh:
+                fh.write(content)
+            with open(self._index_path,'a',encoding='utf-8') as fh:
+                fh.write(json.dumps(row) + '\n')
+            index[key] = row
+
+
+class Transport:
+    """Decides where requests made by `client.request()` go
+
+    - 'live'   -- the network (default)
+    - 'record' -- the network, saving every response into `archive`
+    - 'replay' -- `archive` only; a request that isn't in it raises KeyError
+      (or goes to the network when `strict=False`)
+
+    When `base` is set (see `serve()`), requests are rewritten to that local
+    server as `{base}/{original host}{original path}`.
+    """
+    def __init__(self):
+        self.mode = LIVE
+        self.archive = None
+        self.strict = True
+        self.base = None
+
+    def route(self,url:str) -> str:
+        if self.base is None:
+            return url
+        parsed = urlparse(url)
+        return f"{self.base}/{parsed.netloc}{url[len(parsed.scheme) + 3 + len(parsed.netloc):]}"
+
+    def restore(self,url:str) -> str:
+        if self.base is None or not url.startswith(self.base + '/'):
+            return url
+        return 'https://' + url[len(self.base) + 1:]
+
+    def replayed(self,key:str) -> Optional[ArchiveEntry]:
+        if self.mode != REPLAY:
+            return None
+        entry = self.archive.get(key)
+        if entry is None and self.strict:
+            raise KeyError(f"no recorded response for {key}")
+        return entry
+
+    def record(self,key:str,url:str,status:int,headers:dict,content:bytes):
+        if self.mode == RECORD:
+            self.archive.put(key,url,status,headers,content)
+
+
+transport = Transport()
+
+
+@contextlib.contextmanager
+def _mode(mode:str,path:str,strict:bool=True,use_cache:bool=False):
+    previous = (transport.mode,transport.archive,transport.strict)
+    cache_enabled = response_cache.enabled
+    transport.mode = mode
+    transport.archive = Archive(path)
+    transport.strict = strict
+    # cache hits would never reach the transport (and skew timings)
+    response_cache.enabled = cache_enabled and use_cache
+    try:
+        yield transport.archive
+    finally:
+        transport.mode, transport.archive, transport.strict = previous
+        response_cache.enabled = cache_enabled
+
+def recording(path:str,use_cache:bool=False):
+    """Save every response fetched inside the block into the archive at `path`"""
+    return _mode(RECORD,path,use_cache=use_cache)
+
+def replaying(path:str,strict:bool=True,use_cache:bool=False):
+    """Serve every request inside the block from the archive at `path`
+
+    Parameters:
+    -----------
+    path : str
+        archive directory
+
+    strict : bool, default True
+        raise KeyError for requests that were not recorded (when False they
+        go to the network)
+
+    use_cache : bool, default False
+        keep using the response cache while replaying
+
+    """
+    return _mode(REPLAY,path,strict=strict,use_cache=use_cache)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    archive: Archive = None
+
+    def do_GET(self):
+        host, _, rest = self.path.lstrip('/').partition('/')
+        entry = None
+        for scheme in ('https','http'):
+            entry = self.archive.get(cache_key(f"{scheme}://{host}/{rest}"))
+            if entry is not None:
+                break
+
+        if entry is None:
+            body = json.dumps({'message': f'not in archive: {self.path}'}).encode()
+            self.send_response(404)
+            self.send_header('Content-Type','application/json')
+        else:
+            body = entry.content
+            self.send_response(entry.status)
+            for k, v in entry.headers.items():
+                self.send_header(k,v)
+        self.send_header('Content-Length',str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self,*args):
+        pass
+
+
+class ReplayServer:
+    """Local HTTP server that serves a recorded archive
+
+    Requests are expected as `/{original host}{original path}?{query}` (what
+    `Transport.route()` produces).
+    """
+    def __init__(self,path:str,host:str='127.0.0.1',port:int=0):
+        handler = type('ArchiveHandler',(_Handler,),{'archive':Archive(path)})
+        self.httpd = ThreadingHTTPServer((host,port),handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'ReplayServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever,name='mlb-replay-server',daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@contextlib.contextmanager
+def serve(path:str,host:str='127.0.0.1',port:int=0,use_cache:bool=False):
+    """Route every request inside the block to a local server for the archive at `path`"""
+    server = ReplayServer(path,host,port).start()
+    netloc = urlparse(server.base).netloc
+    previous = transport.base
+    cache_enabled = response_cache.enabled
+    transport.base = server.base
+    response_cache.enabled = cache_enabled and use_cache
+    rate_limiter.host_rates[netloc] = None     # no pacing against the stand-in
+    try:
+        yield server
+    finally:
+        transport.base = previous
+        response_cache.enabled = cache_enabled
+        rate_limiter.host_rates.pop(netloc,None)
+        server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mlb.async_mlb.replay')
+    sub = parser.add_subparsers(dest='command',required=True)
+    srv = sub.add_parser('serve',help='serve a recorded archive over HTTP')
+    srv.add_argument('path')
+    srv.add_argument('--host',default='127.0.0.1')
+    srv.add_argument('--port',type=int,default=8080)
+    args = parser.parse_args(argv)
+
+    server = ReplayServer(args.path,args.host,args.port)
+    print(f"serving {len(server.httpd.RequestHandlerClass.archive)} responses on {server.base}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == '__main__':
+    main()
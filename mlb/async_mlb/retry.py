@@ -0,0 +1,141 @@
+import random
+import threading
+from typing import Optional
+
+RETRY_STATUSES = frozenset({429,500,502,503,504})
+
+
+class FetchError(Exception):
+    """A request that still failed after its retries
+
+    `status` is the last HTTP status received (None for network errors and
+    timeouts, in which case `__cause__` holds the original exception).
+    """
+    def __init__(self,url:str,status:Optional[int]=None,reason:str=''):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        msg = f"{status} {reason}".strip() if status is not None else (reason or 'request failed')
+        super().__init__(f"{msg} ({url})")
+
+
+class RetryBudget:
+    """Limits retries to a fraction of the requests made
+
+    Every request deposits `ratio` tokens (up to `max_tokens`) and every retry
+    withdraws one, so when the API is down retries stop instead of
+    multiplying the load. The budget starts with `min_retries` tokens.
+    """
+    def __init__(self,ratio:float=0.2,min_retries:int=10,max_tokens:Optional[float]=None):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.max_tokens = max_tokens if max_tokens is not None else max(min_retries,100)
+        self._tokens = float(min_retries)
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens,self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.exhausted += 1
+            return False
+
+
+class RetryPolicy:
+    """Per-request timeout and retry settings
+
+    Parameters:
+    -----------
+    attempts : int, default 3
+        total number of attempts per request (1 disables retries)
+
+    backoff : float, default 0.5
+        base delay (seconds); attempt `n` waits a random time between 0 and
+        `backoff * 2**n` ("full jitter")
+
+    max_backoff : float, default 8
+        upper bound for a single delay
+
+    timeout : float, default 30
+        seconds an attempt may wait to connect or for the next bytes of the
+        body (a large download that keeps arriving isn't cut off)
+
+    budget : RetryBudget, optional
+        shared retry budget
+
+    """
+    def __init__(self,attempts:int=3,backoff:float=0.5,max_backoff:float=8,timeout:float=30,budget:Optional[RetryBudget]=None):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.budget = budget or RetryBudget()
+        self.retries = 0
+        self.failures = 0
+
+    def stats(self) -> dict:
+        return {
+            'retries': self.retries,
+            'failures': self.failures,
+            'budget_tokens': self.budget.tokens,
+            'budget_exhausted': self.budget.exhausted,
+        }
+
+    def delay(self,attempt:int,retry_after:Optional[str]=None) -> Optional[float]:
+        """Seconds to wait before retrying after failed `attempt` (0-based)
+
+        Returns None when no more retries should be made.
+        """
+        if attempt + 1 >= self.attempts or not self.budget.withdraw():
+            self.failures += 1
+            return None
+        self.retries += 1
+        delay = random.uniform(0,min(self.max_backoff,self.backoff * 2 ** attempt))
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay,min(self.max_backoff,float(retry_after)))
+        return delay
+
+
+retry_policy = RetryPolicy()
+
+def configure(attempts:int=None,backoff:float=None,max_backoff:float=None,timeout:float=None,budget:RetryBudget=None):
+    """Configure the package-wide retry policy
+
+    Parameters:
+    -----------
+    attempts : int, default 3
+        total number of attempts per request
+
+    backoff : float, default 0.5
+        base delay (seconds) for the exponential backoff
+
+    max_backoff : float, default 8
+        upper bound for a single delay
+
+    timeout : float, default 30
+        connect and read timeout (seconds) of a single attempt
+
+    budget : RetryBudget
+        replaces the shared retry budget
+
+    """
+    if attempts is not None:
+        retry_policy.attempts = max(1,int(attempts))
+    if backoff is not None:
+        retry_policy.backoff = float(backoff)
+    if max_backoff is not None:
+        retry_policy.max_backoff = float(max_backoff)
+    if timeout is not None:
+        retry_policy.timeout = float(timeout)
+    if budget is not None:
+        retry_policy.budget = budget
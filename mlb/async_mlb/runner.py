@@ -0,0 +1,97 @@
+import atexit
+import asyncio
+import threading
+import concurrent.futures
+from typing import Coroutine, Optional
+
+
+def _determine_loop():
+    try:
+        return asyncio.get_event_loop()
+    except:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        return asyncio.get_event_loop()
+
+
+class BackgroundLoop:
+    """Long-lived event loop running in a daemon thread
+
+    Every synchronous entry point submits its coroutine here and blocks on the
+    result, so all threads (e.g. the workers of a threaded WSGI server) share
+    one loop, and with it one pooled aiohttp session, and their requests run
+    concurrently instead of each thread driving a loop of its own.
+    """
+    def __init__(self,name:str='mlb-event-loop'):
+        self.name = name
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The background loop (started on first use)"""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    thread = threading.Thread(target=self._run,args=(loop,),name=self.name,daemon=True)
+                    thread.start()
+                    self._thread = thread
+                    self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _run(loop:asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self,coro:Coroutine) -> concurrent.futures.Future:
+        """Schedule `coro` on the background loop"""
+        return asyncio.run_coroutine_threadsafe(coro,self.loop)
+
+    def run(self,coro:Coroutine,timeout:Optional[float]=None):
+        """Run `coro` on the background loop and wait for its result"""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("synchronous mlb functions cannot be called from mlb's own event loop; await the 'mlb.aio' equivalent instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # e.g. KeyboardInterrupt/timeout in the waiting thread
+            future.cancel()
+            raise
+
+    def stop(self,timeout:float=5):
+        """Close the loop's pooled session and stop the thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or not loop.is_running():
+            return
+        from .client import close_client_session
+        try:
+            asyncio.run_coroutine_threadsafe(close_client_session(),loop).result(timeout)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+
+background = BackgroundLoop()
+
+def run_sync(coro:Coroutine):
+    """Run a coroutine to completion from synchronous code
+
+    The coroutine runs on the shared background loop and the calling thread
+    blocks until it finishes. This works the same whether or not the caller
+    already has a running loop (e.g. in a notebook), so `nest_asyncio` is not
+    needed. Async code should await the `mlb.aio` functions directly.
+    """
+    return background.run(coro)
+
+atexit.register(background.stop)
@@ -0,0 +1,321 @@
+import re
+import asyncio
+import inspect
+import weakref
+import functools
+import contextlib
+import contextvars
+import collections
+from urllib.parse import urlparse
+from typing import Callable, Iterable, Optional
+
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+# Request lanes. Interactive work (page renders, user calls) and bulk work
+# (e.g. the `updatedb` refreshes) get separate concurrency budgets, so a
+# large background refresh can't occupy every slot (or pooled connection)
+# while a user-facing call waits
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+LANES = (INTERACTIVE,BULK)
+
+_lane = contextvars.ContextVar('mlb_request_lane',default=INTERACTIVE)
+
+
+def current_lane() -> str:
+    """Lane of the work running in this context"""
+    return _lane.get()
+
+@contextlib.contextmanager
+def lane(name:str):
+    """Run the requests made inside the block in lane `name`
+
+    The lane follows the work onto the background loop and into the tasks it
+    starts.
+
+    ```
+    >>> with scheduler.lane(scheduler.BULK):
+    ...     mlb.update_coaches()
+    ```
+    """
+    if name not in LANES:
+        raise ValueError(f"unknown lane {name!r}, expected one of {LANES}")
+    token = _lane.set(name)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+def bulk(fn:Callable):
+    """Decorator running a function (sync or async) in the bulk lane"""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args,**kwargs):
+            with lane(BULK):
+                return await fn(*args,**kwargs)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args,**kwargs):
+        with lane(BULK):
+            return fn(*args,**kwargs)
+    return wrapper
+
+
+def endpoint_key(url:str) -> str:
+    """Reduce a URL to the endpoint it targets
+
+    Numeric path segments are collapsed so that every team/person/game hits
+    the same key (e.g. '/api/v1/teams/145/coaches' -> '/api/v1/teams/{id}/coaches')
+    """
+    path = urlparse(url).path
+    return _ID_SEGMENT.sub('/{id}',path)
+
+
+class Failure:
+    """An item of a batch that raised instead of returning a result"""
+    __slots__ = ('item','error')
+    def __init__(self,item,error:BaseException):
+        self.item = item
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"Failure({self.item!r}, {self.error!r})"
+
+
+class BatchError(Exception):
+    """Raised by `BatchResult.raise_for_failures()`"""
+    def __init__(self,failed:dict):
+        self.failed = failed
+        first = next(iter(failed.values()))
+        super().__init__(f"{len(failed)} request(s) failed, e.g. {first.error}")
+
+
+class BatchResult(list):
+    """Results of a batch in input order
+
+    Items that failed hold None and are listed in `failed` (position ->
+    `Failure`), so one bad request doesn't throw away the rest of the batch.
+    """
+    def __init__(self,results=(),failed:Optional[dict]=None):
+        super().__init__(results)
+        self.failed = dict(failed or {})
+
+    @property
+    def ok(self) -> bool:
+        return len(self.failed) == 0
+
+    def succeeded(self) -> list:
+        """Results of the items that did not fail"""
+        return [r for i, r in enumerate(self) if i not in self.failed]
+
+    def merge(self,positions:list,other:'BatchResult'):
+        """Fill `positions` with the results of a re-run (`other`)"""
+        for pos, idx in enumerate(positions):
+            if pos in other.failed:
+                self.failed[idx] = other.failed[pos]
+            else:
+                self[idx] = other[pos]
+                self.failed.pop(idx,None)
+        return self
+
+    def raise_for_failures(self):
+        if self.failed:
+            raise BatchError(self.failed)
+        return self
+
+
+class RequestScheduler:
+    """Bounded-concurrency scheduler for fan-out requests
+
+    Every submitted coroutine must hold a slot of its lane's global limit and
+    a slot of its lane's limit for the endpoint while it runs, so a burst of
+    thousands of URLs is spread into a steady stream of at most `limit`
+    in-flight requests. The interactive and bulk lanes (see `lane()`) have
+    separate budgets; the bulk one is kept well below the connection pool's
+    per-host limit so interactive requests always find a free connection.
+
+    Parameters:
+    -----------
+    limit : int, default 30
+        maximum number of interactive requests in flight across all endpoints
+
+    endpoint_limit : int, default 10
+        maximum number of interactive requests in flight for any single endpoint
+
+    endpoint_limits : dict, optional
+        per-endpoint overrides keyed by `endpoint_key()` value (the bulk lane
+        uses the smaller of the override and `bulk_endpoint_limit`)
+
+    bulk_limit : int, default 8
+        maximum number of bulk requests in flight across all endpoints
+
+    bulk_endpoint_limit : int, default 4
+        maximum number of bulk requests in flight for any single endpoint
+
+    """
+    def __init__(self,limit:int=30,endpoint_limit:int=10,endpoint_limits:Optional[dict]=None,bulk_limit:int=8,bulk_endpoint_limit:int=4):
+        self.limit = limit
+        self.endpoint_limit = endpoint_limit
+        self.endpoint_limits = dict(endpoint_limits or {})
+        self.bulk_limit = bulk_limit
+        self.bulk_endpoint_limit = bulk_endpoint_limit
+        self._states = weakref.WeakKeyDictionary()
+
+    def configure(self,limit:int=None,endpoint_limit:int=None,endpoint_limits:Optional[dict]=None,bulk_limit:int=None,bulk_endpoint_limit:int=None):
+        """Change the concurrency caps (applies to loops that start using the
+        scheduler afterwards)"""
+        if limit is not None:
+            self.limit = int(limit)
+        if endpoint_limit is not None:
+            self.endpoint_limit = int(endpoint_limit)
+        if endpoint_limits is not None:
+            self.endpoint_limits.update(endpoint_limits)
+        if bulk_limit is not None:
+            self.bulk_limit = int(bulk_limit)
+        if bulk_endpoint_limit is not None:
+            self.bulk_endpoint_limit = int(bulk_endpoint_limit)
+        self._states = weakref.WeakKeyDictionary()
+
+    def lane_limit(self,name:str) -> int:
+        return self.bulk_limit if name == BULK else self.limit
+
+    def _state(self,name:str) -> dict:
+        # asyncio primitives are bound to the loop they are first used in
+        loop = asyncio.get_running_loop()
+        lanes = self._states.get(loop)
+        if lanes is None:
+            lanes = self._states[loop] = {}
+        state = lanes.get(name)
+        if state is None:
+            state = lanes[name] = {
+                'global':asyncio.Semaphore(self.lane_limit(name)),
+                'endpoints':{},
+                'waiting':0,
+                'running':0,
+            }
+        return state
+
+    def _endpoint_semaphore(self,state:dict,endpoint:str,name:str) -> asyncio.Semaphore:
+        sem = state['endpoints'].get(endpoint)
+        if sem is None:
+            limit = self.endpoint_limits.get(endpoint,self.endpoint_limit)
+            if name == BULK:
+                limit = min(limit,self.bulk_endpoint_limit)
+            sem = asyncio.Semaphore(limit)
+            state['endpoints'][endpoint] = sem
+        return sem
+
+    def stats(self) -> dict:
+        """Requests waiting for a slot and running, per lane (all loops)"""
+        out = {name:{'waiting':0,'running':0} for name in LANES}
+        for lanes in list(self._states.values()):
+            for name, state in list(lanes.items()):
+                out[name]['waiting'] += state['waiting']
+                out[name]['running'] += state['running']
+        return out
+
+    async def submit(self,coro_fn:Callable,item,endpoint:Optional[str]=None):
+        """Run `coro_fn(item)` once a slot of the current lane is free"""
+        if endpoint is None:
+            endpoint = endpoint_key(item) if type(item) is str else ''
+        name = _lane.get()
+        state = self._state(name)
+        state['waiting'] += 1
+        started = False
+        try:
+            async with self._endpoint_semaphore(state,endpoint,name):
+                async with state['global']:
+                    state['waiting'] -= 1
+                    state['running'] += 1
+                    started = True
+                    try:
+                        return await coro_fn(item)
+                    finally:
+                        state['running'] -= 1
+        finally:
+            if not started:
+                state['waiting'] -= 1
+
+    async def imap(self,coro_fn:Callable,items:Iterable,endpoint:Optional[str]=None,window:Optional[int]=None):
+        """Yield `coro_fn(item)` results in the same order as `items`
+
+        At most `window` tasks exist at once (default: twice the lane's
+        limit), so large batches never materialize every request up front.
+        """
+        if window is None:
+            window = self.lane_limit(_lane.get()) * 2
+        items = iter(items)
+        pending = collections.deque()
+
+        def _spawn() -> bool:
+            for item in items:
+                pending.append(asyncio.ensure_future(self.submit(coro_fn,item,endpoint)))
+                return True
+            return False
+
+        for _ in range(window):
+            if not _spawn():
+                break
+        try:
+            while pending:
+                result = await pending.popleft()
+                _spawn()
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def map(self,coro_fn:Callable,items:Iterable,endpoint:Optional[str]=None,window:Optional[int]=None) -> list:
+        """Run `coro_fn` over `items` and return the results in input order"""
+        return [result async for result in self.imap(coro_fn,items,endpoint,window)]
+
+    async def settle(self,coro_fn:Callable,items:Iterable,endpoint:Optional[str]=None,window:Optional[int]=None) -> BatchResult:
+        """Like `map()`, but failures are collected in a `BatchResult`
+        instead of raising"""
+        async def _settled(item):
+            try:
+                return await coro_fn(item), None
+            except Exception as e:
+                return None, Failure(item,e)
+
+        batch = BatchResult()
+        async for result, failure in self.imap(_settled,items,endpoint,window):
+            if failure is not None:
+                batch.failed[len(batch)] = failure
+            batch.append(result)
+        return batch
+
+    async def retry_failed(self,coro_fn:Callable,batch:BatchResult,endpoint:Optional[str]=None) -> BatchResult:
+        """Re-run only the failed items of `batch` and merge the results in"""
+        if batch.ok:
+            return batch
+        positions = sorted(batch.failed)
+        rerun = await self.settle(coro_fn,[batch.failed[idx].item for idx in positions],endpoint)
+        return batch.merge(positions,rerun)
+
+
+scheduler = RequestScheduler()
+
+def configure(limit:int=None,endpoint_limit:int=None,endpoint_limits:Optional[dict]=None,bulk_limit:int=None,bulk_endpoint_limit:int=None):
+    """Configure the package-wide request scheduler
+
+    Parameters:
+    -----------
+    limit : int, default 30
+        maximum number of interactive requests in flight across all endpoints
+
+    endpoint_limit : int, default 10
+        maximum number of interactive requests in flight for any single endpoint
+
+    endpoint_limits : dict, optional
+        per-endpoint overrides, e.g. {'/api/v1/teams/{id}/coaches': 4}
+
+    bulk_limit : int, default 8
+        maximum number of bulk requests in flight across all endpoints
+
+    bulk_endpoint_limit : int, default 4
+        maximum number of bulk requests in flight for any single endpoint
+
+    """
+    scheduler.configure(limit,endpoint_limit,endpoint_limits,bulk_limit,bulk_endpoint_limit)
@@ -0,0 +1,54 @@
+import asyncio
+import weakref
+from typing import Callable
+
+
+class SingleFlight:
+    """Coalesces identical in-flight requests
+
+    While a request for a key is running, any other caller asking for the same
+    key waits for that request and receives the same result instead of going
+    to the network again. The result object itself is shared between callers
+    (`client.request` hands each one its own `Response.copy()`). Sync callers
+    in different threads are coalesced too, since their requests all run on
+    the shared background loop.
+
+    `coalesced` counts the callers that were served by another caller's
+    request.
+    """
+    def __init__(self):
+        self.coalesced = 0
+        self._tasks = weakref.WeakKeyDictionary()
+
+    def stats(self) -> dict:
+        in_flight = sum(len(tasks) for tasks in list(self._tasks.values()))
+        return {'coalesced': self.coalesced, 'in_flight': in_flight}
+
+    def reset_stats(self):
+        self.coalesced = 0
+
+    async def do(self,key:str,coro_fn:Callable):
+        """Await `coro_fn()`, sharing the call with concurrent callers for `key`"""
+        loop = asyncio.get_running_loop()
+        tasks = self._tasks.get(loop)
+        if tasks is None:
+            tasks = self._tasks[loop] = {}
+        task = tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn())
+            tasks[key] = task
+            task.add_done_callback(lambda t: self._done(tasks,key,t))
+        else:
+            self.coalesced += 1
+        # shield so one cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _done(tasks:dict,key:str,task:asyncio.Task):
+        if tasks.get(key) is task:
+            del tasks[key]
+        if not task.cancelled():
+            task.exception()    # mark as retrieved even if every caller went away
+
+
+inflight = SingleFlight()
@@ -1,6 +1,4 @@
 import time
-import asyncio
-import aiohttp
 import datetime as dt
 from urllib.parse import urlparse, parse_qs
 from requests import Request
@@ -8,6 +6,10 @@ from requests import Request
 import pandas as pd
 import numpy as np
 
+from .client import Response, request
+from .scheduler import scheduler
+from .runner import run_sync
+
 div_record_label = {200:'vs_west', 201:'vs_east', 202:'vs_central',
                     203:'vs_west', 204:'vs_east', 205:'vs_central'}
 
@@ -37,12 +39,12 @@ def get_league_label_name(league_mlbam:int, division_mlbam:int):
 
 
 
-async def parse_data(response:aiohttp.ClientResponse,**kwargs):
-    url_components = urlparse(str(response.url))
+async def parse_data(response:Response,**kwargs):
+    url_components = urlparse(response.url)
     params = parse_qs(url_components.query)
     season = params['season'][0]
 
-    standings_json: dict = await response.json()
+    standings_json: dict = response.json()
     
     data = []
     for record in standings_json.get('records',[{}]):
@@ -119,24 +121,26 @@ async def fetch_standings(**kwargs):
     
     dfs = []
     
-    async with aiohttp.ClientSession() as sesh:
-        tasks = []
-        for season in range(1876,dt.datetime.today().year + 1):
-            params['season'] = str(season)
-            url = Request("GET",base_url,params=params).prepare().url
-            if kwargs.get('log'):
-                print(url)
-            tasks.append(sesh.get(url))
-        client_responses = await asyncio.gather(*tasks)
-        for response in client_responses:
-            dfs.append(await parse_data(response,**kwargs))
+    urls = []
+    for season in range(1876,dt.datetime.today().year + 1):
+        params['season'] = str(season)
+        url = Request("GET",base_url,params=params).prepare().url
+        if kwargs.get('log'):
+            print(url)
+        urls.append(url)
+    
+    async def _get(url):
+        response = await request(url)
+        return await parse_data(response,**kwargs)
     
+    dfs = await scheduler.map(_get,urls)
+
     df = pd.concat(dfs)
     return df
 
 def runit(**kwargs):
     start = time.time()
-    retrieved = asyncio.run(fetch_standings(**kwargs))
+    retrieved = run_sync(fetch_standings(**kwargs))
     if kwargs.get("log"):
         print(f'-- {time.time() - start} seconds --')
     return retrieved
\ No newline at end of file
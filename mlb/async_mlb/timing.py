@@ -0,0 +1,215 @@
+"""Per-call timing instrumentation
+
+Every public entry point (`mlb.Team`, `mlb.schedule`, `mlb.aio.Person`, ...)
+runs inside a `call()`; while it runs, the fetch and parse paths record how
+long they spend in each phase:
+
+- 'throttle' -- waiting for the rate limiter
+- 'network'  -- sending requests and reading responses
+- 'decode'   -- decoding JSON
+- 'parse'    -- turning payloads into rows/objects
+- 'frame'    -- building DataFrames
+
+Phases are exclusive (time spent in a nested phase, e.g. 'frame' inside
+'parse', is only counted once) and summed over concurrent requests, so their
+total can exceed the call's wall time.
+
+```
+>>> from mlb.async_mlb import timing
+>>> with timing.capture() as calls:
+...     mlb.Team(145)
+>>> calls[0].asdict()
+{'name': 'Team', 'total': 1.42, 'phases': {'network': 3.9, 'decode': 0.21, ...}, ...}
+>>> timing.add_sink(timing.logging_sink)     # or any callable taking a CallTiming
+```
+"""
+import time
+import inspect
+import logging
+import functools
+import threading
+import contextlib
+import collections
+import contextvars
+from typing import Callable, Optional
+
+_current_call = contextvars.ContextVar('mlb_timing_call',default=None)
+_current_phase = contextvars.ContextVar('mlb_timing_phase',default=None)
+
+_sinks = []
+_captures = []
+_lock = threading.Lock()
+
+# the most recent calls, newest last
+recent = collections.deque(maxlen=100)
+
+logger = logging.getLogger('mlb.timing')
+
+
+class CallTiming:
+    """Timings of one public call"""
+    __slots__ = ('name','started','total','phases','counts','error','_lock')
+    def __init__(self,name:str):
+        self.name = name
+        self.started = time.time()
+        self.total = None
+        self.phases = {}
+        self.counts = {}
+        self.error = None
+        self._lock = threading.Lock()
+
+    def add(self,phase:str,seconds:float):
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase,0.0) + seconds
+            self.counts[phase] = self.counts.get(phase,0) + 1
+
+    @property
+    def elapsed(self) -> float:
+        """Wall time so far (`total` once the call has finished)"""
+        if self.total is not None:
+            return self.total
+        return time.time() - self.started
+
+    def asdict(self) -> dict:
+        return {
+            'name': self.name,
+            'started': self.started,
+            'total': self.total,
+            'phases': dict(self.phases),
+            'counts': dict(self.counts),
+            'error': self.error,
+        }
+
+    def __repr__(self) -> str:
+        phases = ', '.join(f"{k}={v:.4f}" for k, v in self.phases.items())
+        total = 'running' if self.total is None else f"{self.total:.4f}s"
+        return f"CallTiming({self.name!r}, {total}, {phases})"
+
+
+class _PhaseFrame:
+    __slots__ = ('name','child')
+    def __init__(self,name:str):
+        self.name = name
+        self.child = 0.0
+
+
+def current() -> Optional[CallTiming]:
+    """The call being timed in this context, if any"""
+    return _current_call.get()
+
+@contextlib.contextmanager
+def call(name:str):
+    """Time a public call
+
+    Nested calls (e.g. `Team` fetching its schedule through `schedule`) are
+    recorded as part of the outermost one. The context is inherited by the
+    tasks the call starts, including those on the background loop.
+    """
+    outer = _current_call.get()
+    if outer is not None:
+        yield outer
+        return
+    timing = CallTiming(name)
+    token = _current_call.set(timing)
+    start = time.perf_counter()
+    try:
+        yield timing
+    except BaseException as e:
+        timing.error = repr(e)
+        raise
+    finally:
+        timing.total = time.perf_counter() - start
+        _current_call.reset(token)
+        _emit(timing)
+
+@contextlib.contextmanager
+def phase(name:str):
+    """Record the time spent in the block as `name` for the current call"""
+    timing = _current_call.get()
+    if timing is None:
+        yield
+        return
+    parent = _current_phase.get()
+    frame = _PhaseFrame(name)
+    token = _current_phase.set(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _current_phase.reset(token)
+        timing.add(name,elapsed - frame.child)
+        if parent is not None:
+            parent.child += elapsed
+
+def timed(name:str):
+    """Decorator running a function (sync or async) inside `call(name)`"""
+    def decorator(fn:Callable):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args,**kwargs):
+                with call(name):
+                    return await fn(*args,**kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args,**kwargs):
+            with call(name):
+                return fn(*args,**kwargs)
+        return wrapper
+    return decorator
+
+
+def add_sink(sink:Callable[[CallTiming],None]):
+    """Call `sink(timing)` for every finished call"""
+    with _lock:
+        if sink not in _sinks:
+            _sinks.append(sink)
+
+def remove_sink(sink:Callable):
+    with _lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+def _emit(timing:CallTiming):
+    recent.append(timing)
+    with _lock:
+        targets = list(_sinks) + [c.append for c in _captures]
+    for sink in targets:
+        try:
+            sink(timing)
+        except Exception:
+            logger.exception("timing sink %r failed",sink)
+
+@contextlib.contextmanager
+def capture():
+    """Collect the calls that finish inside the block into a list"""
+    calls = []
+    with _lock:
+        _captures.append(calls)
+    try:
+        yield calls
+    finally:
+        with _lock:
+            _captures.remove(calls)
+
+def last(name:Optional[str]=None) -> Optional[CallTiming]:
+    """Most recent finished call (named `name`, if given)"""
+    for timing in reversed(recent):
+        if name is None or timing.name == name:
+            return timing
+    return None
+
+
+def logging_sink(timing:CallTiming):
+    """Sink logging each call at DEBUG level to the 'mlb.timing' logger"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s %.4fs %s",timing.name,timing.total,
+                     ' '.join(f"{k}={v:.4f}" for k, v in timing.phases.items()))
+
+def print_sink(timing:CallTiming):
+    """Sink printing a short per-phase report"""
+    print(f"\n{timing.name}:")
+    for k, v in timing.phases.items():
+        print(f"  {k:<10}{v:.4f} seconds ({timing.counts[k]}x)")
+    print(f"--- {timing.elapsed} seconds ---")
@@ -1,7 +1,4 @@
-import asyncio
-import aiohttp
 import pandas as pd
-import time
 # from pprint import pprint
 
 from ..constants import BASE
@@ -16,6 +13,10 @@ from ..constants import FIELD_FIELDS
 from ..constants import STATDICT
 
 from ..constants import POSITION_DICT
+from . import timing
+from .client import request
+from .scheduler import scheduler
+from .runner import run_sync
 
 
 async def parse_data(response):
@@ -43,10 +44,9 @@ async def parse_data(response):
             leaders[category_name] = entries_in_category
         except:
             leaders[category_name] = []
-            print(category["statGroup"])
-            print(category_name)
     return leaders
 
+@timing.timed('league_leaders')
 async def get_leaders(tm_mlbam=None,league_mlbam=None,season=None,gameTypes=None,sitCodes=None,limit=None,startDate=None,endDate=None,group_by_team=False):
     '''statTypes: season, statsSingleSeason, byDateRange'''
     parsed_data = []
@@ -92,50 +92,44 @@ async def get_leaders(tm_mlbam=None,league_mlbam=None,season=None,gameTypes=None
     
     # might need to remove 'sitCodes'
 
-    async with aiohttp.ClientSession() as session:
-        if startDate is not None and endDate is not None:
-            if endDate is not None:
-                sitCodes = ""
-                statType = "byDateRange"
+    if startDate is not None and endDate is not None:
+        if endDate is not None:
+            sitCodes = ""
+            statType = "byDateRange"
+            urls = [
                 hit_base +   f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&startDate={startDate}&endDate={endDate}&limit={limit}{sitCodes}",
                 pitch_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&startDate={startDate}&endDate={endDate}&limit={limit}{sitCodes}",
                 field_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&startDate={startDate}&endDate={endDate}&limit={limit}{sitCodes}"
-            else:
-                print("startDate and endDate must be used together")
-                return []
-
-        elif season is None:
-            sitCodes = ""
-            statType = "statsSingleSeason"
-            urls = [
-                hit_base +   f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&limit={limit}{sitCodes}",
-                pitch_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&limit={limit}{sitCodes}",
-                field_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&limit={limit}{sitCodes}"
                 ]
         else:
-            if sitCodes == "":
-                statType = "season"
-            else:
-                statType = "statSplits"
-            urls = [
-                hit_base +   f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&season={season}&limit={limit}{sitCodes}",
-                pitch_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&season={season}&limit={limit}{sitCodes}",
-                field_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&season={season}&limit={limit}{sitCodes}"
-                ]
+            print("startDate and endDate must be used together")
+            return []
+
+    elif season is None:
+        sitCodes = ""
+        statType = "statsSingleSeason"
+        urls = [
+            hit_base +   f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&limit={limit}{sitCodes}",
+            pitch_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&limit={limit}{sitCodes}",
+            field_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&limit={limit}{sitCodes}"
+            ]
+    else:
+        if sitCodes == "":
+            statType = "season"
+        else:
+            statType = "statSplits"
+        urls = [
+            hit_base +   f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&season={season}&limit={limit}{sitCodes}",
+            pitch_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&season={season}&limit={limit}{sitCodes}",
+            field_base + f"statType={statType}&{teamQuery}gameTypes={gameTypes}&leagueIds={leagueIds}&season={season}&limit={limit}{sitCodes}"
+            ]
 
-        tasks = []
-        for url in urls:
-            print(url)
-            print("\n")
-        for url in urls:
-            tasks.append(session.get(url, ssl=False))
+    async def _get(url):
+        resp = (await request(url, ssl=False)).json()
+        with timing.phase('parse'):
+            return await parse_data(resp)
 
-        responses = await asyncio.gather(*tasks)
-        
-        for response in responses:
-            resp = await response.json()
-            parsed = await parse_data(resp)
-            parsed_data.append(parsed)
+    parsed_data = await scheduler.map(_get,urls)
 
     parsed_data_dict = {
         "hitting":parsed_data[0],
@@ -145,9 +139,6 @@ async def get_leaders(tm_mlbam=None,league_mlbam=None,season=None,gameTypes=None
     return parsed_data_dict
 
 def runit(tm_mlbam=None,league_mlbam=None,season=None,gameTypes=None,sitCodes=None,limit=None,startDate=None,endDate=None,group_by_team=False):
-    start = time.time()
-    retrieved = asyncio.run(get_leaders(tm_mlbam,league_mlbam,season,gameTypes,sitCodes,limit,startDate,endDate,group_by_team))
-    print("--- {} seconds ---".format(time.time()-start))
-    return retrieved
+    return run_sync(get_leaders(tm_mlbam,league_mlbam,season,gameTypes,sitCodes,limit,startDate,endDate,group_by_team))
 
 
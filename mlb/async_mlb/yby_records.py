@@ -1,5 +1,3 @@
-import asyncio
-import aiohttp
 # import time
 import pandas as pd
 
@@ -7,7 +5,10 @@ from ..constants import BASE
 from .. import mlb_dataclasses as dclass
 from ..mlbdata import get_teams_df
 
-from ..utils import curr_year
+from .. import utils
+from .client import request
+from .scheduler import scheduler
+from .runner import run_sync
 
 async def parse_data(response,teams_df):
     all_records = []
@@ -188,19 +189,20 @@ async def get_updated_records(year=None,start=None,end=None):
         end = year
     if year is None and start is None and end is None:
         start = 1876
-        end = curr_year
+        end = utils.curr_year
 
     parsed_data_by_year = []
     all_records = []
-    async with aiohttp.ClientSession() as sesh:
-        tasks = []
-        for season in range(start,end+1):
-            url = BASE + f"/standings?leagueId={leagueIDs}&standingsTypes={standingsTypes}&season={season}&hydrate=league,team(division)"
-            tasks.append(sesh.get(url,ssl=False))
-        responses = await asyncio.gather(*tasks)
-        for response in responses:
-            resp = await response.json()
-            parsed_data_by_year.append(await parse_data(resp,teams_df))
+    urls = []
+    for season in range(start,end+1):
+        url = BASE + f"/standings?leagueId={leagueIDs}&standingsTypes={standingsTypes}&season={season}&hydrate=league,team(division)"
+        urls.append(url)
+    
+    async def _get(url):
+        resp = (await request(url,ssl=False)).json()
+        return await parse_data(resp,teams_df)
+    
+    parsed_data_by_year = await scheduler.map(_get,urls)
     for y in parsed_data_by_year:
         for r in y:
             all_records.append(r)
@@ -210,6 +212,6 @@ async def get_updated_records(year=None,start=None,end=None):
 
 def runit():
     # start = time.time()
-    retrieved = asyncio.run(get_updated_records())
+    retrieved = run_sync(get_updated_records())
     # print(f"--- {time.time()-start} seconds ---")
     return retrieved
@@ -11,6 +11,7 @@ from . import mlb_dataclasses as dclass
 from . import parsing
 from . import functions as funcs
 from . import objects as objs
+from .async_mlb import client
 
 from .constants import BASE
 from .utils import iso_format_ms
@@ -87,7 +88,9 @@ class Person:
     def __init__(self, mlbam: int, **kwargs):
         # self = object.__new__(cls)
         _pd_df = pd.DataFrame
-        data = funcs._player_data(mlbam)
+        data = kwargs.get('_data')
+        if data is None:
+            data = funcs._player_data(mlbam)
 
         _bio: Union[list, None] = data["bio"]
         _info: dict = data["info"]
@@ -482,8 +485,10 @@ class Franchise:
 
     """
 
-    def __init__(self, mlbam: int):
-        data = funcs._franchise_data(int(mlbam))
+    def __init__(self, mlbam: int, **kwargs):
+        data = kwargs.get('_data')
+        if data is None:
+            data = funcs._franchise_data(int(mlbam))
 
         records       = data["records"]
         record_splits = data["record_splits"]  # like standings splits
@@ -652,7 +657,9 @@ class Team:
         self.mlbam = int(mlbam)
         self.season = int(season)
 
-        data: Union[dict, None] = funcs._team_data(self.mlbam, self.season)
+        data: Union[dict, None] = kwargs.get('_data')
+        if data is None:
+            data = funcs._team_data(self.mlbam, self.season)
         self.raw_data = data
 
         ti: dict = data["team_info"]
@@ -844,14 +851,11 @@ class api:
                 teamIds = ",".join(teamIds).replace(", ", ",")
             params["teamIds"] = teamIds
 
-        resp = requests.get(url, params=params)
+        resp = client.get(url, params=params)
 
-        parsed_data = []
-        for p_dict in resp.json()["people"]:
-            parsed_data.append(
-                pd.Series(parsing._parse_person(_obj=p_dict)))
+        parsed_data = [parsing._parse_person(_obj=p_dict) for p_dict in resp.json()["people"]]
 
-        df = pd.DataFrame(data=parsed_data).reset_index(drop=True)
+        df = pd.DataFrame(data=parsed_data)
         return objs._people_data_collection(df.fillna("-"))
 
     @classmethod
@@ -871,7 +875,7 @@ class api:
             hydrations = f"&hydrate={hydrations}"
         else:
             hydrations = ""
-        resp = requests.get(f"{BASE}/teams?sportId=1&season={season}{hydrations}")
+        resp = client.get(f"{BASE}/teams?sportId=1&season={season}{hydrations}")
 
         for t in resp.json()["teams"]:
             if query.lower() in t.get("name").lower():
@@ -915,7 +919,7 @@ class api:
         # async
         # loop = _determine_loop()
         # fetched_data = loop.run_until_complete(_fetch(urls))
-        fetched_data = funcs.fetch(urls)
+        fetched_data = funcs.fetch(urls).raise_for_failures()
 
         parsed_data = []
 
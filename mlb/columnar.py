@@ -0,0 +1,163 @@
+"""Typed columnar copies of the bundled data tables
+
+`mlbdata` writes one next to each of its larger CSVs (`COLUMNAR_TABLES`) the
+first time it loads the table, and `updatedb` whenever it updates one; after
+that the table is loaded from the copy instead of parsing the CSV, reading
+only the requested columns. Each copy records the size and CRC-32 of the CSV
+it was made from (see `fingerprint`) and is only used while the CSV still
+matches (file times don't survive a git checkout). The copies are derived, so
+they are not part of the repository.
+
+- Feather (`.feather`) when `pyarrow` is installed
+- NumPy (`.npz`) otherwise: one array per column with its dtype; text
+  columns are dictionary-encoded (distinct values + per-row codes)
+
+```
+>>> from mlb import columnar
+>>> columnar.write(df,columnar.path_for(PEOPLE_CSV),source=PEOPLE_CSV)
+>>> columnar.read(columnar.path_for(PEOPLE_CSV),columns=['mlbam','name_last'])
+```
+"""
+import os
+import zlib
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+    from pyarrow import feather, ipc
+except ImportError:
+    pyarrow = None
+
+FEATHER = '.feather'
+NPZ = '.npz'
+
+# schema metadata key of the source fingerprint in a '.feather' file
+_FEATHER_SOURCE = b'mlb.source'
+
+# keys in an '.npz' file: the column names, and per text column its distinct
+# values ('<column>.text') and the rows' indexes into them ('<column>.codes')
+_COLUMNS = '.columns'
+_SOURCE = '.source'
+_TEXT = '.text'
+_CODES = '.codes'
+_SEP = '\x00'
+
+
+def extension() -> str:
+    """Extension of the format `write()` uses"""
+    return FEATHER if pyarrow is not None else NPZ
+
+def path_for(csv_path:str) -> str:
+    """Path of the columnar copy of `csv_path` (in the format `write()` uses)"""
+    return os.path.splitext(csv_path)[0] + extension()
+
+def candidates(csv_path:str) -> tuple:
+    """Paths a columnar copy of `csv_path` may have, in order of preference"""
+    base = os.path.splitext(csv_path)[0]
+    return tuple(base + ext for ext in ((FEATHER,NPZ) if pyarrow is not None else (NPZ,)))
+
+def fingerprint(csv_path:str) -> Optional[str]:
+    """Size and CRC-32 of a file with its line endings normalized to '\n'
+    (None if it doesn't exist)
+
+    A checkout with CRLF line endings (`text=auto` on Windows) has the same
+    fingerprint as the LF one the copies were made from.
+    """
+    try:
+        with open(csv_path,'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    data = data.replace(b'\r\n',b'\n')
+    return f"{len(data)}:{zlib.crc32(data):08x}"
+
+def source_of(path:str) -> Optional[str]:
+    """Fingerprint of the CSV a columnar file was made from"""
+    if path.endswith(FEATHER):
+        with ipc.open_file(path) as reader:
+            value = (reader.schema.metadata or {}).get(_FEATHER_SOURCE)
+        return value.decode() if value else None
+    with np.load(path,allow_pickle=False) as npz:
+        return str(npz[_SOURCE]) if _SOURCE in npz.files else None
+
+def find(csv_path:str) -> Optional[str]:
+    """Existing columnar copy of `csv_path` made from its current contents,
+    if any"""
+    existing = [path for path in candidates(csv_path) if os.path.exists(path)]
+    if not existing:
+        return None
+    current = fingerprint(csv_path)
+    for path in existing:
+        if current is None or source_of(path) == current:
+            return path
+    return None
+
+
+def write(df:pd.DataFrame,path:str,source:Optional[str]=None):
+    """Save `df` (without its index) in the format given by `path`'s extension
+
+    `source` is the CSV the frame was read from; see `find()`.
+    """
+    df = df.reset_index(drop=True)
+    source = (fingerprint(source) or '') if source is not None else ''
+    tmp = path + '.tmp'
+    if path.endswith(FEATHER):
+        if pyarrow is None:
+            raise ImportError("writing '.feather' files requires pyarrow")
+        table = pyarrow.Table.from_pandas(df,preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),_FEATHER_SOURCE:source.encode()})
+        feather.write_feather(table,tmp)
+    else:
+        arrays = {_COLUMNS: np.array([str(c) for c in df.columns]),_SOURCE: np.array(source)}
+        for col in df.columns:
+            arrays.update(_encode(str(col),df[col]))
+        with open(tmp,'wb') as f:
+            np.savez(f,**arrays)
+    os.replace(tmp,path)
+
+def read(path:str,columns:Optional[list]=None) -> pd.DataFrame:
+    """Load a file written by `write()`, optionally only some of its columns"""
+    if path.endswith(FEATHER):
+        if pyarrow is None:
+            raise ImportError("reading '.feather' files requires pyarrow")
+        table = feather.read_table(path,columns=columns,memory_map=True)
+        return table.to_pandas()
+
+    with np.load(path,allow_pickle=False) as npz:
+        names = [str(c) for c in npz[_COLUMNS]]
+        if columns is not None:
+            missing = [c for c in columns if c not in names]
+            if missing:
+                raise KeyError(f"{missing} not in {os.path.basename(path)}")
+            names = list(columns)
+        data = {name:_decode(npz,name) for name in names}
+    return pd.DataFrame(data,columns=names)
+
+
+def _encode(name:str,values:pd.Series) -> dict:
+    if values.dtype.kind in 'biufcmM':
+        return {name: values.to_numpy()}
+    # text (and anything else) is dictionary-encoded: the distinct values as
+    # one UTF-8 buffer of NUL-separated strings, and each row's index into
+    # them (-1 when missing)
+    codes, uniques = pd.factorize(values.astype(object),use_na_sentinel=True)
+    text = [str(v) for v in uniques]
+    joined = _SEP.join(text)
+    if joined.count(_SEP) != max(len(text) - 1,0):
+        raise ValueError(f"column {name!r} contains NUL characters")
+    dtype = np.int16 if len(text) < 2**15 else np.int32
+    return {
+        name + _TEXT: np.frombuffer(joined.encode('utf-8'),dtype=np.uint8),
+        name + _CODES: codes.astype(dtype),
+    }
+
+def _decode(npz,name:str):
+    if name in npz.files:
+        return npz[name]
+    text = npz[name + _TEXT].tobytes().decode('utf-8')
+    # a trailing NaN slot, so that code -1 maps to it
+    uniques = np.array((text.split(_SEP) if text else []) + [np.nan],dtype=object)
+    return uniques.take(npz[name + _CODES])
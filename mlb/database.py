@@ -0,0 +1,252 @@
+"""Local SQLite database of the bundled reference tables
+
+`updatedb` writes teams, people, standings, yby_records, coaches, venues and
+seasons into `paths.BASEBALL_DB_FILE` (the file `paths.BASEBALL_DB` points
+to), with indexes on the IDs, `(id, season)` and the name columns, so
+`mlbdata` can answer lookups like "team 145 in 1992" or "the coaches of a
+season" with an indexed query instead of loading and filtering a whole
+DataFrame.
+
+Each table remembers the fingerprint (see `columnar.fingerprint`) of the CSV
+it was built from; a table that is missing or out of date is rebuilt from
+the CSV on first use.
+
+```
+>>> from mlb.database import database
+>>> database.select('teams',{'mlbam':145,'season':1992})
+>>> database.select('coaches',{'season':(1990,1999)},columns=['person_name','job'])
+```
+"""
+import os
+import json
+import sqlite3
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .paths import *
+from . import columnar
+
+
+class Table:
+    """A table of the database and the CSV it is built from
+
+    Parameters:
+    -----------
+    name : str
+        SQL table name
+
+    csv : str
+        path of the bundled CSV
+
+    indexes : list of tuple
+        columns of each index
+
+    """
+    __slots__ = ('name','csv','indexes')
+    def __init__(self,name:str,csv:str,indexes:list):
+        self.name = name
+        self.csv = csv
+        self.indexes = [tuple(ix) for ix in indexes]
+
+
+TABLES = {t.name:t for t in [
+    Table('teams',TEAMS_CSV,[('mlbam',),('mlbam','season'),('season',),('franchID',),('name_full',)]),
+    Table('people',PEOPLE_CSV,[('mlbam',),('name_last','name_first'),('bbrefID',),('retroID',)]),
+    Table('standings',STANDINGS_CSV,[('team_mlbam','season'),('season',)]),
+    Table('yby_records',YBY_RECORDS_CSV,[('tm_mlbam','season'),('season',)]),
+    Table('coaches',COACHES_MASTER_CSV,[('person_mlbam',),('team_mlbam','season'),('season',),('person_name',)]),
+    Table('venues',VENUES_CSV,[('mlbam',),('name',)]),
+    Table('seasons',SEASONS_CSV,[('season',)]),
+]}
+
+
+def _quote(name:str) -> str:
+    return '"' + str(name).replace('"','""') + '"'
+
+def _affinity(dtype) -> str:
+    if dtype.kind in 'biu':
+        return 'INTEGER'
+    if dtype.kind == 'f':
+        return 'REAL'
+    return 'TEXT'
+
+def _dtypes(stored:dict) -> dict:
+    return {c:pd.api.types.pandas_dtype(t) for c, t in stored.items()}
+
+def _column(values:tuple,dtype):
+    # None (SQL NULL) becomes NaN in float and text columns
+    if isinstance(dtype,np.dtype):
+        return np.array(values,dtype=dtype)
+    return pd.array(values,dtype=dtype)
+
+def _rows(df:pd.DataFrame):
+    # plain Python values, None for missing ones
+    values = df.astype(object).where(df.notna(),None)
+    return values.itertuples(index=False,name=None)
+
+
+class Database:
+    """SQLite store of the reference tables
+
+    Parameters:
+    -----------
+    path : str
+        location of the SQLite file
+
+    """
+    def __init__(self,path:str=BASEBALL_DB_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = None
+        self._checked = {}
+        self._dtypes = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.',exist_ok=True)
+            conn = sqlite3.connect(self.path,check_same_thread=False,isolation_level=None)
+            conn.execute('''CREATE TABLE IF NOT EXISTS _tables (
+                name TEXT PRIMARY KEY,
+                source TEXT,
+                dtypes TEXT)''')
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._checked.clear()
+            self._dtypes.clear()
+
+    def write(self,name:str,df:pd.DataFrame,source:Optional[str]=None):
+        """Replace table `name` with `df` and (re)create its indexes
+
+        `source` is the fingerprint of the CSV the frame came from.
+        """
+        table = TABLES[name]
+        dtypes = {str(c):str(t) for c, t in df.dtypes.items()}
+        with self._lock:
+            conn = self._connect()
+            # one transaction: readers see either the old or the new table,
+            # and the rows aren't synced to disk one by one
+            conn.execute('BEGIN')
+            try:
+                conn.execute(f'DROP TABLE IF EXISTS {_quote(name)}')
+                conn.execute(f"CREATE TABLE {_quote(name)} ({','.join(f'{_quote(c)} {_affinity(t)}' for c, t in df.dtypes.items())})")
+                conn.executemany(f"INSERT INTO {_quote(name)} VALUES ({','.join('?' * len(df.columns))})",_rows(df))
+                for columns in table.indexes:
+                    ix = _quote(f"idx_{name}_{'_'.join(columns)}")
+                    conn.execute(f"CREATE INDEX {ix} ON {_quote(name)} ({','.join(map(_quote,columns))})")
+                conn.execute('INSERT OR REPLACE INTO _tables (name, source, dtypes) VALUES (?,?,?)',
+                             (name,source,json.dumps(dtypes)))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('ANALYZE')
+            self._dtypes[name] = _dtypes(dtypes)
+            self._checked.pop(name,None)
+
+    def build(self,name:str):
+        """(Re)build table `name` from its bundled CSV"""
+        from .mlbdata import _read_table
+        table = TABLES[name]
+        self.write(name,_read_table(table.csv),columnar.fingerprint(table.csv))
+
+    def ensure(self,name:str):
+        """Make sure table `name` exists and matches its CSV
+
+        The check is repeated only when the CSV's mtime or size changes.
+        """
+        table = TABLES[name]
+        st = os.stat(table.csv)
+        stamp = (st.st_mtime_ns,st.st_size)
+        with self._lock:
+            if self._checked.get(name) == stamp:
+                return
+            row = self._connect().execute('SELECT source, dtypes FROM _tables WHERE name=?',(name,)).fetchone()
+            if row is None or row[0] != columnar.fingerprint(table.csv):
+                self.build(name)
+            else:
+                self._dtypes[name] = _dtypes(json.loads(row[1]))
+            self._checked[name] = stamp
+
+    def select(self,name:str,where:Optional[dict]=None,columns:Optional[list]=None,order_by:Optional[list]=None) -> pd.DataFrame:
+        """Rows of table `name` matching `where`
+
+        Parameters:
+        -----------
+        where : dict, optional
+            column -> value; a value may be a scalar (equality), a tuple
+            `(low, high)` (inclusive range; either end may be None) or a
+            list (any of)
+
+        columns : list of str, optional
+            columns to return (default: all, in the table's order)
+
+        order_by : list of str, optional
+            sort columns (default: the table's row order)
+
+        """
+        self.ensure(name)
+        dtypes = self._dtypes[name]
+        for col in list(columns or []) + list(where or {}) + list(order_by or []):
+            if col not in dtypes:
+                raise KeyError(f"no column {col!r} in {name}")
+
+        clauses, params = [], []
+        for col, value in (where or {}).items():
+            col = _quote(col)
+            if isinstance(value,tuple):
+                low, high = value
+                if low is not None:
+                    clauses.append(f"{col} >= ?")
+                    params.append(low)
+                if high is not None:
+                    clauses.append(f"{col} <= ?")
+                    params.append(high)
+            elif isinstance(value,(list,set,frozenset)):
+                value = list(value)
+                clauses.append(f"{col} IN ({','.join('?' * len(value))})" if value else '0')
+                params += value
+            elif value is None:
+                clauses.append(f"{col} IS NULL")
+            else:
+                clauses.append(f"{col} = ?")
+                params.append(value)
+
+        names = list(columns) if columns is not None else list(dtypes)
+        sql = f"SELECT {','.join(map(_quote,names))} FROM {_quote(name)}"
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY ' + (','.join(map(_quote,order_by)) if order_by else 'rowid')
+        params = [v.item() if hasattr(v,'item') else v for v in params]
+
+        with self._lock:
+            rows = self._connect().execute(sql,params).fetchall()
+        # SQLite only knows integers, reals and text; restore the frame's dtypes
+        values = zip(*rows) if rows else [()] * len(names)
+        return pd.DataFrame({c:_column(v,dtypes[c]) for c, v in zip(names,values)},columns=names)
+
+    def plan(self,name:str,where:dict) -> list:
+        """SQLite's query plan for a `select()` (to check an index is used)"""
+        self.ensure(name)
+        clauses = ' AND '.join(f"{_quote(c)} = ?" for c in where)
+        with self._lock:
+            rows = self._connect().execute(f"EXPLAIN QUERY PLAN SELECT * FROM {_quote(name)} WHERE {clauses}",
+                                           list(where.values())).fetchall()
+        return [r[-1] for r in rows]
+
+
+database = Database()
+
+def configure(path:str=None):
+    """Point the package at another database file (e.g. a writable copy)"""
+    if path is not None:
+        database.close()
+        database.path = path
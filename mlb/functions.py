@@ -1,22 +1,23 @@
-import time
 import datetime as dt
 import platform, requests
-from urllib.parse import unquote
 from typing import Union, Optional, List
 
 import pandas as pd
-import asyncio, aiohttp, nest_asyncio
+import aiohttp
 from bs4 import BeautifulSoup as bs, SoupStrainer
 
 from . import mlb_dataclasses as dclass
 from . import constants as c
-from . import parsing, helpers, mlbdata
-from .async_mlb import fetch, _determine_loop
+from . import parsing, helpers, mlbdata, search
+from .async_mlb import client
+from .async_mlb import timing
+from .async_mlb.fetch import fetch as _fetch_async
+from .async_mlb.runner import run_sync
+from .async_mlb.scheduler import scheduler, BatchResult, Failure
+from .async_mlb.planner import StatsQuery, QueryPlan
 from .utils import curr_date, default_season, get_tzinfo
 from .helpers import ExtendedDict
 
-nest_asyncio.apply()
-
 if platform.system() == "Windows":
     standard_time_fmt = r"%I:%M %p"
 else:
@@ -35,16 +36,16 @@ async def _parse_player_data(
         data = data["people"][0]
         debut = data["mlbDebutDate"]
         query = f"stats=gameLog&startDate={debut}&endDate={debut}&hydrate=team"
-        resp = await session.get(f"{c.BASE}/people/{_mlbam}/stats?{query}")
-        data["debut_data"] = await resp.json()
+        resp = await client.request(f"{c.BASE}/people/{_mlbam}/stats?{query}",session=session)
+        data["debut_data"] = resp.json()
         return data
     elif type(data) is dict:
         return data
     else:
         soup = bs(data,'lxml',parse_only=SoupStrainer("a"))
         href_url = soup.find("a",text="View Player Info")["href"]
-        resp = await session.get(href_url)
-        bio_page = await resp.text()
+        resp = await client.request(href_url,session=session)
+        bio_page = resp.text()
         soup = bs(bio_page,'lxml',parse_only=SoupStrainer(['div','h2','p']))
 
         all_ps = soup.find(id="mw-content-text").find("div",class_="mw-parser-output").find("h2").find_all_next("p")
@@ -57,25 +58,19 @@ async def _fetch_player_data(
     urls,
     _get_bio=None,
     _mlbam=None):
-    retrieved_responses = []
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for url in urls:
-            tasks.append(session.get(url, ssl=False))
+    session = await client.get_client_session()
 
-        responses = await asyncio.gather(*tasks)
+    async def _get(indexed_url):
+        resp_idx, url = indexed_url
+        response = await client.request(url, ssl=False, session=session)
+        if resp_idx == 0 and _get_bio is True:
+            resp = response.text()
+        else:
+            resp = response.json()
         
-        for resp_idx, response in enumerate(responses):
-            if resp_idx == 0 and _get_bio is True:
-                resp = await response.text()
-            else:
-                resp = await response.json()
-            
-            parsed_data = await _parse_player_data(data=resp,session=session,_url=str(response.url),_mlbam=_mlbam)
+        return await _parse_player_data(data=resp,session=session,_url=response.url,_mlbam=_mlbam)
 
-            retrieved_responses.append(parsed_data)
-        
-        await session.close()
+    retrieved_responses = await scheduler.map(_get,enumerate(urls))
     
     return retrieved_responses
 
@@ -85,7 +80,6 @@ async def _parse_team_data(
     lgs_df:pd.DataFrame,
     _mlbam,
     **kwargs):
-    start = time.time()
     if f"/teams/{_mlbam}?season=" in _url:
         team_info_parsed = {}
         teams : dict = data["teams"][0]
@@ -229,62 +223,60 @@ async def _parse_team_data(
                     recap_url,
                     recap_avail,
                 ])
-        sched_df = pd.DataFrame(data=sched_data,
-                                columns=['season',
-                                         'date',
-                                         'gamePk',
-                                         'game_type',
-                                         'status_abstract',
-                                         'status_detailed',
-                                         'is_home',
-                                         'is_win',
-                                         'away_mlbam',
-                                         'away_name',
-                                         'away_location',
-                                         'away_franchise',
-                                         'away_club',
-                                         'away_lg_mlbam',
-                                         'away_lg_name',
-                                         'away_lg_short',
-                                         'away_lg_abbrv',
-                                         'away_div_mlbam',
-                                         'away_div_name',
-                                         'away_div_short',
-                                         'away_div_abbrv',
-                                         'away_score',
-                                         'home_mlbam',
-                                         'home_name',
-                                         'home_location',
-                                         'home_franchise',
-                                         'home_club',
-                                         'home_lg_mlbam',
-                                         'home_lg_name',
-                                         'home_lg_short',
-                                         'home_lg_abbrv',
-                                         'home_div_mlbam',
-                                         'home_div_name',
-                                         'home_div_short',
-                                         'home_div_abbrv',
-                                         'home_score',
-                                         'day_game_number',
-                                         'double_header',
-                                         'series_game',
-                                         'series_length',
-                                         'series_description',
-                                         'scheduled_inns',
-                                         'reschedule_date_to',
-                                         'rescheduled_date_from',
-                                         'venue_mlbam',
-                                         'venue_name',
-                                         'recap_title',
-                                         'recap_desc',
-                                         'recap_url',
-                                         'recap_avail',
-                                         ])
-
-        if kwargs.get('_logtime') is True:
-            print(f"\n{unquote(_url).replace(c.BASE,'')}")
-            print(f'--- {time.time() - start} seconds ---\n')
+        with timing.phase('frame'):
+            sched_df = pd.DataFrame(data=sched_data,
+                                    columns=['season',
+                                             'date',
+                                             'gamePk',
+                                             'game_type',
+                                             'status_abstract',
+                                             'status_detailed',
+                                             'is_home',
+                                             'is_win',
+                                             'away_mlbam',
+                                             'away_name',
+                                             'away_location',
+                                             'away_franchise',
+                                             'away_club',
+                                             'away_lg_mlbam',
+                                             'away_lg_name',
+                                             'away_lg_short',
+                                             'away_lg_abbrv',
+                                             'away_div_mlbam',
+                                             'away_div_name',
+                                             'away_div_short',
+                                             'away_div_abbrv',
+                                             'away_score',
+                                             'home_mlbam',
+                                             'home_name',
+                                             'home_location',
+                                             'home_franchise',
+                                             'home_club',
+                                             'home_lg_mlbam',
+                                             'home_lg_name',
+                                             'home_lg_short',
+                                             'home_lg_abbrv',
+                                             'home_div_mlbam',
+                                             'home_div_name',
+                                             'home_div_short',
+                                             'home_div_abbrv',
+                                             'home_score',
+                                             'day_game_number',
+                                             'double_header',
+                                             'series_game',
+                                             'series_length',
+                                             'series_description',
+                                             'scheduled_inns',
+                                             'reschedule_date_to',
+                                             'rescheduled_date_from',
+                                             'venue_mlbam',
+                                             'venue_name',
+                                             'recap_title',
+                                             'recap_desc',
+                                             'recap_url',
+                                             'recap_avail',
+                                             ])
+
         return sched_df
     
     elif "statSplits" in _url and "/roster/" in _url:
@@ -338,15 +330,13 @@ async def _parse_team_data(
         else:
             reordered_cols  = added_cols + c.COLS_PIT
 
-        try:
-            combined_df = pd.DataFrame(stat_data).rename(columns=c.STATDICT).reindex(columns=reordered_cols)
-        except:
-            combined_df = pd.DataFrame(stat_data).rename(columns=c.STATDICT)
-            # print(pd.DataFrame(stat_data).rename(columns=c.STATDICT).columns)
+        with timing.phase('frame'):
+            try:
+                combined_df = pd.DataFrame(stat_data).rename(columns=c.STATDICT).reindex(columns=reordered_cols)
+            except:
+                combined_df = pd.DataFrame(stat_data).rename(columns=c.STATDICT)
+                # print(pd.DataFrame(stat_data).rename(columns=c.STATDICT).columns)
 
-        if kwargs.get('_logtime') is True:
-            print(f"\n{unquote(_url).replace(c.BASE,'')}")
-            print(f'--- {time.time() - start} seconds ---\n')
 
         return combined_df
 
@@ -374,13 +364,11 @@ async def _parse_team_data(
                 p.get('mlbDebutDate','-'),
                 p.get('lastPlayedDate','-'),
             ])
-        df = pd.DataFrame(
-            data=coach_data,
-            columns=['job','job_title','job_id','jersey_number_coach','jersey_number_primary','name','birth_date','age','pos','mlb_debut','last_played'])
+        with timing.phase('frame'):
+            df = pd.DataFrame(
+                data=coach_data,
+                columns=['job','job_title','job_id','jersey_number_coach','jersey_number_primary','name','birth_date','age','pos','mlb_debut','last_played'])
 
-        if kwargs.get('_logtime') is True:
-            print(f"\n{unquote(_url).replace(c.BASE,'')}")
-            print(f'--- {time.time() - start} seconds ---\n')
 
         return df
 
@@ -443,15 +431,13 @@ async def _parse_team_data(
             reordered_cols = pre_cols + c.COLS_FLD
         # print(reordered_cols)
         # print("line 480")
-        try:
-            combined_df = pd.DataFrame(stat_data).rename(columns=c.STATDICT).reindex(columns=reordered_cols)
-        except:
-            combined_df = pd.DataFrame(stat_data).rename(columns=c.STATDICT)
-            # print(pd.DataFrame(stat_data).rename(columns=c.STATDICT).columns)
+        with timing.phase('frame'):
+            try:
+                combined_df = pd.DataFrame(stat_data).rename(columns=c.STATDICT).reindex(columns=reordered_cols)
+            except:
+                combined_df = pd.DataFrame(stat_data).rename(columns=c.STATDICT)
+                # print(pd.DataFrame(stat_data).rename(columns=c.STATDICT).columns)
             
-        if kwargs.get('_logtime') is True:
-            print(f"\n{unquote(_url).replace(c.BASE,'')}")
-            print(f'--- {time.time() - start} seconds ---\n')
         return combined_df
 
     elif f"/teams/{_mlbam}/stats?stats=season,seasonAdvanced" in _url:
@@ -490,19 +476,17 @@ async def _parse_team_data(
                             reordered_cols = c.COLS_FLD
 
 
-                try:
-                    df = pd.DataFrame(stat_data).rename(columns=c.STATDICT).reindex(columns=reordered_cols)
-                except:
-                    df = pd.DataFrame(stat_data).rename(columns=c.STATDICT)
-                    # print(pd.DataFrame(stat_data).rename(columns=c.STATDICT).columns)
+                with timing.phase('frame'):
+                    try:
+                        df = pd.DataFrame(stat_data).rename(columns=c.STATDICT).reindex(columns=reordered_cols)
+                    except:
+                        df = pd.DataFrame(stat_data).rename(columns=c.STATDICT)
+                        # print(pd.DataFrame(stat_data).rename(columns=c.STATDICT).columns)
 
                 df['game_type'] = gt
 
                 stat_dict[add_to] = df
             
-            if kwargs.get('_logtime') is True:
-                print(f"\n{unquote(_url).replace(c.BASE,'')}")
-                print(f'--- {time.time() - start} seconds ---\n')
 
             return stat_dict
         else:
@@ -559,9 +543,10 @@ async def _parse_team_data(
                     draft_type.get('description','-')
                 ])
 
-        df = pd.DataFrame(
-            data=draft_data,
-            columns=['season','bisID','mlbam','name','birth_date','birth_city','birth_state','birth_country','height','weight','pos','bats','throws','rank','round','pick_number','round_pick_number','value','signing_bonus','home_city','home_state','home_country','school_name','school_class','school_state','school_country','scouting_report','headshot_url','blurb','is_drafted','is_pass','draft_code','draft_description'])
+        with timing.phase('frame'):
+            df = pd.DataFrame(
+                data=draft_data,
+                columns=['season','bisID','mlbam','name','birth_date','birth_city','birth_state','birth_country','height','weight','pos','bats','throws','rank','round','pick_number','round_pick_number','value','signing_bonus','home_city','home_state','home_country','school_name','school_class','school_state','school_country','scouting_report','headshot_url','blurb','is_drafted','is_pass','draft_code','draft_description'])
         return df
 
     elif "/transactions" in _url:
@@ -593,50 +578,53 @@ async def _parse_team_data(
                 
                 trx_data.append(row)
 
-            df = pd.DataFrame(data=trx_data,columns=trx_columns)
+            with timing.phase('frame'):
+                df = pd.DataFrame(data=trx_data,columns=trx_columns)
         except:
             df = pd.DataFrame()
 
 
-        if kwargs.get('_logtime') is True:
-            print(f"\n{unquote(_url).replace(c.BASE,'')}")
-            print(f'--- {time.time() - start} seconds ---\n')
 
         return df
 
-    if kwargs.get('_logtime') is True:
-        print(f"\n{unquote(_url).replace(c.BASE,'')}")
-        print(f'--- {time.time() - start} seconds ---\n')
 
     return data
 
 async def _fetch_team_data(
     urls:list,
     lgs_df:pd.DataFrame,
-    _mlbam,
-    _logtime=None):
-    retrieved_responses = []
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        for url in urls:
-            tasks.append(session.get(url, ssl=False))
-
-        responses = await asyncio.gather(*tasks)
-        
-        for response in responses:
-            resp = await response.json()
-            
-            parsed_data = await _parse_team_data(
-                data=resp,
-                session=session,
-                _url=str(response.url),
-                lgs_df=lgs_df,
-                _mlbam=_mlbam,
-                _logtime=_logtime)
-
-            retrieved_responses.append(parsed_data)
-        
-        await session.close()
+    _mlbam):
+    session = await client.get_client_session()
+    # 'urls' may hold StatsQuery items; compatible ones share one request
+    plan = QueryPlan(urls)
+
+    async def _get(url):
+        response = await client.request(url, ssl=False, session=session)
+        return response.json()
+
+    payloads = await scheduler.settle(_get,plan.urls)
+    # a second pass only for the URLs that still failed after their retries
+    await scheduler.retry_failed(_get,payloads)
+
+    retrieved_responses = BatchResult()
+    for i in range(len(plan)):
+        idx = plan.request_of(i)
+        if idx in payloads.failed:
+            retrieved_responses.failed[i] = payloads.failed[idx]
+            retrieved_responses.append(None)
+            continue
+        try:
+            with timing.phase('parse'):
+                parsed = await _parse_team_data(
+                    data=plan.payload(i,payloads[idx]),
+                    session=session,
+                    _url=plan.url_of(i),
+                    lgs_df=lgs_df,
+                    _mlbam=_mlbam)
+        except Exception as e:
+            retrieved_responses.failed[i] = Failure(plan.url_of(i),e)
+            parsed = None
+        retrieved_responses.append(parsed)
     
     return retrieved_responses
 
@@ -644,10 +632,26 @@ async def _fetch_team_data(
 # Bulk Retrieval
 # ===============================================================
 
+def _season_bounds(ssn_row:pd.Series) -> tuple[str,str]:
+    """First and last date of any game in a season (as 'YYYY-MM-DD')
+
+    Uses the earliest/latest of the spring training, regular season and
+    postseason dates in the seasons table; older seasons only have some of
+    them.
+    """
+    starts = [ssn_row.get(k) for k in ('springStartDate','seasonStartDate','regularSeasonStartDate')]
+    ends   = [ssn_row.get(k) for k in ('postSeasonEndDate','seasonEndDate','regularSeasonEndDate')]
+    start = min(d for d in starts if not pd.isna(d))
+    end   = max(d for d in ends if not pd.isna(d))
+    return start.strftime(r"%Y-%m-%d"), end.strftime(r"%Y-%m-%d")
+
 def _team_data(_mlbam,_season,**kwargs) -> Union[dict,list]:
-    start = time.time()
+    return run_sync(_team_data_async(_mlbam,_season,**kwargs))
+
+@timing.timed('Team')
+async def _team_data_async(_mlbam,_season,**kwargs) -> Union[dict,list]:
     lgs_df = mlbdata.get_leagues_df().set_index('mlbam')
-    tms_df = mlbdata.mlbdata.get_teams_df()
+    tms_df = mlbdata.get_teams_df()
     ssn_df = mlbdata.get_seasons_df().set_index('season')
     ssn_row = ssn_df.loc[int(_season)]
 
@@ -681,62 +685,49 @@ def _team_data(_mlbam,_season,**kwargs) -> Union[dict,list]:
     
     # Retrieves '40Man' roster
     # -----------------------------
+    # The roster and team stats queries only differ in their stat types and
+    # groups; '_fetch_team_data' merges them into two roster requests and one
+    # team stats request per game type, then splits the payloads back up
+    roster = f"/teams/{_mlbam}/roster/40Man"
+    roster_params = {'season':_season}
+    season_args = {'season':_season}
+    splits_args = {'sitCodes':['sp','rp'],'season':_season}
     url_list = [
         f"{c.BASE}/teams/{_mlbam}?season={_season}&hydrate=standings",
-        f"{c.BASE}/teams/{_mlbam}/roster/40Man?season={_season}&hydrate=person(stats(type=[season],group=[hitting],season={_season}))",
-        f"{c.BASE}/teams/{_mlbam}/roster/40Man?season={_season}&hydrate=person(stats(type=[season],group=[pitching],season={_season}))",
-        f"{c.BASE}/teams/{_mlbam}/roster/40Man?season={_season}&hydrate=person(stats(type=[season],group=[fielding],season={_season}))",
-        f"{c.BASE}/teams/{_mlbam}/roster/40Man?season={_season}&hydrate=person(stats(type=[seasonAdvanced],group=[hitting],season={_season}))",
-        f"{c.BASE}/teams/{_mlbam}/roster/40Man?season={_season}&hydrate=person(stats(type=[seasonAdvanced],group=[pitching],season={_season}))",
-
-        f"{c.BASE}/teams/{_mlbam}/roster/40Man?season={_season}&hydrate=person(stats(type=[statSplits],group=[pitching],sitCodes=[sp,rp],season={_season}))",
-        f"{c.BASE}/teams/{_mlbam}/roster/40Man?season={_season}&hydrate=person(stats(type=[statSplitsAdvanced],group=[pitching],sitCodes=[sp,rp],season={_season}))",
-
-        # Stats for 'gameType = S' (Spring Training)
-        f"{c.BASE}/teams/{_mlbam}/stats?stats=season,seasonAdvanced&group=hitting&gameType=S&season={_season}",
-        f"{c.BASE}/teams/{_mlbam}/stats?stats=season,seasonAdvanced&group=pitching&gameType=S&season={_season}",
-        f"{c.BASE}/teams/{_mlbam}/stats?stats=season,seasonAdvanced&group=fielding&gameType=S&season={_season}",
-        
-        # Stats for 'gameType = R' (Regular Season)
-        f"{c.BASE}/teams/{_mlbam}/stats?stats=season,seasonAdvanced&group=hitting&gameType=R&season={_season}",
-        f"{c.BASE}/teams/{_mlbam}/stats?stats=season,seasonAdvanced&group=pitching&gameType=R&season={_season}",
-        f"{c.BASE}/teams/{_mlbam}/stats?stats=season,seasonAdvanced&group=fielding&gameType=R&season={_season}",
-        
-        # Stats for 'gameType = P' (Postseason/Playoffs)
-        f"{c.BASE}/teams/{_mlbam}/stats?stats=season,seasonAdvanced&group=hitting&gameType=P&season={_season}",
-        f"{c.BASE}/teams/{_mlbam}/stats?stats=season,seasonAdvanced&group=pitching&gameType=P&season={_season}",
-        f"{c.BASE}/teams/{_mlbam}/stats?stats=season,seasonAdvanced&group=fielding&gameType=P&season={_season}",
-        
+        StatsQuery(roster,['season'],['hitting'],roster_params,'person',season_args),
+        StatsQuery(roster,['season'],['pitching'],roster_params,'person',season_args),
+        StatsQuery(roster,['season'],['fielding'],roster_params,'person',season_args),
+        StatsQuery(roster,['seasonAdvanced'],['hitting'],roster_params,'person',season_args),
+        StatsQuery(roster,['seasonAdvanced'],['pitching'],roster_params,'person',season_args),
+
+        StatsQuery(roster,['statSplits'],['pitching'],roster_params,'person',splits_args),
+        StatsQuery(roster,['statSplitsAdvanced'],['pitching'],roster_params,'person',splits_args),
+    ]
+
+    # Stats for 'gameType = S' (Spring Training), 'R' (Regular Season) and
+    # 'P' (Postseason/Playoffs). Game types stay separate requests since the
+    # endpoint would sum them into a single split
+    for gt in ('S','R','P'):
+        for group in ('hitting','pitching','fielding'):
+            url_list.append(StatsQuery(f"/teams/{_mlbam}/stats",['season','seasonAdvanced'],[group],{'gameType':gt,'season':_season}))
+
+    url_list += [
         f"{c.BASE}/teams/{_mlbam}/roster/coach?season={_season}&hydrate=person",
         f"{c.BASE}/draft/{_season}?sportId=1&teamId={_mlbam}",
         f"{c.BASE}/transactions?teamId={_mlbam}&startDate={ssn_start}&endDate={ssn_end}",
     ]
 
+    # One request for the whole season (spring training through the
+    # postseason) rather than one per calendar month
+    sched_start, sched_end = _season_bounds(ssn_row)
     sched_hydrations = "game(content(media(epg))),team"
-    for m in range(12):
-        month = int(m) + 1
-        ssn = int(_season)
-        date_obj_1 = dt.date(year=ssn,month=month,day=1)
-        if month != 12:
-            date_obj_2 = dt.date(year=ssn,month=month+1,day=1)
-        else:
-            ssn = ssn + 1
-            date_obj_2 = dt.date(year=ssn,month=1,day=1)
-        date_obj_2 = date_obj_2 - dt.timedelta(days = 1)
-        start_date_query = f"startDate={date_obj_1.strftime(r'%Y-%m-%d')}"
-        end_date_query = f"endDate={date_obj_2.strftime(r'%Y-%m-%d')}"
-        date_range_query = f"{start_date_query}&{end_date_query}"
-        url_to_add = f"{c.BASE}/schedule?sportId=1&teamId={_mlbam}&season={_season}&{date_range_query}&gameType={c.GAME_TYPES_ALL}&hydrate={sched_hydrations}"
-
-        url_list.append(url_to_add)
-    _logtime = kwargs.get('_logtime')
+    url_list.append(f"{c.BASE}/schedule?sportId=1&teamId={_mlbam}&season={_season}&startDate={sched_start}&endDate={sched_end}&gameType={c.GAME_TYPES_ALL}&hydrate={sched_hydrations}")
     
     # Generator comprehension
     url_list = (url for url in url_list)
     
-    loop = _determine_loop()
-    
-    team_data_dict = loop.run_until_complete(_fetch_team_data(urls=url_list,lgs_df=lgs_df,_mlbam=_mlbam,_logtime=_logtime))
+    team_data_dict = await _fetch_team_data(urls=url_list,lgs_df=lgs_df,_mlbam=_mlbam)
+    team_data_dict.raise_for_failures()
     
     total_hitting_S  = team_data_dict[8]
     total_pitching_S = team_data_dict[9]
@@ -778,15 +769,15 @@ def _team_data(_mlbam,_season,**kwargs) -> Union[dict,list]:
         'total_hitting_adv' : total_hitting['advanced'],
         'total_pitching_adv': total_pitching['advanced'],
         
-        'coaches'           : team_data_dict[-15],
-        'drafts'            : team_data_dict[-14],
-        'transactions'      : team_data_dict[-13],
-        'schedule'     : pd.concat(team_data_dict[-12:]),
+        'coaches'           : team_data_dict[-4],
+        'drafts'            : team_data_dict[-3],
+        'transactions'      : team_data_dict[-2],
+        'schedule'     : team_data_dict[-1],
     }
 
     if kwargs.get('_logtime') is True:
-        print("\n\nTOTAL:")
-        print(f"--- {time.time() - start} seconds ---")
+        # the call is still running; report what has been recorded so far
+        timing.print_sink(timing.current())
 
     return fetched_data
 
@@ -799,9 +790,12 @@ def _player_data(_mlbam,**kwargs) -> dict:
         Player's official "MLB Advanced Media" ID
     
     """
-    
-    pdf = mlbdata.get_people_df().set_index("mlbam").loc[_mlbam]
-    tdf = mlbdata.mlbdata.get_teams_df()
+    return run_sync(_player_data_async(_mlbam,**kwargs))
+
+@timing.timed('Person')
+async def _player_data_async(_mlbam,**kwargs) -> dict:
+    pdf = mlbdata.get_people_df(mlbam=_mlbam).set_index("mlbam").loc[_mlbam]
+    tdf = mlbdata.get_teams_df()
     lg_df = mlbdata.get_leagues_df().set_index("mlbam")
 
     url_list = []
@@ -821,8 +815,7 @@ def _player_data(_mlbam,**kwargs) -> dict:
     
     # Generator attempt
     url_list = (url for url in url_list)
-    loop = _determine_loop()
-    responses = loop.run_until_complete(_fetch_player_data(url_list,_get_bio=kwargs.get("_get_bio"),_mlbam=_mlbam))
+    responses = await _fetch_player_data(url_list,_get_bio=kwargs.get("_get_bio"),_mlbam=_mlbam)
     if kwargs.get("_get_bio") is True:
         _player_bio     = responses[-5]
     else:
@@ -1564,17 +1557,18 @@ def _franchise_data(mlbam,**kwargs) -> dict:
     "roster_fielding"
 
     """
+    return run_sync(_franchise_data_async(mlbam,**kwargs))
+
+@timing.timed('Franchise')
+async def _franchise_data_async(mlbam,**kwargs) -> dict:
     _mlbam = mlbam
 
-    records = mlbdata.get_yby_records()
-    records = records[records['tm_mlbam']==int(mlbam)]
-    standings = mlbdata.get_standings_df()
-    standings = standings[standings['mlbam']==int(mlbam)]
+    records = mlbdata.get_yby_records(team=int(mlbam))
+    standings = mlbdata.get_standings_df(team=int(mlbam))
 
     # == ASYNC STARTS HERE ===============================================
     lgs_df = mlbdata.get_leagues_df().set_index('mlbam')
-    team_df = mlbdata.mlbdata.get_teams_df()
-    team_df = team_df[team_df['mlbam']==int(mlbam)]
+    team_df = mlbdata.get_teams_df(mlbam=int(mlbam))
     firstYear = team_df.iloc[0]["first_year"]
     years = range(firstYear,int(default_season())+1)
 
@@ -1592,7 +1586,7 @@ def _franchise_data(mlbam,**kwargs) -> dict:
     # https://statsapi.mlb.com/api/v1/teams/stats/leaders?season=2021&leaderCategories=wins,losses
     # https://statsapi.mlb.com/api/v1/teams/145/roster/coach?season=1904
 
-    resps = fetch(urls)
+    resps = [r.json for r in (await _fetch_async(urls)).raise_for_failures()]
     
     yby_data = resps[:-5]
     team_info = resps[-5]
@@ -1910,6 +1904,10 @@ def player_stats(mlbam,**kwargs):
     mlb.gameTypes()
 
     """
+    return run_sync(_player_stats_async(mlbam,**kwargs))
+
+@timing.timed('player_stats')
+async def _player_stats_async(mlbam,**kwargs):
     kwargs = ExtendedDict(kwargs)
     params = {
         'group':'hitting,pitching,fielding',
@@ -1930,7 +1928,7 @@ def player_stats(mlbam,**kwargs):
         params['group'] = statGroup
         
     url = c.BASE + f"/people/{mlbam}/stats"
-    resp = requests.get(url,params=params)
+    resp = await client.request(url,params=params)
     
     dfs = {}
     
@@ -1952,7 +1950,83 @@ def player_stats(mlbam,**kwargs):
         dfs['hitting'],dfs['pitching'],dfs['fielding'],
         dfs['hitting_adv'],dfs['pitching_adv']
     )
-    
+
+# The API has no documented limit on 'personIds' but very long query strings
+# get rejected by proxies along the way, so each request is kept under this
+PEOPLE_URL_LENGTH = 2000
+
+def _people_urls(mlbams:list,hydrate:Optional[str]=None,max_url_length:int=PEOPLE_URL_LENGTH) -> list[str]:
+    base = c.BASE + "/people?personIds="
+    suffix = f"&hydrate={hydrate}" if hydrate else ""
+    room = max_url_length - len(base) - len(suffix)
+    urls = []
+    chunk, size = [], 0
+    for mlbam in mlbams:
+        mlbam = str(mlbam)
+        # +1 for the separating comma
+        if chunk and size + len(mlbam) + 1 > room:
+            urls.append(base + ",".join(chunk) + suffix)
+            chunk, size = [], 0
+        chunk.append(mlbam)
+        size += len(mlbam) + (1 if size else 0)
+    if chunk:
+        urls.append(base + ",".join(chunk) + suffix)
+    return urls
+
+def people(
+    mlbams:Union[int,str,List[int]],
+    hydrate:Optional[Union[str,List[str]]]=None,
+    as_dataframe:bool=False,
+    **kwargs) -> Union[List[dclass.Person],pd.DataFrame]:
+    """Get biographical data for many people at once
+
+    IDs are grouped into as few `/people?personIds=...` requests as the URL
+    length allows (a full roster fits in one), instead of one request per
+    person.
+
+    Parameters
+    ----------
+    mlbams : int, str or list of int
+        official "MLB Advanced Media" IDs (a single ID, a comma-separated
+        string or a list)
+
+    hydrate : str or list of str, optional
+        API hydrations to include for each person (e.g. 'currentTeam')
+
+    as_dataframe : bool, default False
+        return a DataFrame (one row per person, same columns as
+        `api.player_search`) instead of a list of `mlb_dataclasses.Person`
+
+    max_url_length : int, default 2000
+        maximum length of each request URL
+
+    Results follow the order of `mlbams`; duplicates are returned once and
+    unknown IDs are skipped.
+
+    """
+    return run_sync(_people_async(mlbams,hydrate,as_dataframe,**kwargs))
+
+@timing.timed('people')
+async def _people_async(mlbams,hydrate=None,as_dataframe=False,**kwargs) -> Union[List[dclass.Person],pd.DataFrame]:
+    if type(mlbams) in (int,str):
+        mlbams = str(mlbams).replace(" ","").split(",")
+    ids = list(dict.fromkeys(int(m) for m in mlbams if str(m) != ""))
+    if type(hydrate) in (list,tuple):
+        hydrate = ",".join(hydrate)
+
+    urls = _people_urls(ids,hydrate,kwargs.get("max_url_length",PEOPLE_URL_LENGTH))
+    responses = (await _fetch_async(urls)).raise_for_failures()
+
+    by_id = {}
+    for r in responses:
+        for p in r.json.get("people",[]):
+            by_id[p.get("id")] = p
+    found = [by_id[i] for i in ids if i in by_id]
+
+    if as_dataframe:
+        return pd.DataFrame([parsing._parse_person(_obj=p) for p in found])
+    return [dclass.Person.from_json(p) for p in found]
+
 def player_game_logs(mlbam,season=None,statGroup=None,gameType=None,**kwargs) -> pd.DataFrame:
     """Get a player's game log stats for a specific season
 
@@ -2010,7 +2084,7 @@ def player_game_logs(mlbam,season=None,statGroup=None,gameType=None,**kwargs) ->
         params["endDate"] = kwargs["endDate"]
 
     url = c.BASE + f"/people/{mlbam}/stats?"
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
 
     data = []
 
@@ -2092,7 +2166,7 @@ def player_date_range(mlbam,statGroup,startDate,endDate,gameType=None) -> pd.Dat
 
     url = c.BASE + f"/people/{mlbam}/stats?"
 
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
     resp_json = resp.json()
 
     data = []
@@ -2145,7 +2219,7 @@ def player_date_range_advanced(mlbam,statGroup,startDate,endDate,gameType=None)
 
     url = c.BASE + f"/people/{mlbam}/stats?"
 
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
     resp_json = resp.json()
 
     data = []
@@ -2199,7 +2273,7 @@ def player_splits(mlbam,statGroup,sitCodes,season=None,gameType=None) -> pd.Data
 
     url = c.BASE + f"/people/{mlbam}/stats?"
 
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
     resp_json = resp.json()
 
     data = []
@@ -2255,7 +2329,7 @@ def player_splits_advanced(mlbam,statGroup,sitCodes,season=None,gameType=None) -
 
     url = c.BASE + f"/people/{mlbam}/stats?"
 
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
     resp_json = resp.json()
 
     data = []
@@ -2299,7 +2373,7 @@ def team_stats(mlbam,**kwargs) -> pd.DataFrame:
         params['group'] = statGroup
     
     url = c.BASE + f"/teams/{mlbam}/stats"
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
     
     dfs = {}
     
@@ -2380,7 +2454,7 @@ def team_game_logs(mlbam,season=None,statGroup=None,gameType=None,**kwargs) -> p
         params["endDate"] = kwargs["endDate"]
 
     url = c.BASE + f"/teams/{mlbam}/stats?"
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
 
     data = []
     tms_df = mlbdata.get_teams_df(year=season).set_index("mlbam")
@@ -2466,7 +2540,7 @@ def team_roster(mlbam,season=None,rosterType=None,**kwargs) -> pd.DataFrame:
     # hydrate=person(rosterEntries)
     url = c.BASE + f"/teams/{mlbam}/roster"
 
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
     roster = resp.json()["roster"]
     
     columns = [
@@ -2513,32 +2587,31 @@ def team_roster(mlbam,season=None,rosterType=None,**kwargs) -> pd.DataFrame:
 def team_appearances(mlbam):
     gt_types = {'F':'wild_card_series','D':'division_series','L':'league_series','W':'world_series','P':'playoffs'}
     sort_orders = {'F':1,'D':2,'L':3,'W':4}
-    with requests.session() as sesh:
-        data = []
-        for gt in ('F','D','L','W'):
-            url = f"https://statsapi.mlb.com/api/v1/teams/{mlbam}/stats?stats=yearByYearPlayoffs&group=pitching&gameType={gt}&fields=stats,splits,stat,wins,losses,season"
-            resp = sesh.get(url)
-            game_type = gt_types[gt]
-            years = resp.json()["stats"][0]["splits"]
-            for y in years:
-                season = y.get("season","")
-                wins = y.get("stat",{}).get("wins",0)
-                losses = y.get("stat",{}).get("losses",0)
-                if wins > losses:
-                    title_winner = True
-                else:
-                    title_winner = False
-                sort_order = sort_orders[gt]
-                
-                data.append([
-                    season,gt,game_type,wins,losses,title_winner,sort_order
-                ])
-                
+    data = []
+    for gt in ('F','D','L','W'):
+        url = f"https://statsapi.mlb.com/api/v1/teams/{mlbam}/stats?stats=yearByYearPlayoffs&group=pitching&gameType={gt}&fields=stats,splits,stat,wins,losses,season"
+        resp = client.get(url)
+        game_type = gt_types[gt]
+        years = resp.json()["stats"][0]["splits"]
+        for y in years:
+            season = y.get("season","")
+            wins = y.get("stat",{}).get("wins",0)
+            losses = y.get("stat",{}).get("losses",0)
+            if wins > losses:
+                title_winner = True
+            else:
+                title_winner = False
+            sort_order = sort_orders[gt]
+            
+            data.append([
+                season,gt,game_type,wins,losses,title_winner,sort_order
+            ])
+            
 
-                
-        df = pd.DataFrame(data=data,columns=['season','gt','game_type','wins','losses','title_winner','sort_order']).sort_values(by=["season","sort_order"],ascending=[True,True]).reset_index(drop=True)
-        
-        return df
+            
+    df = pd.DataFrame(data=data,columns=['season','gt','game_type','wins','losses','title_winner','sort_order']).sort_values(by=["season","sort_order"],ascending=[True,True]).reset_index(drop=True)
+    
+    return df
 
 # ===============================================================
 # LEAGUE Functions
@@ -2578,7 +2651,7 @@ def league_stats(league="all",season=None,hydrate:Optional[str]=None,**kwargs) -
             print(prepared_url)
         return prepared_url
     
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
     if kwargs.get("log"):
         print(resp.url)
     
@@ -2610,7 +2683,7 @@ def league_leaders(season=None,statGroup=None,playerPool="Qualified"):
 
     url = c.BASE + f"/stats?stats=season&season={season}&group={statGroup}&playerPool={playerPool}"
 
-    resp = requests.get(url)
+    resp = client.get(url)
 
     resp_json = resp.json()
 
@@ -2702,7 +2775,7 @@ def season_standings(season=None,standingsType=None,**kwargs):
         req = requests.Request("GET",url,params=params)
         return req.prepare().url
     
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
     
     parsed_data = parsing._parse_season_standings_data(resp.json())
     
@@ -2711,7 +2784,7 @@ def season_standings(season=None,standingsType=None,**kwargs):
 # ===============================================================
 # MISC Functions
 # ===============================================================
-def find_team(query,season=None):
+def find_team(query,season=None,fuzzy=False):
     """Search for teams by name. *Uses local db storage
 
     Paramaters
@@ -2730,10 +2803,13 @@ def find_team(query,season=None):
     
     `season='all'` -> return results from all seasons 
     (season filter not applied)
+
+    fuzzy : bool, default False
+        also return teams with similar names, best matches first
     
     """
 
-    df = mlbdata.get_teams_df()
+    df = search.rows('teams',search.index('teams').search(query,fuzzy=fuzzy))
     
     if season is None:
         season = default_season()
@@ -2743,15 +2819,9 @@ def find_team(query,season=None):
     else:
         df = df[df["season"]==int(season)]
 
-    query = query.lower()
-    rows = []
-    for idx,row in df.iterrows():
-        if query in row['name_full'].lower():
-            rows.append(row)
-
-    return pd.DataFrame(rows).reset_index(drop=True)
+    return df.reset_index(drop=True)
 
-def find_venue(query):
+def find_venue(query,fuzzy=False):
     """Search for venues by name
 
     Paramaters
@@ -2759,17 +2829,31 @@ def find_venue(query):
     query : str
         keywords to search for in the 'venues' data (e.g. "Comiskey Park")
 
+    fuzzy : bool, default False
+        also return venues with similar names, best matches first
+
     """
 
-    df = mlbdata.get_venues_df()
+    return search.rows('venues',search.index('venues').search(query,fuzzy=fuzzy))
 
-    query = query.lower()
+def find_person(query,fuzzy=False,limit=None):
+    """Search for people (players, managers, umpires...) by name
 
-    df['vname'] = df['name'].str.lower()
+    Paramaters
+    ----------
+    query : str
+        keywords to search for in the 'people' data (e.g. "ohtani" or
+        "mike tr")
 
-    df = df[df['vname'].str.contains(query,case=False,regex=False)]
+    fuzzy : bool, default False
+        also return people with similar names, best matches first
+
+    limit : int, optional
+        return at most this many people
+
+    """
 
-    return df.drop(columns="vname")
+    return search.rows('people',search.index('people').search(query,fuzzy=fuzzy,limit=limit)).reset_index(drop=True)
   
 def play_search(
     mlbam,
@@ -2845,17 +2929,17 @@ def play_search(
     if statGroup is not None:
         params['group'] = statGroup
 
-    teams_df = mlbdata.get_teams_df(year=season).set_index('mlbam')
+    teams = mlbdata.team_index()
 
     url = c.BASE + f'/people/{mlbam}/stats'
-    response = requests.get(url,params=params)
+    response = client.get(url,params=params)
     resp = response.json()
 
     if kwargs.get('_log') is True:
         print('SEASON:\n')
         print(season)
         print('TEAMS:\n')
-        print(teams_df)
+        print(mlbdata.get_teams_df(year=season))
         print('\nREQUEST URL:\n')
         print(response.url)
         print('----------------------------\n')
@@ -2913,7 +2997,7 @@ def play_search(
                     away_mlbam = team['id']
                     home_mlbam = opponent['id']
                     
-                game_label = f'{teams_df.loc[away_mlbam]["mlbID"]} @ {teams_df.loc[home_mlbam]["mlbID"]}'
+                game_label = f'{teams[away_mlbam,season].mlbID} @ {teams[home_mlbam,season].mlbID}'
                 
                 pitch_info = [
                     play_id,
@@ -3009,7 +3093,7 @@ def play_search(
                     away_mlbam = team['id']
                     home_mlbam = opponent['id']
                     
-                game_label = f'{teams_df.loc[away_mlbam]["mlbID"]} @ {teams_df.loc[home_mlbam]["mlbID"]}'
+                game_label = f'{teams[away_mlbam,season].mlbID} @ {teams[home_mlbam,season].mlbID}'
 
                 pitch_info = [
                     play_id,
@@ -3172,7 +3256,7 @@ def pitch_search(mlbam,seasons=None,statGroup=None,opposingTeamId=None,eventType
     url = c.BASE + f"/people/{mlbam}/stats?stats=pitchLog&{queryString}"
 
 
-    response = requests.get(url)
+    response = client.get(url)
     
     log = response.json()["stats"][0]
     
@@ -3430,7 +3514,7 @@ def game_search(
               }
     
     url = c.BASE + f"/schedule"
-    response = requests.get(url,params=params)
+    response = client.get(url,params=params)
     all_results = []
 
     for d in response.json()["dates"]:
@@ -3499,7 +3583,7 @@ def last_game(mlbam):
 
     url = c.BASE + f"/teams/{teamID}?hydrate=previousSchedule(date={m}/{d}/{y},inclusive=True,limit=1,season={season},gameType=[S,R,D,W,F,C,L])"
 
-    resp = requests.get(url)
+    resp = client.get(url)
 
     result = resp.json()["teams"][0]["previousGameSchedule"]["dates"][0]["games"][0]
     gamePk = result.get("gamePk","")
@@ -3538,11 +3622,11 @@ def next_game(mlbam):
 
     try:
         url = c.BASE + f"/teams/{teamID}?hydrate=nextSchedule(date={m}/{d}/{y},inclusive=True,limit=1,season={y},gameType=[S,R,P])"
-        response = requests.get(url)
+        response = client.get(url)
         results = response.json()["teams"][0]["nextGameSchedule"]["dates"][0]["games"]
     except:
         url = c.BASE + f"/teams/{teamID}?hydrate=nextSchedule(date={m}/{d}/{y},inclusive=True,limit=1,season={y+1},gameType=[S,R,P])"
-        response = requests.get(url)
+        response = client.get(url)
         results = response.json()["teams"][0]["nextGameSchedule"]["dates"][0]["games"]
 
     result = results[0]
@@ -3600,7 +3684,31 @@ def schedule(mlbam=None,season=None,date=None,startDate=None,endDate=None,gameTy
         retrieve additional data (example hydrations - "linescore,person,decisions,lineups(person),probablePitcher")
 
     """
+    if kwargs.get('url_only'):
+        url, params, tz = _schedule_request(mlbam,season,date,startDate,endDate,gameType,opponentId,**kwargs)
+        return requests.Request("GET",url,params=params).prepare().url
+    return run_sync(_schedule_async(mlbam,season,date,startDate,endDate,gameType,opponentId,**kwargs))
+
+@timing.timed('schedule')
+async def _schedule_async(mlbam=None,season=None,date=None,startDate=None,endDate=None,gameType=None,opponentId=None,**kwargs) -> pd.DataFrame:
+    url, params, tz = _schedule_request(mlbam,season,date,startDate,endDate,gameType,opponentId,**kwargs)
+    resp = await client.request(url,params=params)
+
+    if kwargs.get('log') is True:
+        print("\n================")
+        print(resp.url)
+        print("================\n")
 
+    data = resp.json()
+    with timing.phase('parse'):
+        parsed_data = parsing._parse_schedule_data(json_response=data,selected_timezone=tz)
+    with timing.phase('frame'):
+        df = pd.DataFrame(data=parsed_data)
+    official_dt_col = pd.to_datetime(df["date_official"] + " " + df["game_start"],format=r"%Y-%m-%d %I:%M %p")
+    df.insert(0,"official_dt",official_dt_col)
+    return df
+
+def _schedule_request(mlbam=None,season=None,date=None,startDate=None,endDate=None,gameType=None,opponentId=None,**kwargs):
     url = c.BASE + "/schedule?"
 
     params = {
@@ -3651,28 +3759,13 @@ def schedule(mlbam=None,season=None,date=None,startDate=None,endDate=None,gameTy
     elif kwargs.get("oppId") is not None:
         opponentId = kwargs["oppId"]
     if opponentId is not None:
-        params["opponentId"] = None
+        params["opponentId"] = opponentId
 
     if kwargs.get("hydrate") is not None:
         hydrate = kwargs["hydrate"]
         params["hydrate"] = hydrate
     
-    if kwargs.get('url_only'):
-        req = requests.Request("GET",url,params=params)
-        prepared_url = req.prepare().url
-        return prepared_url
-    resp = requests.get(url,params=params)
-
-    if kwargs.get('log') is True:
-        print("\n================")
-        print(resp.url)
-        print("================\n")
-
-    parsed_data = parsing._parse_schedule_data(json_response=resp.json(),selected_timezone=tz)
-    df = pd.DataFrame(data=parsed_data)
-    official_dt_col = pd.to_datetime(df["date_official"] + " " + df["game_start"],format=r"%Y-%m-%d %I:%M %p")
-    df.insert(0,"official_dt",official_dt_col)
-    return df
+    return url, params, tz
 
 def games_today():
     date_str = dt.datetime.today().strftime(r'%Y-%m-%d')
@@ -3793,7 +3886,7 @@ def game_highlights(
         print("One of params, 'date' or 'season' must be utilized")
         return None
 
-    resp = requests.get(url)
+    resp = client.get(url)
 
     sched = resp.json()
 
@@ -3872,7 +3965,7 @@ def get_video_link(playID:str,broadcast=None) -> str:
         url = f"https://baseballsavant.mlb.com/sporty-videos?playId={playID}&videoType={broadcast}"
     else:
         url = f"https://baseballsavant.mlb.com/sporty-videos?playId={playID}"
-    resp = requests.get(url)
+    resp = client.get(url)
     soup = bs(resp.text,'lxml')
     video_tag = soup.find("video",id="sporty")
     video_source = video_tag.find("source")["src"]
@@ -3888,24 +3981,23 @@ def player_bio(mlbam:int):
     
     """
     # URL to Player's Baseball-Reference page
-    with requests.session() as sesh:
-        url = f"https://www.baseball-reference.com/redirect.fcgi?player=1&mlb_ID={mlbam}"
+    url = f"https://www.baseball-reference.com/redirect.fcgi?player=1&mlb_ID={mlbam}"
 
-        resp = sesh.get(url)
+    resp = client.get(url)
 
-        soup = bs(resp.text,'lxml')
+    soup = bs(resp.text,'lxml')
 
-        # URL to Player's "Bullpen" page
-        url = soup.find('a',text='View Player Info')['href']
+    # URL to Player's "Bullpen" page
+    url = soup.find('a',text='View Player Info')['href']
 
-        resp = sesh.get(url)
+    resp = client.get(url)
 
-        soup = bs(resp.text,'lxml')
+    soup = bs(resp.text,'lxml')
 
-        bio_p_tags = soup.find("span",id="Biographical_Information"
-                               ).findParent('h2').find_next_siblings('p')
+    bio_p_tags = soup.find("span",id="Biographical_Information"
+                           ).findParent('h2').find_next_siblings('p')
 
-        return bio_p_tags
+    return bio_p_tags
 
 def free_agents(
     season:Optional[int]=None,
@@ -3937,7 +4029,7 @@ def free_agents(
         params['hydrate'] = 'person'
     
     url = f"{c.BASE}/people/freeAgents"
-    resp = requests.get(url,params=params)
+    resp = client.get(url,params=params)
     
     data = []
     for fa in resp.json()['freeAgents']:
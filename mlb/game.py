@@ -1,4 +1,3 @@
-import requests
 import datetime as dt
 from dateutil.parser import parse
 
@@ -9,10 +8,24 @@ from . import helpers
 from . import objects as objs
 from . import constants as c
 from . import mlb_dataclasses as dclass
+from .async_mlb import client
+from .async_mlb import timing
 
 md = objs.MlbDate
 mdt = objs.MlbDatetime
 
+def _feed_request(game_pk,timecode=None):
+    """URL and query parameters for a game's live feed"""
+    if timecode == '':
+        timecode = None
+    if timecode is not None and timecode.find('_') == -1:
+        timecode = parse(timecode).strftime(r'%Y%m%d_%H%M%S')
+
+    game_url = f'https://statsapi.mlb.com/api/v1.1/game/{game_pk}/feed/live?'
+    params = {'hydrate':'venue,flags,preState',
+              'timecode':timecode}
+    return game_url, params
+
 class Game:
     """# Game
 
@@ -88,25 +101,19 @@ class Game:
         returns a dictionary of notable attributes about the game
     """
 
-    def __init__(self,game_pk, timecode=None, tz='et'):
+    @timing.timed('Game')
+    def __init__(self,game_pk, timecode=None, tz='et', **kwargs):
         self.last_updated = dt.datetime.now()
-        if timecode == '':
-            timecode = None
-        if timecode is not None and timecode.find('_') == -1:
-            timecode = parse(timecode).strftime(r'%Y%m%d_%H%M%S')
         
         tz_obj = objs.get_tz(tz)
         self._tz = tz
         
         self.__game_pk = game_pk
 
-        c.BASE = 'https://statsapi.mlb.com/api'
-        
-        game_url = f'{c.BASE}/v1.1/game/{game_pk}/feed/live?'
-        params = {'hydrate':'venue,flags,preState',
-                  'timecode':timecode}
-
-        gm = requests.get(game_url,params=params).json()
+        gm = kwargs.get('_data')
+        if gm is None:
+            game_url, params = _feed_request(game_pk,timecode)
+            gm = client.get(game_url,params=params).json()
         self._raw_game_data = gm
 
         self.meta = gm['metaData']
@@ -1924,7 +1931,7 @@ class Game:
 
     def get_content(self):
         url = c.BASE + f'/game/{self.gamePk}/content'
-        resp = requests.get(url)
+        resp = client.get(url)
         return resp.json()
 
     def raw_feed_data(self):
@@ -1936,7 +1943,7 @@ class Game:
             url = f'https://statsapi.mlb.com/api/v1.1/game/{self.gamePk}/feed/live?timecode={timecode}'
         else:
             url = f'https://statsapi.mlb.com/api/v1.1/game/{self.gamePk}/feed/live'
-        resp = requests.get(url)
+        resp = client.get(url)
         return resp.json()
 
     def context_splits(self, batterID, pitcherID):  
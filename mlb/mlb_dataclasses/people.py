@@ -91,7 +91,7 @@ class Person:
         return Person(
             mlbam=_json.get('id',0),
             name=PersonName(
-                    mlbam=_json.get("mlbam"),
+                    mlbam=_json.get("id"),
                     full=_json.get("fullName"),
                     given=_json.get("fullFMLName"),
                     first=_json.get("firstName"),
@@ -111,8 +111,8 @@ class Person:
                 _json.get('batSide',{}).get('code'),
                 _json.get('batSide',{}).get('description')),
             pitch_hand=Dexterity(
-                _json.get('batSide',{}).get('code'),
-                _json.get('batSide',{}).get('description')),
+                _json.get('pitchHand',{}).get('code'),
+                _json.get('pitchHand',{}).get('description')),
             position=Position(pos.get('code'),pos.get('name'),
                               pos.get('type'),pos.get(c.ABBRV)
                               ),
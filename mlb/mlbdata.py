@@ -1,91 +1,311 @@
+import io
 import os
 import json
+import sqlite3
+import functools
+import threading
 import datetime as dt
+from typing import Callable, Optional
 
 import pandas as pd
-# from sqlalchemy import create_engine
 
 from .paths import *
+from . import columnar
+from .database import database, TABLES
+from .teamindex import TeamIndex
+from .seasoncalendar import SeasonCalendar
+
+# Reference frames are read once per process and kept until their file
+# changes (its mtime or size), or until `invalidate()` is called for it.
+# Callers get a copy-on-write view, so changing a returned frame never changes
+# the cached one.
+_frames = {}
+_frames_lock = threading.Lock()
+_frame_stats = {'hits': 0, 'misses': 0}
+
+def _stamp(paths:tuple) -> tuple:
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            stamps.append(None)
+            continue
+        stamps.append((st.st_mtime_ns,st.st_size))
+    return tuple(stamps)
+
+def _view(df:pd.DataFrame) -> pd.DataFrame:
+    if not isinstance(df,pd.DataFrame):
+        # immutable lookup structures (e.g. `TeamIndex`) are shared as is
+        return df
+    if int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True:
+        return df.copy(deep=False)
+    return df.copy()
+
+def _cached(key,paths:tuple,read:Callable[[],pd.DataFrame]) -> pd.DataFrame:
+    """Frame built by `read()`, memoized until one of `paths` changes"""
+    stamp = _stamp(paths)
+    with _frames_lock:
+        entry = _frames.get(key)
+        if entry is not None and entry[1] == stamp:
+            _frame_stats['hits'] += 1
+            return _view(entry[2])
+        _frame_stats['misses'] += 1
+    df = read()
+    with _frames_lock:
+        _frames[key] = (paths,stamp,df)
+    return _view(df)
+
+def _memoized(*paths:str):
+    """Memoize a reader of the package's data files (see `_cached`)"""
+    def decorator(fn:Callable[[],pd.DataFrame]):
+        @functools.wraps(fn)
+        def wrapper() -> pd.DataFrame:
+            return _cached(fn,paths,fn)
+        return wrapper
+    return decorator
+
+def invalidate(path:Optional[str]=None):
+    """Drop the memoized frames read from `path` (every frame if omitted)
+
+    The `updatedb.update_*` functions call this after rewriting a file.
+    """
+    with _frames_lock:
+        if path is None:
+            _frames.clear()
+            return
+        path = os.path.abspath(path)
+        for key in [k for k, v in _frames.items() if path in map(os.path.abspath,v[0])]:
+            del _frames[key]
+
+def cache_stats() -> dict:
+    """Hits and misses of the memoized frames, and the number kept"""
+    with _frames_lock:
+        return {**_frame_stats,'frames': len(_frames)}
+
+# dtypes that differ from what the CSV reader infers
+_DTYPES = {
+    TEAMS_CSV: {'mlbam':'int32','season':'int32','venue_mlbam':'int32'},
+    PEOPLE_CSV: {'mlbam':'int32','year_debut':'int32','year_recent':'int32'},
+    VENUES_CSV: {'mlbam':'int32','tz_offset':'int32'},
+    BBREF_DATA_CSV: {'mlb_ID':'int32'},
+}
+
+# tables loaded from a columnar copy (see `columnar`), written on first load.
+# The smaller CSVs (venues, seasons, leagues...) parse faster than a copy
+# loads, so they are always read directly.
+COLUMNAR_TABLES = [PEOPLE_CSV,COACHES_MASTER_CSV,BBREF_DATA_CSV,STANDINGS_CSV,TEAMS_CSV,YBY_RECORDS_CSV]
+
+def _read_table(path:str,columns:Optional[list]=None,index_col=False) -> pd.DataFrame:
+    dtype = _DTYPES.get(path)
+    if path not in COLUMNAR_TABLES:
+        df = pd.read_csv(path,index_col=index_col,usecols=columns,dtype=dtype)
+        return df if columns is None else df[list(columns)]
+    source = columnar.find(path)
+    if source is not None:
+        df = columnar.read(source,columns)
+        if dtype:
+            df = df.astype({k:v for k, v in dtype.items() if k in df.columns})
+        return df
+    df = pd.read_csv(path,index_col=False,dtype=dtype)
+    try:
+        columnar.write(df,columnar.path_for(path),source=path)
+    except OSError:
+        # read-only install: parse the CSV every time
+        pass
+    return df if columns is None else df[list(columns)]
+
+def _table(path:str,columns:Optional[list]=None,index_col=False) -> pd.DataFrame:
+    """A bundled table, from its columnar copy (see `columnar`) for the
+    `COLUMNAR_TABLES` and from the CSV otherwise
+
+    `columns` limits the load to those columns (in that order).
+    """
+    if columns is not None:
+        columns = tuple(columns)
+    paths = (path,) + (columnar.candidates(path) if path in COLUMNAR_TABLES else ())
+    return _cached(('table',path,columns,index_col),paths,lambda: _read_table(path,columns,index_col))
+
+def write_columnar(path:str) -> str:
+    """Write the columnar copy of the bundled CSV at `path`; returns its path
 
-def get(df_title) -> pd.DataFrame:
-    return pd.read_csv(DATA_DIR + f"{df_title}.csv",index_col=False)
+    The CSV is read the way `mlbdata` reads it, so both sources load as the
+    same frame.
+    """
+    dest = columnar.path_for(path)
+    columnar.write(pd.read_csv(path,index_col=False,dtype=_DTYPES.get(path)),dest,source=path)
+    invalidate(path)
+    return dest
+
+def _filter(df:pd.DataFrame,where:dict) -> pd.DataFrame:
+    # `database.select()` semantics on a loaded frame
+    mask = pd.Series(True,index=df.index)
+    for col, value in where.items():
+        if isinstance(value,tuple):
+            low, high = value
+            if low is not None:
+                mask &= df[col] >= low
+            if high is not None:
+                mask &= df[col] <= high
+        elif isinstance(value,(list,set,frozenset)):
+            mask &= df[col].isin(list(value))
+        elif value is None:
+            mask &= df[col].isna()
+        else:
+            mask &= df[col] == value
+    return df[mask].reset_index(drop=True)
+
+def _query(name:str,where:dict,columns:Optional[list]=None) -> pd.DataFrame:
+    """Rows of a bundled table matching `where` (see `database.select`)
+
+    Answered by an indexed query on the local database; if that can't be
+    used (e.g. a read-only install), the whole table is loaded and filtered.
+    """
+    where = {k:v for k, v in where.items() if v is not None}
+    try:
+        return database.select(name,where,columns)
+    except (sqlite3.Error,OSError):
+        load = None if columns is None else list(dict.fromkeys([*columns,*where]))
+        df = _filter(_table(TABLES[name].csv,load),where)
+        return df if columns is None else df[list(columns)]
+
+def get(df_title,columns:Optional[list]=None) -> pd.DataFrame:
+    return _table(DATA_DIR + f"{df_title}.csv",columns)
 
-def get_teams_df(year=None) -> pd.DataFrame:
+def get_teams_df(year=None,columns:Optional[list]=None,mlbam=None) -> pd.DataFrame:
     """Get reference dataframe of all teams in the MLB history
     
     This data details all team IDs and names for every season. A specific
     franchise can be identified by the 'mlbam' or 'franchID' keys.
-    
+
+    Parameters:
+    -----------
+    year : int or tuple, optional
+        only the teams of this season (or of the seasons in an inclusive
+        `(first, last)` range)
+
+    columns : list of str, optional
+        only load these columns
+
+    mlbam : int or list of int, optional
+        only these franchises
+
     """
-    teams_df = pd.read_csv(
-        TEAMS_CSV,
-        index_col=False,
-        dtype={'mlbam':'int32','season':'int32','venue_mlbam':'int32'})
-    if year is None:
-        return teams_df
-    else:
-        df = teams_df
-        df = df[df["season"]==year]
-        return df
+    if year is None and mlbam is None:
+        return _table(TEAMS_CSV,columns)
+    return _query('teams',{'season':year,'mlbam':mlbam},columns)
+
+@_memoized(TEAMS_CSV,*columnar.candidates(TEAMS_CSV))
+def team_index() -> TeamIndex:
+    """Constant-time lookups of team-seasons by `mlbam` and `(mlbam, season)`
+    (see `teamindex.TeamIndex`)"""
+    return TeamIndex(_table(TEAMS_CSV))
+
+def get_standings_df(columns:Optional[list]=None,season=None,team=None) -> pd.DataFrame:
+    """Yearly standings data for each team (dates back to 1876)
+
+    Parameters:
+    -----------
+    columns : list of str, optional
+        only load these columns
+
+    season : int or tuple, optional
+        only this season (or an inclusive `(first, last)` range)
+
+    team : int or list of int, optional
+        only these teams (by 'team_mlbam')
 
-def get_standings_df() -> pd.DataFrame:
-    """Yearly standings data for each team (dates back to 1876)"""
+    """
     try:
-        df = pd.read_csv(STANDINGS_CSV,index_col=False)
-        return df
+        if season is None and team is None:
+            return _table(STANDINGS_CSV,columns)
+        return _query('standings',{'season':season,'team_mlbam':team},columns)
     except Exception as e:
         print(e)
         return None
 
-def get_yby_records(raw=False) -> pd.DataFrame:
+def get_yby_records(raw=False,season=None,team=None) -> pd.DataFrame:
     """Split records for each team
+
+    Parameters:
+    -----------
+    season : int or tuple, optional
+        only this season (or an inclusive `(first, last)` range)
+
+    team : int or list of int, optional
+        only these teams (by 'tm_mlbam')
+
     """
     
     try:
-        df = pd.read_csv(YBY_RECORDS_CSV,index_col=False)
-        return df
+        if season is None and team is None:
+            return _table(YBY_RECORDS_CSV)
+        return _query('yby_records',{'season':season,'tm_mlbam':team})
 
     except Exception as e:
         print(e)
 
-def get_people_df() -> pd.DataFrame:
-    df = pd.read_csv(
-        PEOPLE_CSV,
-        index_col=False,
-        dtype={'mlbam':'int32','year_debut':'int32','year_recent':'int32'})
+def get_people_df(columns:Optional[list]=None,mlbam=None) -> pd.DataFrame:
+    """Get reference dataframe of every player's IDs, names and debut/recent
+    seasons
+
+    Parameters:
+    -----------
+    columns : list of str, optional
+        only load these columns (e.g. ['mlbam','name_first','name_last'])
+
+    mlbam : int or list of int, optional
+        only these people
+
+    """
+    if mlbam is not None:
+        return _query('people',{'mlbam':mlbam},columns)
+    df = _table(PEOPLE_CSV,columns)
     return df
 
-def get_seasons_df() -> pd.DataFrame:
-    try:
-        cols = ['preSeasonStartDate','preSeasonEndDate','seasonStartDate','seasonEndDate','springStartDate','springEndDate','regularSeasonStartDate','regularSeasonEndDate','allStarDate','postSeasonStartDate','postSeasonEndDate','offSeasonStartDate','offSeasonEndDate']
+@_memoized(SEASONS_CSV)
+def _seasons() -> pd.DataFrame:
+    cols = ['preSeasonStartDate','preSeasonEndDate','seasonStartDate','seasonEndDate','springStartDate','springEndDate','regularSeasonStartDate','regularSeasonEndDate','allStarDate','postSeasonStartDate','postSeasonEndDate','offSeasonStartDate','offSeasonEndDate']
 
-        df = pd.read_csv(SEASONS_CSV,index_col=False)
+    df = _read_table(SEASONS_CSV)
 
-        df[cols] = df[cols].apply(pd.to_datetime,format=r"%Y-%m-%d")
-        return df
+    df[cols] = df[cols].apply(pd.to_datetime,format=r"%Y-%m-%d")
+    return df
+
+def get_seasons_df() -> pd.DataFrame:
+    try:
+        return _seasons()
     except Exception as e:
         print(e)
 
-def get_venues_df(active_only=False) -> pd.DataFrame:
+def get_venues_df(active_only=False,mlbam=None) -> pd.DataFrame:
     """Get Dataframe of Venues
     
     Parameters:
     -----------
     active_only : bool, default False
         set to True to retrieve data for only currently active venues
+
+    mlbam : int or list of int, optional
+        only these venues
     
     """
 
-    df = pd.read_csv(
-        VENUES_CSV,
-        index_col=False,
-        dtype={'mlbam':'int32','tz_offset':'int32'})
+    if mlbam is not None:
+        df = _query('venues',{'mlbam':mlbam})
+    else:
+        df = _table(VENUES_CSV)
 
     if active_only is True:
         df = df[df["active"]==True].reset_index(drop=True)
     
     return df
 
+@_memoized(SEASONS_CSV)
+def season_calendar() -> SeasonCalendar:
+    """Season and phase lookups by date (see `seasoncalendar.SeasonCalendar`)"""
+    return SeasonCalendar(_seasons())
+
 def get_season_info(date=None) -> tuple:
     """Get current season in-progress and most recently completed season, 
     given a specified date
@@ -97,69 +317,21 @@ def get_season_info(date=None) -> tuple:
     
     """
     
-    if date is None:
-        current_date = dt.datetime.today()
-        using_pretend = False
-    else:
-        using_pretend = True
-        pretend_current = dt.datetime.strptime(date,r"%m/%d/%Y")
-        current_date = pretend_current
     try:
-
-        df = get_seasons_df()
-        if using_pretend is False:
-            df = df.head(4)
-
-        df = df.rename(columns={'seasonStartDate':'start',
-                                'seasonEndDate':'end'})
-
-        df_dates = df
-        # return df_dates
-
-        for row in range(len(df_dates)):
-            if df_dates.iloc[row].start <= current_date <= df_dates.iloc[row].end:
-                seasonInProgress = current_date.year
-                seasonCompleted = seasonInProgress - 1
-
-                season_info = {'in_progress':seasonInProgress,
-                               'last_completed':seasonCompleted}
-                return season_info
-                # return seasonInProgress, seasonCompleted
-
-        seasonInProgress = None
-
-        for row in range(len(df_dates)):
-            # if df_dates.iloc[row].start.date().year == current_date.year:
-            if df_dates.iloc[row].start.year == current_date.year:
-                curr_year_row = df_dates.iloc[row]
-                # if current_date < curr_year_row.start.date():
-                if current_date < curr_year_row.start:
-                    seasonCompleted = current_date.year - 1
-                    season_info = {'in_progress':seasonInProgress,
-                                   'last_completed':seasonCompleted}
-                    return season_info
-
-                # elif current_date > curr_year_row.end.date():
-                elif current_date > curr_year_row.end:
-                    seasonCompleted = current_date.year
-                    season_info = {'in_progress':seasonInProgress,
-                                   'last_completed':seasonCompleted}
-                    return season_info
-
-                else:
-                    print("Hmm...didn't work. Here is the dataframe again\n")
-                    return df_dates
+        if date is not None:
+            date = dt.datetime.strptime(date,r"%m/%d/%Y").date()
+        return season_calendar().info(date)
 
     except Exception as e:
         print(e)
 
 def get_hall_of_fame() -> pd.DataFrame:
     """Get Hall of Fame Data"""
-    return pd.read_csv(HALL_OF_FAME_CSV,index_col=False)
+    return _table(HALL_OF_FAME_CSV)
 
 def get_broadcasts_df() -> pd.DataFrame:
     """Get Broadcasts data (types, names, ids...)"""
-    return pd.read_csv(BROADCASTS_CSV,index_col=False)
+    return _table(BROADCASTS_CSV)
 
 def get_bbref_data() -> pd.DataFrame:
     """Reference dataframe for all player "Baseball-Reference" (bbref) and 
@@ -170,19 +342,19 @@ def get_bbref_data() -> pd.DataFrame:
     
     """
     
-    return pd.read_csv(BBREF_DATA_CSV,index_col=False,dtype={'mlb_ID':'int32'})
+    return _table(BBREF_DATA_CSV)
 
 def get_bbref_hitting_war_df() -> pd.DataFrame:
-    df = pd.read_csv(BBREF_BATTING_DATA_CSV)
+    df = _table(BBREF_BATTING_DATA_CSV,index_col=None)
     return df
 
 def get_bbref_pitching_war_df() -> pd.DataFrame:
-    df = pd.read_csv(BBREF_PITCHING_DATA_CSV)
+    df = _table(BBREF_PITCHING_DATA_CSV,index_col=None)
     return df
 
 def get_leagues_df() -> pd.DataFrame:
     """Get reference dataframe of all leagues and divisions in the MLB"""
-    df = pd.read_csv(LEAGUES_CSV,index_col=False)
+    df = _table(LEAGUES_CSV)
     return df
         
 def get_teams_from_register_df(match_columns=False) -> pd.DataFrame:
@@ -200,8 +372,10 @@ def get_teams_from_register_df(match_columns=False) -> pd.DataFrame:
         
     """
     
+    from .async_mlb import client
+    
     url = "https://raw.githubusercontent.com/chadwickbureau/baseballdatabank/master/core/Teams.csv"
-    df = pd.read_csv(url,index_col=False)
+    df = pd.read_csv(io.BytesIO(client.get(url).content),index_col=False)
     if match_columns is True:
         df = df.rename(columns={'lgID'})
     return df
@@ -211,7 +385,7 @@ def get_pitch_types_df() -> pd.DataFrame:
     
     NOTE: Not to be confused with 'pitch_codes()'
     """
-    df = pd.read_csv(PITCH_TYPES_CSV,index_col=False)
+    df = _table(PITCH_TYPES_CSV)
     return df
 
 def get_pitch_codes_df() -> pd.DataFrame:
@@ -219,17 +393,34 @@ def get_pitch_codes_df() -> pd.DataFrame:
     
     NOTE: Not to be confused with 'pitch_types()'
     """
-    df = pd.read_csv(PITCH_CODES_CSV,index_col=False)
+    df = _table(PITCH_CODES_CSV)
     return df
   
 def get_event_types_df() -> pd.DataFrame:
     """Event types and their descriptions
     
     """
-    df = pd.read_csv(EVENT_TYPES_CSV,index_col=False)
+    df = _table(EVENT_TYPES_CSV)
     return df
   
-def get_coaches():
-    """Get a year-by-year dataframe of all coaching staff for each team"""
-    df = pd.read_csv(COACHES_MASTER_CSV,index_col=False)
-    return df
\ No newline at end of file
+def get_coaches(columns:Optional[list]=None,season=None,team=None,mlbam=None):
+    """Get a year-by-year dataframe of all coaching staff for each team
+
+    Parameters:
+    -----------
+    columns : list of str, optional
+        only load these columns
+
+    season : int or tuple, optional
+        only this season (or an inclusive `(first, last)` range)
+
+    team : int or list of int, optional
+        only the staffs of these teams (by 'team_mlbam')
+
+    mlbam : int or list of int, optional
+        only these people (by 'person_mlbam')
+
+    """
+    if season is None and team is None and mlbam is None:
+        return _table(COACHES_MASTER_CSV,columns)
+    return _query('coaches',{'season':season,'team_mlbam':team,'person_mlbam':mlbam},columns)
\ No newline at end of file
@@ -10,6 +10,7 @@ from tabulate import tabulate as tab
 
 from . import mlbdata
 from . import mlb_dataclasses as dclass
+from .search import SearchIndex
 
 TEAMS = mlbdata.get_teams_df()
 LEAGUES = mlbdata.get_leagues_df()
@@ -976,6 +977,7 @@ class PlayerStats(MlbWrapper):
 class _teams_data_collection:
     def __init__(self, _df: pd.DataFrame):
         self.__teams_df = _df
+        self.__index = None
         self.__repr = tab(
             self.__teams_df, headers="keys", showindex=False, tablefmt="simple"
         )
@@ -989,23 +991,20 @@ class _teams_data_collection:
     def display(self):
         return self.__teams_df
 
-    def find(self, query: str, season=None):
-        df = self.__teams_df
+    def find(self, query: str, season=None, fuzzy=False):
+        if self.__index is None:
+            self.__index = SearchIndex.build(self.__teams_df["name_full"])
+        df = self.__teams_df.iloc[self.__index.search(query, fuzzy=fuzzy)]
         if season is not None:
             df = df[df["season"] == season]
 
-        query = query.lower()
-        found_data = []
-        for idx, row in df.iterrows():
-            if query in row["name_full"].lower():
-                found_data.append(row)
-
-        return pd.DataFrame(data=found_data).reset_index(drop=True)
+        return df.reset_index(drop=True)
 
 
 class _people_data_collection:
     def __init__(self, _df: pd.DataFrame):
         self.__pdf = _df
+        self.__index = None
         renamed_cols = {
             "pos_abbreviation": "Pos",
             "name_full": "Name",
@@ -1026,18 +1025,14 @@ class _people_data_collection:
     def display(self) -> pd.DataFrame:
         return self.__pdf
 
-    def find(self, name: str, season=None) -> pd.DataFrame:
-        df = self.__pdf
+    def find(self, name: str, season=None, fuzzy=False) -> pd.DataFrame:
+        if self.__index is None:
+            self.__index = SearchIndex.build(self.__pdf["name_full"])
+        df = self.__pdf.iloc[self.__index.search(name, fuzzy=fuzzy)]
         # if season is not None:
         #     df = df[df['season']==season]
 
-        name = name.lower()
-        found_data = []
-        for idx, row in df.iterrows():
-            if name in row["name_full"].lower():
-                found_data.append(row)
-
-        return pd.DataFrame(data=found_data).reset_index(drop=True)
+        return df.reset_index(drop=True)
 
 
 class MlbTeam:
@@ -1179,30 +1174,28 @@ def get_tz(tz):
 # ===============================================================
 # Dataframe functions
 # ===============================================================
+def _team_season(row:pd.Series):
+    return mlbdata.team_index()[row['team_mlbam'],row['season']]
+
 def add_league_attr(row:pd.Series,attr:str):
-    teams = TEAMS[TEAMS['season']==int(row['season'])]
-    tmrow = teams[teams['mlbam']==row['team_mlbam']].iloc[0]
-    lgrow = LEAGUES[LEAGUES['mlbam']==tmrow['lg_mlbam']].iloc[0]
+    tmrow = _team_season(row)
+    lgrow = LEAGUES[LEAGUES['mlbam']==tmrow.lg_mlbam].iloc[0]
     return lgrow[attr]
 
 def add_league_short(row:pd.Series):
-    teams = TEAMS[TEAMS['season']==int(row['season'])]
-    tmrow = teams[teams['mlbam']==row['team_mlbam']].iloc[0]
+    tmrow = _team_season(row)
     return tmrow.lg_abbrv
 
 def add_division_short(row:pd.Series):
-    teams = TEAMS[TEAMS['season']==int(row['season'])]
-    tmrow = teams[teams['mlbam']==row['team_mlbam']].iloc[0]
-    div_mlbam: Union[str,int] = tmrow['div_mlbam']
+    tmrow = _team_season(row)
+    div_mlbam: Union[str,int] = tmrow.div_mlbam
     return league_ref[div_mlbam].short
 
 def add_division_mlbam(row:pd.Series):
-    teams = TEAMS[TEAMS['season']==int(row['season'])]
-    tmrow = teams[teams['mlbam']==row['team_mlbam']].iloc[0]
-    div_mlbam: Union[str,int] = tmrow['div_mlbam']
+    tmrow = _team_season(row)
+    div_mlbam: Union[str,int] = tmrow.div_mlbam
     return div_mlbam
 
 def add_team_attr(row:pd.DataFrame,attr:str,season=None):
-    teams = TEAMS[TEAMS['season']==int(row['season'])]
-    tmrow = teams[teams['mlbam']==row['team_mlbam']].iloc[0]
-    return tmrow[attr]
+    tmrow = _team_season(row)
+    return getattr(tmrow,attr)
@@ -69,6 +69,7 @@ def _parse_league_stats(splits:list[dict]) -> pd.DataFrame:
     league_mlbam_col = []
     div_mlbam_col = []
 
+    teams = mlbdata.team_index()
     for tm in splits:
         season = tm.get("season")
         team_mlbam = tm.get("team",{}).get("id")
@@ -77,13 +78,17 @@ def _parse_league_stats(splits:list[dict]) -> pd.DataFrame:
         season_col.append(season)
         team_mlbam_col.append(team_mlbam)
         team_name_col.append(team_name)
-        team_abbrv_col.append(TEAMS[TEAMS['mlbam']==team_mlbam].iloc[0]['mlbID'])
-        league_mlbam_col.append(TEAMS[TEAMS['mlbam']==team_mlbam].iloc[0]['lg_mlbam'])
-        div_mlbam_col.append(TEAMS[TEAMS['mlbam']==team_mlbam].iloc[0]['div_mlbam'])
+        # the team as it was that season (its latest record if unknown)
+        team_row = teams.get(team_mlbam,season) if season else None
+        if team_row is None:
+            team_row = teams[team_mlbam]
+        team_abbrv_col.append(team_row.mlbID)
+        league_mlbam_col.append(team_row.lg_mlbam)
+        div_mlbam_col.append(team_row.div_mlbam)
 
         tm_stats = tm.get("stat")
 
-        data.append(pd.Series(tm_stats))
+        data.append(tm_stats)
     
     df = pd.DataFrame(data=data,columns=tm_stats.keys()).rename(columns=c.STATDICT)
     
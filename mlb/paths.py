@@ -2,6 +2,10 @@ import os
 
 DATA_DIR                = os.path.join(os.path.dirname(__file__),'data/')
 BASEBALL_DB             = os.path.join('sqlite:///' + os.path.dirname(__file__), 'baseball.db')
+BASEBALL_DB_FILE        = os.path.join(os.path.dirname(__file__), 'baseball.db')
+CACHE_DIR               = os.environ.get('MLB_CACHE_DIR',os.path.join(os.path.expanduser('~'),'.cache','simplestats-mlb'))
+RESPONSE_CACHE_DB       = os.path.join(CACHE_DIR,'responses.db')
+RATE_LIMIT_DB           = os.path.join(CACHE_DIR,'ratelimit.db')
 
 PEOPLE_CSV              = os.path.join(os.path.dirname(__file__),'data/people.csv')
 BIOS_CSV                = os.path.join(os.path.dirname(__file__),'data/bios.csv')
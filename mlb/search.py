@@ -0,0 +1,288 @@
+"""Name search over people, teams and venues
+
+A `SearchIndex` maps every trigram of a table's (lower-cased, accent-free)
+names to the rows containing it, and keeps the names' words sorted, so that
+
+- `search(query)` finds the rows whose name contains `query` by intersecting
+  the posting lists of the query's trigrams and checking only those rows
+- `search(query,fuzzy=True)` ranks rows by exact, prefix and substring
+  matches, then by the share of trigrams they have in common with the query
+  (so 'mike trot' still finds 'Mike Trout')
+- `prefix(query)` finds the rows with a word starting with `query`
+  (type-ahead)
+
+`index('people')` loads the index saved next to the CSV
+(`<table>.search.npz`) on first use. If that file is missing or the CSV has
+changed since, it builds the index and saves it (when the data directory is
+writable); `updatedb` rewrites it along with the CSV. The files are derived,
+so they are not part of the repository.
+
+```
+>>> from mlb import search
+>>> people = search.index('people')
+>>> search.rows('people',people.search('ohtani'))
+>>> people.prefix('ohta',limit=10)                # type-ahead
+>>> people.search('mike trot',fuzzy=True,limit=5)
+```
+"""
+import os
+import unicodedata
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .paths import *
+from . import columnar
+from . import mlbdata
+
+SUFFIX = '.search.npz'
+
+# table -> (CSV, columns joined into the searched name)
+TABLES = {
+    'people': (PEOPLE_CSV,('name_first','name_last')),
+    'teams': (TEAMS_CSV,('name_full',)),
+    'venues': (VENUES_CSV,('name',)),
+}
+
+# minimum share of the query's trigrams a fuzzy match that isn't a substring
+# match must have
+MIN_SIMILARITY = 0.4
+
+_SEP = '\x00'
+
+
+def normalize(text) -> str:
+    """Lower-cased `text` without accents ('Acuña' -> 'acuna')"""
+    if not isinstance(text,str):
+        return ''
+    if not text.isascii():
+        text = ''.join(ch for ch in unicodedata.normalize('NFKD',text) if not unicodedata.combining(ch))
+    return text.casefold()
+
+def _trigrams(text:str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _padded(text:str) -> set:
+    # with the word boundaries (' oh', 'ni '), which typos rarely touch
+    return _trigrams(f" {text} ")
+
+
+class SearchIndex:
+    """Trigram and word-prefix index over a list of names
+
+    Results are row positions (into the list of names the index was built
+    from) as an integer array.
+
+    Parameters:
+    -----------
+    names : list of str
+        the searched text of each row (see `normalize()`; `build()` does it)
+
+    grams, offsets, postings : ndarray
+        sorted distinct trigrams (of the names padded with a space at both
+        ends), and the rows containing `grams[i]` as
+        `postings[offsets[i]:offsets[i + 1]]`
+
+    tokens, token_rows, token_first : ndarray
+        every word of every name, sorted, the row it belongs to and whether
+        it is the name's first word
+
+    """
+    __slots__ = ('names','grams','offsets','postings','gram_counts','tokens','token_rows','token_first')
+    def __init__(self,names:list,grams:np.ndarray,offsets:np.ndarray,postings:np.ndarray,tokens:np.ndarray,token_rows:np.ndarray,token_first:np.ndarray):
+        self.names = names
+        self.grams = grams
+        self.offsets = offsets
+        self.postings = postings
+        self.tokens = tokens
+        self.token_rows = token_rows
+        self.token_first = token_first
+        # distinct trigrams per name, for the similarity score
+        self.gram_counts = np.bincount(postings,minlength=len(names))
+
+    @classmethod
+    def build(cls,texts) -> 'SearchIndex':
+        """Index the names in `texts` (any iterable of str; NaN is empty)"""
+        names = [normalize(text) for text in texts]
+        by_gram = {}
+        tokens = []
+        for row, name in enumerate(names):
+            for gram in _padded(name):
+                by_gram.setdefault(gram,[]).append(row)
+            tokens += [(token,row,i == 0) for i, token in enumerate(name.split())]
+        grams = sorted(by_gram)
+        lengths = [len(by_gram[g]) for g in grams]
+        offsets = np.zeros(len(grams) + 1,dtype=np.int32)
+        np.cumsum(lengths,out=offsets[1:])
+        postings = np.fromiter((row for g in grams for row in by_gram[g]),dtype=np.int32,count=int(offsets[-1]))
+        tokens.sort()
+        return cls(
+            names,
+            np.array(grams,dtype='<U3'),
+            offsets,
+            postings,
+            np.array([t for t, _, _ in tokens],dtype=str),
+            np.array([r for _, r, _ in tokens],dtype=np.int32),
+            np.array([f for _, _, f in tokens],dtype=bool),
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _posting(self,gram:str) -> np.ndarray:
+        i = int(np.searchsorted(self.grams,gram))
+        if i < len(self.grams) and self.grams[i] == gram:
+            return self.postings[self.offsets[i]:self.offsets[i + 1]]
+        return self.postings[:0]
+
+    def _contains(self,query:str) -> np.ndarray:
+        # rows whose name contains `query`, in row order
+        names = self.names
+        if len(query) < 3:
+            return np.fromiter((row for row, name in enumerate(names) if query in name),dtype=np.int32)
+        lists = sorted((self._posting(g) for g in _trigrams(query)),key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows,other,assume_unique=True)
+        # sharing every trigram doesn't make it a substring ('abcab' vs 'cabc')
+        return np.fromiter((row for row in rows.tolist() if query in names[row]),dtype=np.int32)
+
+    def prefix(self,query:str,limit:Optional[int]=None) -> np.ndarray:
+        """Rows with a word starting with `query`, names starting with it
+        first"""
+        query = normalize(query).strip()
+        if not query:
+            return np.arange(len(self.names) if limit is None else min(limit,len(self.names)),dtype=np.int32)
+        words = query.split()
+        lo = int(np.searchsorted(self.tokens,words[-1],side='left'))
+        hi = int(np.searchsorted(self.tokens,words[-1] + '\U0010ffff',side='left'))
+        if len(words) == 1:
+            # names whose first word matches, then the others
+            first = np.unique(self.token_rows[lo:hi][self.token_first[lo:hi]])
+            rows = np.concatenate([first,np.setdiff1d(self.token_rows[lo:hi],first)])
+            return rows if limit is None else rows[:limit]
+        # 'mike tr': the earlier words must match too
+        names = self.names
+        rows = [r for r in np.unique(self.token_rows[lo:hi]).tolist() if all(w in names[r] for w in words[:-1])]
+        rows.sort(key=lambda r: not names[r].startswith(query))
+        rows = np.array(rows,dtype=np.int32)
+        return rows if limit is None else rows[:limit]
+
+    def search(self,query:str,fuzzy:bool=False,limit:Optional[int]=None) -> np.ndarray:
+        """Rows matching `query`
+
+        Parameters:
+        -----------
+        query : str
+            text to look for (case and accents are ignored)
+
+        fuzzy : bool, default False
+            False: rows whose name contains `query`, in row order.
+            True: also rows with a similar name, best matches first
+
+        limit : int, optional
+            return at most this many rows
+
+        """
+        query = normalize(query)
+        if not fuzzy:
+            rows = self._contains(query)
+            return rows if limit is None else rows[:limit]
+        query = query.strip()
+        if len(query) < 3:
+            return self.prefix(query,limit)
+
+        qgrams = _padded(query)
+        lists = [self._posting(g) for g in qgrams]
+        candidates, shared = np.unique(np.concatenate(lists),return_counts=True)
+        # share of the query found in the name; ties go to the name with the
+        # fewest other trigrams (Dice coefficient)
+        similarity = shared / len(qgrams)
+        # a name containing the query has all of its inner trigrams; the
+        # rest only stays if it's similar enough
+        maybe = (shared >= len(_trigrams(query))) | (similarity >= MIN_SIMILARITY)
+        candidates, shared, similarity = candidates[maybe], shared[maybe], similarity[maybe]
+        dice = 2 * shared / (len(qgrams) + self.gram_counts[candidates])
+        names = self.names
+        rank = np.fromiter(
+            ((3 if names[r] == query else 2 if names[r].startswith(query) else 1 if query in names[r] else 0)
+             for r in candidates.tolist()),
+            dtype=np.float64,count=len(candidates))
+        keep = (rank > 0) | (similarity >= MIN_SIMILARITY)
+        candidates, score, dice = candidates[keep], (rank + similarity)[keep], dice[keep]
+        rows = candidates[np.lexsort((-dice,-score))]
+        return rows if limit is None else rows[:limit]
+
+    def save(self,path:str,source:Optional[str]=None):
+        """Write the index to `path` (an '.npz'); `source` is the CSV it was
+        built from (see `columnar.find`)"""
+        joined = _SEP.join(self.names)
+        tmp = path + '.tmp'
+        with open(tmp,'wb') as f:
+            np.savez(f,
+                     names=np.frombuffer(joined.encode('utf-8'),dtype=np.uint8),
+                     count=np.array(len(self.names)),
+                     grams=self.grams,offsets=self.offsets,postings=self.postings,
+                     tokens=self.tokens,token_rows=self.token_rows,token_first=self.token_first,
+                     source=np.array((columnar.fingerprint(source) or '') if source is not None else ''))
+        os.replace(tmp,path)
+
+    @classmethod
+    def load(cls,path:str) -> 'SearchIndex':
+        with np.load(path,allow_pickle=False) as npz:
+            count = int(npz['count'])
+            text = npz['names'].tobytes().decode('utf-8')
+            names = text.split(_SEP) if count else []
+            return cls(names,npz['grams'],npz['offsets'],npz['postings'],npz['tokens'],npz['token_rows'],npz['token_first'])
+
+
+def path_for(csv_path:str) -> str:
+    """Path of the search index of `csv_path`"""
+    return os.path.splitext(csv_path)[0] + SUFFIX
+
+def _texts(df:pd.DataFrame,columns:tuple) -> list:
+    if len(columns) == 1:
+        return df[columns[0]].tolist()
+    parts = [df[col].fillna('').astype(str).tolist() for col in columns]
+    return [' '.join(p for p in values if p) for values in zip(*parts)]
+
+def _build(name:str) -> SearchIndex:
+    csv, columns = TABLES[name]
+    return SearchIndex.build(_texts(mlbdata._table(csv,list(columns)),columns))
+
+def _load(name:str) -> SearchIndex:
+    csv = TABLES[name][0]
+    path = path_for(csv)
+    if os.path.exists(path):
+        with np.load(path,allow_pickle=False) as npz:
+            current = str(npz['source']) == columnar.fingerprint(csv)
+        if current:
+            return SearchIndex.load(path)
+    built = _build(name)
+    try:
+        built.save(path,source=csv)
+    except OSError:
+        # read-only install: keep it in memory only
+        pass
+    return built
+
+def index(name:str) -> SearchIndex:
+    """Search index of table `name` ('people', 'teams' or 'venues'), loaded
+    once and reloaded when its CSV or index file changes"""
+    csv = TABLES[name][0]
+    return mlbdata._cached(('search',name),(csv,path_for(csv)),lambda: _load(name))
+
+def write(name:str) -> str:
+    """Build and save the search index of table `name`; returns its path"""
+    csv = TABLES[name][0]
+    path = path_for(csv)
+    _build(name).save(path,source=csv)
+    mlbdata.invalidate(path)
+    return path
+
+def rows(name:str,positions) -> pd.DataFrame:
+    """Rows of table `name` at the positions returned by a search"""
+    return mlbdata._table(TABLES[name][0]).iloc[positions]
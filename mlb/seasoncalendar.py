@@ -0,0 +1,136 @@
+"""Which season (and which part of it) a date falls in
+
+`SeasonCalendar` is built once from seasons.csv (see
+`mlbdata.season_calendar()`, which rebuilds it when the file changes) and
+answers with a binary search over the sorted season and phase boundaries
+instead of walking the seasons frame row by row. `info()` - what
+`mlbdata.get_season_info()` and `utils.default_season()` return - is also
+memoized for the current day.
+
+```
+>>> import datetime as dt
+>>> from mlb.mlbdata import season_calendar
+>>> cal = season_calendar()
+>>> cal.season_of(dt.date(2021,7,4))
+2021
+>>> cal.phase(dt.date(2021,10,20))
+(2021, 'postseason')
+```
+"""
+import bisect
+import threading
+import datetime as dt
+from typing import Optional
+
+import pandas as pd
+
+# seasons.csv column where each phase starts, in the order they happen
+PHASES = (
+    ('preSeasonStartDate','preseason'),
+    ('springStartDate','spring'),
+    ('regularSeasonStartDate','regular'),
+    ('allStarDate','all_star'),
+    ('postSeasonStartDate','postseason'),
+    ('offSeasonStartDate','offseason'),
+)
+
+_ONE_DAY = dt.timedelta(days=1)
+
+
+def _day(value) -> Optional[dt.date]:
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value,str):
+        return dt.date.fromisoformat(value)
+    if isinstance(value,dt.datetime):
+        return value.date()
+    return value
+
+
+class SeasonCalendar:
+    """Season and phase boundaries of every season in seasons.csv
+
+    Parameters:
+    -----------
+    df : DataFrame
+        the seasons frame (`mlbdata.get_seasons_df()`)
+
+    """
+    __slots__ = ('_starts','_seasons','_ends','_by_year','_phase_days','_phases','_today','_lock')
+    def __init__(self,df:pd.DataFrame):
+        rows = sorted(
+            (_day(start),_day(end),int(season),record)
+            for start, end, season, record in zip(df['seasonStartDate'],df['seasonEndDate'],df['season'],df.to_dict('records'))
+            if _day(start) is not None and _day(end) is not None)
+        self._starts = [r[0] for r in rows]
+        self._ends = [r[1] for r in rows]
+        self._seasons = [r[2] for r in rows]
+        # the (latest) season starting in each calendar year
+        self._by_year = {start.year: start for start, _, _, _ in rows}
+
+        phases = []
+        for _, _, season, record in rows:
+            for order, (column, name) in enumerate(PHASES):
+                day = _day(record.get(column))
+                if day is not None:
+                    phases.append((day,season,order,name))
+            all_star = _day(record.get('allStarDate'))
+            if all_star is not None:
+                phases.append((all_star + _ONE_DAY,season,PHASES.index(('allStarDate','all_star')),'regular'))
+            off_end = _day(record.get('offSeasonEndDate'))
+            if off_end is not None:
+                phases.append((off_end + _ONE_DAY,season,len(PHASES),None))
+        phases.sort(key=lambda p: (p[0],p[1],p[2]))
+        self._phase_days = [p[0] for p in phases]
+        self._phases = [(p[1],p[3]) for p in phases]
+        # (date, info) of the last lookup of today's date
+        self._today = (None,None)
+        self._lock = threading.Lock()
+
+    def season_of(self,date:dt.date) -> Optional[int]:
+        """Season whose start-end window contains `date` (None if none does)"""
+        date = _day(date)
+        i = bisect.bisect_right(self._starts,date) - 1
+        if i >= 0 and date <= self._ends[i]:
+            return self._seasons[i]
+        return None
+
+    def phase(self,date:dt.date) -> Optional[tuple]:
+        """`(season, phase)` on `date`, where phase is one of 'preseason',
+        'spring', 'regular', 'all_star', 'postseason' or 'offseason' (None
+        outside the calendar)"""
+        date = _day(date)
+        i = bisect.bisect_right(self._phase_days,date) - 1
+        if i < 0 or self._phases[i][1] is None:
+            return None
+        return self._phases[i]
+
+    def info(self,date:Optional[dt.date]=None) -> Optional[dict]:
+        """Season in progress and most recently completed season on `date`
+        (default: today), or None if seasons.csv doesn't cover its year
+
+        Only today's answer is kept; other dates are a couple of bisects.
+
+        Returns a dict with keys 'in_progress' (None between seasons) and
+        'last_completed'.
+        """
+        if date is not None:
+            return self._compute(_day(date))
+        today = dt.date.today()
+        with self._lock:
+            day, info = self._today
+        if day != today:
+            info = self._compute(today)
+            with self._lock:
+                self._today = (today,info)
+        return None if info is None else dict(info)
+
+    def _compute(self,date:dt.date) -> Optional[dict]:
+        if self.season_of(date) is not None:
+            return {'in_progress':date.year,'last_completed':date.year - 1}
+        start = self._by_year.get(date.year)
+        if start is None:
+            return None
+        if date < start:
+            return {'in_progress':None,'last_completed':date.year - 1}
+        return {'in_progress':None,'last_completed':date.year}
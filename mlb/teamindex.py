@@ -0,0 +1,85 @@
+"""Constant-time lookups of a team's season record
+
+Parsers that label rows with a team's abbreviation, league or division used
+to filter the ~3,000-row teams frame once per row. `TeamIndex` is built once
+from that frame (see `mlbdata.team_index()`, which rebuilds it when
+teams.csv changes) and maps `mlbam` and `(mlbam, season)` straight to a
+`TeamRecord`. It is read-only, so it can be shared between threads.
+
+```
+>>> from mlb.mlbdata import team_index
+>>> teams = team_index()
+>>> teams.get(145,1992).mlbID
+'CWS'
+>>> teams[145].lg_mlbam        # the team's most recent season
+103
+```
+"""
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+
+class TeamRecord(NamedTuple):
+    """One team-season of teams.csv"""
+    mlbam: int
+    season: int
+    name_full: str
+    name_location: str
+    name_club: str
+    mlbID: str
+    franchID: str
+    bbrefID: str
+    retroID: str
+    file_code: str
+    lg_mlbam: int
+    lg_abbrv: str
+    div_mlbam: int
+    venue_name: str
+    venue_mlbam: int
+    first_year: int
+
+
+class TeamIndex:
+    """Team-seasons keyed by `(mlbam, season)` and by `mlbam` (most recent
+    season)
+
+    Parameters:
+    -----------
+    df : DataFrame
+        the teams frame (`mlbdata.get_teams_df()`)
+
+    """
+    __slots__ = ('_by_season','_latest')
+    def __init__(self,df:pd.DataFrame):
+        columns = [df[field].tolist() for field in TeamRecord._fields]
+        by_season, latest = {}, {}
+        for values in zip(*columns):
+            record = TeamRecord._make(values)
+            by_season.setdefault((record.mlbam,record.season),record)
+            current = latest.get(record.mlbam)
+            if current is None or record.season > current.season:
+                latest[record.mlbam] = record
+        self._by_season = MappingProxyType(by_season)
+        self._latest = MappingProxyType(latest)
+
+    def get(self,mlbam:int,season:Optional[int]=None,default=None) -> Optional[TeamRecord]:
+        """Record of team `mlbam` in `season` (its most recent season if
+        `season` is None); `default` if there is none"""
+        if season is None:
+            return self._latest.get(int(mlbam),default)
+        return self._by_season.get((int(mlbam),int(season)),default)
+
+    def __getitem__(self,key) -> TeamRecord:
+        """`index[mlbam]` or `index[mlbam, season]`"""
+        record = self.get(*key) if isinstance(key,tuple) else self.get(key)
+        if record is None:
+            raise KeyError(key)
+        return record
+
+    def __contains__(self,key) -> bool:
+        return (self.get(*key) if isinstance(key,tuple) else self.get(key)) is not None
+
+    def __len__(self) -> int:
+        return len(self._by_season)
@@ -1,19 +1,86 @@
+import io
+import os
 import json
-import requests
 from typing import Union
 
 import pandas as pd
 import numpy as np
 
 from .paths import *
-from .mlbdata import get_teams_df
+from .mlbdata import get_teams_df, invalidate, write_columnar, COLUMNAR_TABLES
+from .database import database, TABLES
+from . import search
 from .constants import COLS_SEASON
 from .async_mlb import fetch
+from .async_mlb import client
 from .async_mlb import get_updated_records
 from .async_mlb import fetch_coaching_roster
 from .async_mlb import fetch_standings
 from .async_mlb.coaches import roster_json_to_df
+from .async_mlb.scheduler import bulk
 
+# tables that are also loaded into the local database (see `database`)
+DATABASE_TABLES = {t.csv:t.name for t in TABLES.values()}
+
+# tables with a name search index (see `search`)
+SEARCH_TABLES = {csv:name for name, (csv, _) in search.TABLES.items()}
+
+def _save(df:pd.DataFrame,path:str):
+    # the CSV stays the source of truth; its columnar copy, database table
+    # and search index are rebuilt from it
+    df.to_csv(path,index=False)
+    if path in COLUMNAR_TABLES:
+        write_columnar(path)
+    else:
+        invalidate(path)
+    if path in DATABASE_TABLES:
+        database.build(DATABASE_TABLES[path])
+    if path in SEARCH_TABLES:
+        search.write(SEARCH_TABLES[path])
+
+def update_columnar(tables:list=None) -> list:
+    """Rebuild the columnar copies of the bundled CSV files without fetching
+    anything
+
+    Parameters:
+    -----------
+    tables : list of str, optional
+        CSV paths (default: `COLUMNAR_TABLES`)
+
+    Returns the paths written.
+    """
+    return [write_columnar(path) for path in (tables or COLUMNAR_TABLES) if os.path.exists(path)]
+
+def update_search(tables:list=None) -> list:
+    """Rebuild the name search indexes of the bundled CSV files without
+    fetching anything
+
+    Parameters:
+    -----------
+    tables : list of str, optional
+        table names (default: all of `search.TABLES`)
+
+    Returns the paths written.
+    """
+    return [search.write(name) for name in (tables or search.TABLES) if os.path.exists(search.TABLES[name][0])]
+
+def update_database(tables:list=None) -> list:
+    """Rebuild the local database's tables from the bundled CSV files without
+    fetching anything
+
+    Parameters:
+    -----------
+    tables : list of str, optional
+        table names (default: all of `database.TABLES`)
+
+    Returns the names of the tables written.
+    """
+    names = [name for name in (tables or TABLES) if os.path.exists(TABLES[name].csv)]
+    for name in names:
+        database.build(name)
+    return names
+
+@bulk
 def update_people(inplace=True) -> Union[pd.DataFrame,None]:
     """Update 'people' in the library's CSV files
     
@@ -25,7 +92,7 @@ def update_people(inplace=True) -> Union[pd.DataFrame,None]:
         
     """
     url = "https://raw.githubusercontent.com/chadwickbureau/register/master/data/people.csv"
-    df = pd.read_csv(url,low_memory=False)
+    df = pd.read_csv(io.BytesIO(client.get(url).content),low_memory=False)
     
     df = df[["key_mlbam","key_retro","key_bbref","key_bbref_minors","mlb_played_first","mlb_played_last","name_first","name_last","name_given"]]
     df = df.fillna("--")
@@ -56,8 +123,9 @@ def update_people(inplace=True) -> Union[pd.DataFrame,None]:
     if inplace is False:
         return df
     else:
-        df.to_csv(PEOPLE_CSV,index=False)
+        _save(df,PEOPLE_CSV)
         
+@bulk
 def update_yby_records(inplace=True) -> Union[pd.DataFrame,None]:
     """Update yby records in the package's 'baseball.db'
     
@@ -74,8 +142,9 @@ def update_yby_records(inplace=True) -> Union[pd.DataFrame,None]:
     if inplace is False:
         return df
     else:
-        df.to_csv(YBY_RECORDS_CSV,index=False)
+        _save(df,YBY_RECORDS_CSV)
 
+@bulk
 def update_hof(inplace=True) -> Union[pd.DataFrame,None]:
     """Update "Hall Of Fame" data in the library's CSV files
     
@@ -88,7 +157,7 @@ def update_hof(inplace=True) -> Union[pd.DataFrame,None]:
     """
     url = "https://statsapi.mlb.com/api/v1/awards/MLBHOF/recipients?sportId=1&hydrate=results,team"
 
-    response = requests.get(url)
+    response = client.get(url)
     recipients = []
     for r in response.json()["awards"]:
         a_date = r["date"]
@@ -109,8 +178,9 @@ def update_hof(inplace=True) -> Union[pd.DataFrame,None]:
     if inplace is False:
         return df
     else:
-        df.to_csv(HALL_OF_FAME_CSV,index=False)
+        _save(df,HALL_OF_FAME_CSV)
 
+@bulk
 def update_seasons(inplace=True) -> Union[pd.DataFrame,None]:
     """Update 'seasons' data in the library's CSV files
     
@@ -148,7 +218,7 @@ def update_seasons(inplace=True) -> Union[pd.DataFrame,None]:
         
     url = "https://statsapi.mlb.com/api/v1/seasons/all?sportId=1"
     
-    resp = requests.get(url)
+    resp = client.get(url)
 
     data = []
     for s in resp.json()["seasons"]:
@@ -163,8 +233,9 @@ def update_seasons(inplace=True) -> Union[pd.DataFrame,None]:
         df : pd.DataFrame = df
         return df
     else:
-        df.to_csv(SEASONS_CSV,index=False)
+        _save(df,SEASONS_CSV)
 
+@bulk
 def update_venues(inplace=True) -> Union[pd.DataFrame,None]:
     """Update 'venues' data in the library's CSV files
     
@@ -179,7 +250,7 @@ def update_venues(inplace=True) -> Union[pd.DataFrame,None]:
     hydrations = "location,social,timezone,fieldInfo,metadata,images,xrefId,video"
     url = base + f"/venues?hydrate={hydrations}"
 
-    resp = requests.get(url)
+    resp = client.get(url)
 
     venues = resp.json()["venues"]
 
@@ -287,16 +358,17 @@ def update_venues(inplace=True) -> Union[pd.DataFrame,None]:
     if inplace is False:
         return df
     else:
-        df.to_csv(VENUES_CSV,index=False)
+        _save(df,VENUES_CSV)
 
+@bulk
 def update_bbref_data(inplace=True) -> Union[pd.DataFrame,None]:
     url = "https://www.baseball-reference.com/data/war_daily_bat.txt"
-    hit = pd.read_csv(url)
+    hit = pd.read_csv(io.BytesIO(client.get(url).content))
     hit = hit.drop_duplicates(subset='mlb_ID',keep='first')[['name_common','mlb_ID','player_ID']].dropna()
     hit = hit.astype({'mlb_ID':'int32'})
     
     url = "https://www.baseball-reference.com/data/war_daily_pitch.txt"
-    pit = pd.read_csv(url)
+    pit = pd.read_csv(io.BytesIO(client.get(url).content))
     pit = pit.drop_duplicates(subset='mlb_ID',keep='first')[['name_common','mlb_ID','player_ID']].dropna()
     pit = pit.astype({'mlb_ID':'int32'})
     
@@ -305,8 +377,9 @@ def update_bbref_data(inplace=True) -> Union[pd.DataFrame,None]:
     if inplace is False:
         return df.reset_index(drop=True)
     else:
-        df.to_csv(BBREF_DATA_CSV,index=False)
+        _save(df,BBREF_DATA_CSV)
         
+@bulk
 def update_leagues(inplace=True) -> Union[pd.DataFrame,None]:
     """Update 'leagues' data in the library's CSV files
     
@@ -325,9 +398,8 @@ def update_leagues(inplace=True) -> Union[pd.DataFrame,None]:
         [0,'-','-','-','-',0,'-']
     ]
 
-    with requests.session() as sesh:
-        divs_resp = sesh.get(divs_url)
-        lgs_resp = sesh.get(lgs_url)
+    divs_resp = client.get(divs_url)
+    lgs_resp = client.get(lgs_url)
 
     for lg in lgs_resp.json()["leagues"]:
         data.append([
@@ -356,24 +428,27 @@ def update_leagues(inplace=True) -> Union[pd.DataFrame,None]:
     if inplace is False:
         return df
     else:
-        df.to_csv(LEAGUES_CSV,index=False)
+        _save(df,LEAGUES_CSV)
     
+@bulk
 def update_bbref_hitting_war(inplace=True) -> Union[pd.DataFrame,None]:
     url = "https://www.baseball-reference.com/data/war_daily_bat.txt"
-    df = pd.read_csv(url)
+    df = pd.read_csv(io.BytesIO(client.get(url).content))
     if inplace is False:
         return df
     else:
-        df.to_csv(BBREF_BATTING_DATA_CSV,index=False)
+        _save(df,BBREF_BATTING_DATA_CSV)
 
+@bulk
 def update_bbref_pitching_war(inplace=True) -> Union[pd.DataFrame,None]:
     url = "https://www.baseball-reference.com/data/war_daily_pitch.txt"
-    df = pd.read_csv(url)
+    df = pd.read_csv(io.BytesIO(client.get(url).content))
     if inplace is False:
         return df
     else:
-        df.to_csv(BBREF_PITCHING_DATA_CSV,index=False)
+        _save(df,BBREF_PITCHING_DATA_CSV)
 
+@bulk
 def update_pitch_types(inplace=True) -> Union[pd.DataFrame,None]:
     """Update 'pitch_types' in the library's CSV files
     
@@ -385,7 +460,7 @@ def update_pitch_types(inplace=True) -> Union[pd.DataFrame,None]:
         
     """
     url = 'https://statsapi.mlb.com/api/v1/pitchTypes'
-    resp = requests.get(url)
+    resp = client.get(url)
     data = []
     for p in resp.json():
         data.append({'code':p['code'],'description':p['description']})
@@ -396,8 +471,9 @@ def update_pitch_types(inplace=True) -> Union[pd.DataFrame,None]:
     if inplace is not True:
         return df
     
-    df.to_csv(PITCH_TYPES_CSV,index=False)
+    _save(df,PITCH_TYPES_CSV)
     
+@bulk
 def update_pitch_codes(inplace=True) -> Union[pd.DataFrame,None]:
     """Update 'pitch_codes' in the library's CSV files
     
@@ -409,7 +485,7 @@ def update_pitch_codes(inplace=True) -> Union[pd.DataFrame,None]:
         
     """
     url = 'https://statsapi.mlb.com/api/v1/pitchCodes'
-    resp = requests.get(url)
+    resp = client.get(url)
     data = []
     for p in resp.json():
         data.append({'code':p['code'],'description':p['description']})
@@ -420,8 +496,9 @@ def update_pitch_codes(inplace=True) -> Union[pd.DataFrame,None]:
     if inplace is False:
         return df
     
-    df.to_csv(PITCH_CODES_CSV,index=False)
+    _save(df,PITCH_CODES_CSV)
     
+@bulk
 def update_event_types(inplace=True) -> Union[pd.DataFrame,None]:
     """Update 'event_types' in the library's CSV files
     
@@ -433,7 +510,7 @@ def update_event_types(inplace=True) -> Union[pd.DataFrame,None]:
         
     """
     url = 'https://statsapi.mlb.com/api/v1/eventTypes'
-    resp = requests.get(url)
+    resp = client.get(url)
     data = []
     for e in resp.json():
         e_type_data = {'code':e['code'],
@@ -449,8 +526,9 @@ def update_event_types(inplace=True) -> Union[pd.DataFrame,None]:
     if inplace is False:
         return df
     
-    df.to_csv(EVENT_TYPES_CSV,index=False)
+    _save(df,EVENT_TYPES_CSV)
 
+@bulk
 def update_standings(inplace=True,**kwargs) -> Union[pd.DataFrame,None]:
     """Update the year-by-year standings.
     
@@ -464,10 +542,11 @@ def update_standings(inplace=True,**kwargs) -> Union[pd.DataFrame,None]:
     df.sort_values(by=['season','sport_rank'],ascending=[False,True],inplace=True)
     df.reset_index(drop=True)
     if inplace:
-        df.to_csv(STANDINGS_CSV,index=False)
+        _save(df,STANDINGS_CSV)
         return None
     return df
 
+@bulk
 def update_coaches():
     """Update the coaching rosters
     
@@ -479,4 +558,4 @@ def update_coaches():
     """
     responses = fetch_coaching_roster()
     df = roster_json_to_df(responses)
-    df.to_csv(COACHES_MASTER_CSV,index=False)
+    _save(df,COACHES_MASTER_CSV)
@@ -1,5 +1,4 @@
 import platform
-import requests
 import pandas as pd
 import datetime as dt
 from dateutil import tz
@@ -19,6 +18,7 @@ from .constants import (
 )
 
 from .mlbdata import get_season_info
+from .async_mlb import client
 
 today_date = dt.datetime.today()
 
@@ -817,7 +817,7 @@ class metadata:
     def baseball_stats(df=False) -> Union[List[Dict], pd.DataFrame]:
         url = "https://statsapi.mlb.com/api/v1/baseballStats"
         data = []
-        resp = requests.get(url)
+        resp = client.get(url)
         if df is True:
             for d in resp.json():
                 stat_groups = []
@@ -862,7 +862,7 @@ class metadata:
     def league_leader_types(df=False) -> Union[list, pd.DataFrame]:
         url = "https://statsapi.mlb.com/api/v1/leagueLeaderTypes"
         data = []
-        resp = requests.get(url)
+        resp = client.get(url)
         for i in resp.json():
             data.append(i["displayName"])
         return data
@@ -870,7 +870,7 @@ class metadata:
     def stat_groups(df=False) -> Union[list, pd.DataFrame]:
         url = "https://statsapi.mlb.com/api/v1/statGroups"
         data = []
-        resp = requests.get(url)
+        resp = client.get(url)
         for i in resp.json():
             data.append(i["displayName"])
         if df is True:
@@ -880,7 +880,7 @@ class metadata:
     def stat_types(df=False) -> Union[list, pd.DataFrame]:
         url = "https://statsapi.mlb.com/api/v1/statTypes"
         data = []
-        resp = requests.get(url)
+        resp = client.get(url)
         for i in resp.json():
             data.append(i["displayName"])
         return data
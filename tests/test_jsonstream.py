@@ -0,0 +1,104 @@
+import json
+import asyncio
+
+import pytest
+
+from mlb.async_mlb import schedules
+from mlb.async_mlb.jsonstream import ArrayItems
+
+SCHEDULE = {
+    "copyright": "Copyright 2023 MLB Advanced Media, L.P.",
+    "totalItems": 2,
+    "wait": 10.5,
+    "ratio": -1.25e-3,
+    "dates": [
+        {"date": "2023-04-01", "totalGames": 1, "games": [{
+            "gamePk": 718780,
+            "teams": {
+                "away": {"team": {"id": 145}, "score": 3, "leagueRecord": {"wins": 1, "losses": 0, "pct": "1.000"}},
+                "home": {"team": {"id": 116}, "score": 2, "leagueRecord": {"wins": 0, "losses": 1, "pct": ".000"}},
+            },
+            "venue": {"id": 2394, "name": "Comerica Park"},
+            "weather": {"temp": "41", "wind": "8 mph, Out To CF"},
+            "gameInfo": {"attendance": 44680, "gameDurationMinutes": 150},
+            "isTie": False,
+            "rescheduleDate": None,
+        }]},
+        {"date": "2023-04-02", "totalGames": 1, "games": [{
+            "gamePk": 718781,
+            "venue": {"id": 4169, "name": "Estadio Alfredo Harp Helú"},
+            "linescore": {"innings": [], "era": 3.5e1, "delta": -0.75},
+            "isTie": True,
+        }]},
+        1.5,
+        -2e10,
+        0,
+        True,
+        None,
+    ],
+    "trailer": [1.0, {"x": False}],
+}
+BODY = json.dumps(SCHEDULE,ensure_ascii=False).encode('utf-8')
+COMPACT = json.dumps(SCHEDULE,ensure_ascii=False,separators=(',',':')).encode('utf-8')
+
+
+def _decode(chunks,key='dates'):
+    items = ArrayItems(key)
+    decoded = []
+    for chunk in chunks:
+        decoded += items.feed(chunk)
+    items.close()
+    return decoded
+
+
+@pytest.mark.parametrize('body',[BODY,COMPACT])
+def test_split_at_every_offset(body):
+    for i in range(len(body) + 1):
+        assert _decode([body[:i],body[i:]]) == SCHEDULE['dates'], i
+
+
+def test_split_into_bytes():
+    assert _decode([COMPACT[i:i + 1] for i in range(len(COMPACT))]) == SCHEDULE['dates']
+
+
+@pytest.mark.parametrize('head,tail,value',[
+    (b'1.',b'5]}',1.5),
+    (b'-',b'2]}',-2),
+    (b'1e',b'3]}',1e3),
+    (b'1.5',b'0 ]}',1.5),
+    (b'1',b'2]}',12),
+    (b'tru',b'e]}',True),
+    (b'nul',b'l]}',None),
+])
+def test_scalar_at_chunk_end_waits(head,tail,value):
+    items = ArrayItems('v')
+    assert items.feed(b'{"v":[' + head) == []
+    assert items.feed(tail) == [value]
+    assert items.done
+
+
+def test_other_key_number_at_chunk_end():
+    items = ArrayItems('dates')
+    assert items.feed(b'{"wait":1.') == []
+    assert items.feed(b'5,"dates":[2]}') == [2]
+
+
+def test_missing_key():
+    assert _decode([b'{"a":[1,2],"b":', b'{}}']) == []
+
+
+@pytest.mark.parametrize('cut',[1,len(COMPACT) // 2,len(COMPACT) - len(b',"trailer":[1.0,{"x":false}]}') - 1])
+def test_truncated_body_raises(cut):
+    items = ArrayItems('dates')
+    items.feed(COMPACT[:cut])
+    with pytest.raises(ValueError):
+        items.close()
+
+
+def test_stream_schedule_truncated(monkeypatch):
+    async def stream(url,**kwargs):
+        yield COMPACT[:len(COMPACT) // 2]
+
+    monkeypatch.setattr(schedules,'stream',stream)
+    with pytest.raises(ValueError):
+        asyncio.run(schedules.stream_schedule('https://statsapi.mlb.com/api/v1/schedule'))
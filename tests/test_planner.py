@@ -0,0 +1,128 @@
+import copy
+import itertools
+
+from mlb.constants import BASE
+from mlb.async_mlb.planner import StatsQuery, QueryPlan
+
+MLBAM, SEASON = 145, 2023
+ROSTER = f"/teams/{MLBAM}/roster/40Man"
+SEASON_ARGS = {'season':SEASON}
+SPLITS_ARGS = {'sitCodes':['sp','rp'],'season':SEASON}
+TEAM = f"{BASE}/teams/{MLBAM}?season={SEASON}&hydrate=standings"
+
+
+def _team_items():
+    # what `functions._team_data_async` plans
+    items = [
+        TEAM,
+        StatsQuery(ROSTER,['season'],['hitting'],SEASON_ARGS,'person',SEASON_ARGS),
+        StatsQuery(ROSTER,['season'],['pitching'],SEASON_ARGS,'person',SEASON_ARGS),
+        StatsQuery(ROSTER,['season'],['fielding'],SEASON_ARGS,'person',SEASON_ARGS),
+        StatsQuery(ROSTER,['seasonAdvanced'],['hitting'],SEASON_ARGS,'person',SEASON_ARGS),
+        StatsQuery(ROSTER,['seasonAdvanced'],['pitching'],SEASON_ARGS,'person',SEASON_ARGS),
+        StatsQuery(ROSTER,['statSplits'],['pitching'],SEASON_ARGS,'person',SPLITS_ARGS),
+        StatsQuery(ROSTER,['statSplitsAdvanced'],['pitching'],SEASON_ARGS,'person',SPLITS_ARGS),
+    ]
+    for gt in ('S','R','P'):
+        for group in ('hitting','pitching','fielding'):
+            items.append(StatsQuery(f"/teams/{MLBAM}/stats",['season','seasonAdvanced'],[group],{'gameType':gt,'season':SEASON}))
+    return items
+
+# the URLs `_team_data` requested before the planner
+ORIGINAL_URLS = [
+    TEAM,
+    f"{BASE}/teams/{MLBAM}/roster/40Man?season={SEASON}&hydrate=person(stats(type=[season],group=[hitting],season={SEASON}))",
+    f"{BASE}/teams/{MLBAM}/roster/40Man?season={SEASON}&hydrate=person(stats(type=[season],group=[pitching],season={SEASON}))",
+    f"{BASE}/teams/{MLBAM}/roster/40Man?season={SEASON}&hydrate=person(stats(type=[season],group=[fielding],season={SEASON}))",
+    f"{BASE}/teams/{MLBAM}/roster/40Man?season={SEASON}&hydrate=person(stats(type=[seasonAdvanced],group=[hitting],season={SEASON}))",
+    f"{BASE}/teams/{MLBAM}/roster/40Man?season={SEASON}&hydrate=person(stats(type=[seasonAdvanced],group=[pitching],season={SEASON}))",
+    f"{BASE}/teams/{MLBAM}/roster/40Man?season={SEASON}&hydrate=person(stats(type=[statSplits],group=[pitching],sitCodes=[sp,rp],season={SEASON}))",
+    f"{BASE}/teams/{MLBAM}/roster/40Man?season={SEASON}&hydrate=person(stats(type=[statSplitsAdvanced],group=[pitching],sitCodes=[sp,rp],season={SEASON}))",
+] + [
+    f"{BASE}/teams/{MLBAM}/stats?stats=season,seasonAdvanced&group={group}&gameType={gt}&season={SEASON}"
+    for gt in ('S','R','P') for group in ('hitting','pitching','fielding')
+]
+
+
+def _stat(stat_type,group,owner):
+    return {'type':{'displayName':stat_type},'group':{'displayName':group},'splits':[{'stat':{'owner':owner,'type':stat_type,'group':group}}]}
+
+# which groups each player has stats for
+PLAYERS = {1:('hitting','fielding'),2:('pitching','fielding'),3:('hitting','pitching','fielding'),4:()}
+
+def _roster(types,groups):
+    # a stand-in for the API: a player's 'stats' lists every requested
+    # type/group they have, and is left out when there are none
+    roster = []
+    for pid, has in PLAYERS.items():
+        person = {'id':pid,'fullName':f"Player {pid}"}
+        stats = [_stat(t,g,pid) for t, g in itertools.product(types,groups) if g in has]
+        if stats:
+            person['stats'] = stats
+        roster.append({'person':person,'jerseyNumber':str(pid),'status':{'code':'A'}})
+    return {'copyright':'', 'roster':roster, 'teamId':MLBAM, 'rosterType':'40Man'}
+
+def _team_stats(types,groups):
+    return {'copyright':'', 'stats':[_stat(t,g,MLBAM) for t, g in itertools.product(types,groups)]}
+
+def _serve(query,types,groups):
+    return (_roster if query.hydrate else _team_stats)(types,groups)
+
+
+def test_team_plan_keeps_original_urls():
+    plan = QueryPlan(_team_items())
+    assert [plan.url_of(i) for i in range(len(plan))] == ORIGINAL_URLS
+
+
+def test_team_plan_merges_requests():
+    plan = QueryPlan(_team_items())
+    assert len(plan) == 17
+    assert plan.urls == [
+        TEAM,
+        f"{BASE}/teams/{MLBAM}/roster/40Man?season={SEASON}&hydrate=person(stats(type=[season,seasonAdvanced],group=[hitting,pitching,fielding],season={SEASON}))",
+        f"{BASE}/teams/{MLBAM}/roster/40Man?season={SEASON}&hydrate=person(stats(type=[statSplits,statSplitsAdvanced],group=[pitching],sitCodes=[sp,rp],season={SEASON}))",
+    ] + [
+        f"{BASE}/teams/{MLBAM}/stats?stats=season,seasonAdvanced&group=hitting,pitching,fielding&gameType={gt}&season={SEASON}"
+        for gt in ('S','R','P')
+    ]
+    # every item is served by a request with its own path and parameters
+    for i, item in enumerate(plan.items):
+        if isinstance(item,StatsQuery):
+            assert plan.urls[plan.request_of(i)].startswith(f"{BASE}{item.path}?")
+
+
+def test_team_plan_splits_payloads():
+    plan = QueryPlan(_team_items())
+    # the queries each request serves, then what the API returns for it
+    served = {}
+    for i, item in enumerate(plan.items):
+        if isinstance(item,StatsQuery):
+            served.setdefault(plan.request_of(i),[]).append(item)
+    merged = {}
+    for idx, queries in served.items():
+        types = list(dict.fromkeys(t for q in queries for t in q.types))
+        groups = list(dict.fromkeys(g for q in queries for g in q.groups))
+        merged[idx] = _serve(queries[0],types,groups)
+    shared = copy.deepcopy(merged)
+
+    for i, item in enumerate(plan.items):
+        if not isinstance(item,StatsQuery):
+            assert plan.payload(i,{'teams':[]}) == {'teams':[]}
+            continue
+        assert plan.payload(i,merged[plan.request_of(i)]) == _serve(item,item.types,item.groups), ORIGINAL_URLS[i]
+    # splitting never changes the (possibly shared) merged payloads
+    assert merged == shared
+
+
+def test_split_passes_through_unexpected_payloads():
+    hydrated = StatsQuery(ROSTER,['season'],['hitting'],SEASON_ARGS,'person',SEASON_ARGS)
+    stats = StatsQuery(f"/teams/{MLBAM}/stats",['season'],['hitting'])
+    error = {'messageNumber':1,'message':'Object not found'}
+    assert hydrated.split(error) is error
+    assert stats.split(error) is error
+
+
+def test_plain_urls_and_duplicates():
+    plan = QueryPlan([TEAM,TEAM,StatsQuery('/teams/1/stats',['season'],['hitting']),StatsQuery('/teams/2/stats',['season'],['hitting'])])
+    assert plan.urls == [TEAM,f"{BASE}/teams/1/stats?stats=season&group=hitting",f"{BASE}/teams/2/stats?stats=season&group=hitting"]
+    assert [plan.request_of(i) for i in range(len(plan))] == [0,0,1,2]